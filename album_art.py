@@ -0,0 +1,381 @@
+#!/usr/bin/env python3
+
+import hashlib
+import io
+import os
+from contextlib import redirect_stdout
+from functools import partial
+from multiprocessing import Pool, cpu_count
+import eyed3
+import eyed3.id3
+from PIL import Image
+from id3_reader import read_tag, read_image_data, _frame_payload, _parse_picture_header
+from id3_writer import read_raw_tag, picture_frame, write_raw_tag, save_tag, DEFAULT_TAG_PADDING
+from resize_image import resize_image_data
+
+FRONT_COVER = 3
+
+# Resized covers, keyed by the MD5 of the source image and the settings.
+DEFAULT_ART_CACHE_DIR = os.path.expanduser("~/.mp3_album_art_cache")
+DEFAULT_JPEG_QUALITY = 85
+
+# Writing a smaller cover in place would leave its old size as padding; past
+# this much the file is rewritten instead so the space is actually freed.
+MAX_LEFTOVER_PADDING = 64 * 1024
+
+# Leading bytes of the image formats players accept as cover art.
+IMAGE_SIGNATURES = {b"\xff\xd8\xff": "image/jpeg", b"\x89PNG\r\n\x1a\n": "image/png"}
+
+
+def format_size(num_bytes):
+    """Formats a byte count for reports (e.g. "1.5 MB")."""
+    for unit in ("bytes", "KB", "MB"):
+        if abs(num_bytes) < 1024 or unit == "MB":
+            return f"{num_bytes} {unit}" if unit == "bytes" else f"{num_bytes:.1f} {unit}"
+        num_bytes /= 1024
+
+
+def shrink_cover(data, max_size, quality=DEFAULT_JPEG_QUALITY, cache_dir=DEFAULT_ART_CACHE_DIR):
+    """
+    Returns data resized to at most max_size pixels and re-encoded as a JPEG
+    at the given quality (see resize_image.resize_image_data). Results are
+    cached in cache_dir by the MD5 of the source and the settings, so every
+    album sharing a source image is only resized once.
+    """
+    key = f"{hashlib.md5(data).hexdigest()}-{max_size}px-q{quality}.jpg"
+    cache_path = os.path.join(cache_dir, key) if cache_dir else None
+    if cache_path and os.path.exists(cache_path):
+        with open(cache_path, "rb") as f:
+            return f.read()
+
+    shrunk, _size = resize_image_data(data, max_size, quality)
+    if cache_path:
+        os.makedirs(cache_dir, exist_ok=True)
+        temp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(shrunk)
+        os.replace(temp_path, cache_path)
+    return shrunk
+
+
+def load_cover(art_path, max_size=None, quality=DEFAULT_JPEG_QUALITY, cache_dir=DEFAULT_ART_CACHE_DIR):
+    """
+    Reads and validates a cover image once and builds the APIC frame that
+    embed_cover adds to every file.
+
+    Args:
+        art_path: Path to a JPEG or PNG image
+        max_size: If given, resize the image to at most this many pixels and
+            re-encode it as a JPEG (see shrink_cover). The original is kept
+            if that does not make it smaller.
+        quality: JPEG quality used when resizing
+        cache_dir: Cache directory for resized images (None to disable)
+
+    Returns:
+        A dict with "path", "data", "mime_type", "md5" (hex digest of the
+        embedded image bytes), "source_size" (bytes of the image file) and
+        "frame" (raw APIC frame, see id3_writer.picture_frame).
+
+    Raises:
+        ValueError: If the file is not a valid JPEG or PNG image.
+    """
+    with open(art_path, "rb") as f:
+        data = f.read()
+    mime_type = next((mime for signature, mime in IMAGE_SIGNATURES.items() if data.startswith(signature)), None)
+    if mime_type is None:
+        raise ValueError(f"{art_path} is not a JPEG or PNG image")
+    try:
+        with Image.open(io.BytesIO(data)) as img:
+            img.verify()
+    except Exception as e:
+        raise ValueError(f"{art_path} is not a valid image: {e}")
+
+    source_size = len(data)
+    if max_size:
+        shrunk = shrink_cover(data, max_size, quality, cache_dir)
+        if len(shrunk) < len(data):
+            data, mime_type = shrunk, "image/jpeg"
+
+    return {
+        "path": art_path,
+        "data": data,
+        "mime_type": mime_type,
+        "md5": hashlib.md5(data).hexdigest(),
+        "source_size": source_size,
+        "frame": picture_frame(data, mime_type, FRONT_COVER),
+    }
+
+
+def has_cover(file_path, cover, images=None):
+    """
+    True if the file's only embedded picture is a front cover with the same
+    bytes as cover. Only the picture with a matching size is read and hashed.
+    images can be passed if the file's picture list was already read.
+    """
+    if images is None:
+        images = embedded_pictures(file_path)
+    if len(images) != 1 or images[0]["picture_type"] != FRONT_COVER or images[0]["size"] != len(cover["data"]):
+        return False
+    return hashlib.md5(read_image_data(file_path, images[0])).hexdigest() == cover["md5"]
+
+
+def embedded_pictures(file_path):
+    """Lists the pictures embedded in a file (see id3_reader.read_id3v2) without reading them."""
+    tag = read_tag(file_path, fields=[], images=True)
+    return tag["images"] if tag else []
+
+
+def _embed_with_eyed3(file_path, cover, padding):
+    # ID3v2.2 tags (which eyed3 cannot write) are converted to v2.4.
+    audiofile = eyed3.load(file_path)
+    if audiofile is None:
+        raise ValueError("could not load as an MP3 file")
+    if audiofile.tag is None:
+        audiofile.initTag()
+    for image in list(audiofile.tag.images):
+        audiofile.tag.images.remove(image.description)
+    audiofile.tag.images.set(FRONT_COVER, cover["data"], cover["mime_type"])
+    version = eyed3.id3.ID3_V2_4 if audiofile.tag.version == eyed3.id3.ID3_V2_2 else None
+    return save_tag(audiofile.tag, version=version, padding=padding)
+
+
+def embed_cover(file_path, cover, padding=DEFAULT_TAG_PADDING, dry_run=False):
+    """
+    Replaces all pictures embedded in a file with cover (from load_cover) by
+    rewriting only the ID3v2 tag: the other frames are kept as they are and
+    the prebuilt APIC frame is appended. Files that already carry exactly
+    this cover are not written.
+
+    Args:
+        file_path: Path to the MP3 file
+        cover: Cover as returned by load_cover
+        padding: Tag padding to reserve when the file has to be rewritten
+        dry_run: Only report what would happen
+
+    Returns:
+        (status, picture_bytes): status is "unchanged", "would change",
+        "in-place" or "rewritten"; picture_bytes is the total size of the
+        pictures that were embedded before.
+    """
+    images = embedded_pictures(file_path)
+    picture_bytes = sum(image["size"] for image in images)
+    if has_cover(file_path, cover, images):
+        return "unchanged", picture_bytes
+    if dry_run:
+        return "would change", picture_bytes
+
+    with open(file_path, "rb") as f:
+        tag = read_raw_tag(f)
+    if tag is None or tag["major"] == 2 or (tag["major"] == 4 and tag["flags"] & 0x80):
+        # Files without an ID3v2 tag still need eyed3 to check they are MP3s,
+        # v2.2 frames differ, and a v2.4 tag flagged as unsynchronised would
+        # mark the new frame as unsynchronised too: leave these to eyed3.
+        return _embed_with_eyed3(file_path, cover, padding), picture_bytes
+
+    tag["frames"] = [frame for frame in tag["frames"] if frame["id"] != "APIC"] + [cover["frame"]]
+    return write_raw_tag(file_path, tag, padding, max(padding, MAX_LEFTOVER_PADDING)), picture_bytes
+
+
+_worker_cover = None
+
+
+def _init_worker(cover):
+    # Each worker receives the cover once instead of with every file.
+    global _worker_cover
+    _worker_cover = cover
+
+
+def _embed_file(file_path, padding, dry_run):
+    output = io.StringIO()
+    picture_bytes, message = 0, None
+    with redirect_stdout(output):
+        try:
+            status, picture_bytes = embed_cover(file_path, _worker_cover, padding, dry_run)
+        except Exception as e:
+            status, message = "error", str(e)
+    return {"path": file_path, "status": status, "message": message, "picture_bytes": picture_bytes,
+            "output": output.getvalue()}
+
+
+def embed_cover_in_files(file_paths, cover, padding=DEFAULT_TAG_PADDING, jobs=None, dry_run=False):
+    """
+    Embeds cover in every file in a process pool and prints one summary,
+    including how many bytes of embedded pictures the library saves (or,
+    with dry_run, would save) by using this cover.
+
+    Args:
+        file_paths: Iterable of MP3 file paths
+        cover: Cover as returned by load_cover
+        padding: Tag padding to reserve when a file has to be rewritten
+        jobs: Number of worker processes (defaults to the number of CPUs)
+        dry_run: Only report what would change and how many bytes it saves
+
+    Returns:
+        A dict with the number of files "updated" (or "would change"),
+        "unchanged" and "error", and "bytes_saved".
+    """
+    changed = "would change" if dry_run else "updated"
+    counts = {changed: 0, "unchanged": 0, "error": 0}
+    bytes_before = bytes_after = 0
+    worker = partial(_embed_file, padding=padding, dry_run=dry_run)
+    with Pool(processes=jobs or cpu_count(), initializer=_init_worker, initargs=(cover,)) as pool:
+        for result in pool.imap(worker, file_paths, chunksize=8):
+            print(result["output"], end="")
+            if result["status"] == "error":
+                counts["error"] += 1
+                print(f"Error processing {result['path']}: {result['message']}")
+                continue
+            bytes_before += result["picture_bytes"]
+            if result["status"] == "unchanged":
+                counts["unchanged"] += 1
+                bytes_after += result["picture_bytes"]
+            else:
+                counts[changed] += 1
+                bytes_after += len(cover["data"])
+                name = os.path.basename(result["path"])
+                if dry_run:
+                    print(f"Would set album art for {name} ({format_size(result['picture_bytes'])} of pictures now)")
+                else:
+                    print(f"Set album art for {name} ({result['status']})")
+
+    print(f"\n--- Summary ---")
+    print(f"Total MP3 files: {sum(counts.values())}")
+    print(f"{changed.capitalize()}: {counts[changed]}")
+    print(f"Unchanged (cover already embedded): {counts['unchanged']}")
+    print(f"Errors: {counts['error']}")
+    print(f"Cover: {format_size(len(cover['data']))} per file (source image {format_size(cover['source_size'])})")
+    saved = bytes_before - bytes_after
+    verb = ("would save" if dry_run else "saved") if saved >= 0 else ("would add" if dry_run else "added")
+    print(f"Embedded pictures: {format_size(bytes_before)} before, {format_size(bytes_after)} after, "
+          f"{verb} {format_size(abs(saved))}")
+    counts["bytes_saved"] = saved
+    return counts
+
+
+def _replace_with_eyed3(file_path, replacements, padding):
+    audiofile = eyed3.load(file_path)
+    if audiofile is None or audiofile.tag is None:
+        raise ValueError("could not load the tag")
+    replaced = 0
+    for image in list(audiofile.tag.images):
+        new_data = replacements.get(hashlib.md5(image.image_data).hexdigest())
+        if new_data is not None:
+            audiofile.tag.images.set(image.picture_type, new_data, "image/jpeg", image.description)
+            replaced += 1
+    if not replaced:
+        return "unchanged", 0
+    version = eyed3.id3.ID3_V2_4 if audiofile.tag.version == eyed3.id3.ID3_V2_2 else None
+    return save_tag(audiofile.tag, version=version, padding=padding), replaced
+
+
+def replace_pictures(file_path, replacements, padding=DEFAULT_TAG_PADDING):
+    """
+    Replaces embedded pictures by other image data, keeping their picture
+    type and description and leaving all other frames (and pictures) alone.
+
+    Args:
+        file_path: Path to the MP3 file
+        replacements: Dict mapping the MD5 hex digest of a picture to the
+            JPEG bytes that should replace it
+        padding: Tag padding to reserve when the file has to be rewritten
+
+    Returns:
+        (status, replaced): status is "unchanged", "in-place" or "rewritten";
+        replaced is the number of pictures that were replaced.
+    """
+    with open(file_path, "rb") as f:
+        tag = read_raw_tag(f)
+    if tag is None:
+        return "unchanged", 0
+    if tag["major"] == 2 or (tag["major"] == 4 and tag["flags"] & 0x80):
+        # See embed_cover.
+        return _replace_with_eyed3(file_path, replacements, padding)
+
+    replaced = 0
+    for index, frame in enumerate(tag["frames"]):
+        if frame["id"] != "APIC":
+            continue
+        payload = _frame_payload(frame["data"], tag["major"], frame["flags"], tag["flags"])
+        parsed = _parse_picture_header(payload, tag["major"]) if payload else None
+        if parsed is None:
+            continue
+        _mime_type, picture_type, description, header_len = parsed
+        new_data = replacements.get(hashlib.md5(payload[header_len:]).hexdigest())
+        if new_data is not None:
+            tag["frames"][index] = picture_frame(new_data, "image/jpeg", picture_type, description)
+            replaced += 1
+    if not replaced:
+        return "unchanged", 0
+    return write_raw_tag(file_path, tag, padding, max(padding, MAX_LEFTOVER_PADDING)), replaced
+
+
+_worker_replacements = None
+
+
+def _init_replace_worker(replacements):
+    # The replacement images are sent to each worker once, not with every file.
+    global _worker_replacements
+    _worker_replacements = replacements
+
+
+def _replace_file(file_path, padding):
+    output = io.StringIO()
+    replaced, message = 0, None
+    with redirect_stdout(output):
+        try:
+            status, replaced = replace_pictures(file_path, _worker_replacements, padding)
+        except Exception as e:
+            status, message = "error", str(e)
+    return {"path": file_path, "status": status, "replaced": replaced, "message": message,
+            "output": output.getvalue()}
+
+
+def replace_pictures_in_files(file_paths, replacements, padding=DEFAULT_TAG_PADDING, jobs=None):
+    """
+    Runs replace_pictures on every file in a process pool and prints one
+    summary.
+
+    Returns:
+        A dict with the number of files "updated", "unchanged" and "error",
+        and the number of pictures "replaced".
+    """
+    counts = {"updated": 0, "unchanged": 0, "error": 0, "replaced": 0}
+    with Pool(processes=jobs or cpu_count(), initializer=_init_replace_worker, initargs=(replacements,)) as pool:
+        for result in pool.imap(partial(_replace_file, padding=padding), file_paths, chunksize=8):
+            print(result["output"], end="")
+            if result["status"] == "error":
+                counts["error"] += 1
+                print(f"Error processing {result['path']}: {result['message']}")
+            elif result["status"] == "unchanged":
+                counts["unchanged"] += 1
+            else:
+                counts["updated"] += 1
+                counts["replaced"] += result["replaced"]
+                print(f"Replaced {result['replaced']} picture(s) in {os.path.basename(result['path'])} ({result['status']})")
+
+    print(f"\n--- Summary ---")
+    print(f"Files updated: {counts['updated']} ({counts['replaced']} pictures replaced)")
+    print(f"Files unchanged: {counts['unchanged']}")
+    print(f"Errors: {counts['error']}")
+    return counts
+
+
+def add_cover_arguments(parser):
+    """Adds the cover resizing and report options shared by the album art setters."""
+    parser.add_argument(
+        "--max-size",
+        type=int,
+        default=None,
+        help="Resize the cover to at most this many pixels and re-encode it as a JPEG before embedding (cached by source hash).",
+    )
+    parser.add_argument(
+        "--quality",
+        type=int,
+        default=DEFAULT_JPEG_QUALITY,
+        help=f"JPEG quality used with --max-size (default: {DEFAULT_JPEG_QUALITY}).",
+    )
+    parser.add_argument(
+        "--report",
+        action="store_true",
+        help="Do not write anything; report which files would change and how many bytes of embedded pictures it would save.",
+    )
@@ -3,7 +3,23 @@
 import eyed3
 import os
 import sys
+import io
 import hashlib
+import argparse
+from multiprocessing import Pool, cpu_count
+from PIL import Image
+from album_art import (embedded_pictures, shrink_cover, replace_pictures_in_files, format_size,
+                       DEFAULT_JPEG_QUALITY)
+from bulk_tagger import add_jobs_argument
+from id3_reader import ID3ReadError, read_image_data
+from library_index import iter_mp3_files
+
+# Covers larger than this (in pixels or bytes) count as oversized in the art report.
+DEFAULT_MAX_ART_SIZE = 800
+DEFAULT_MAX_ART_BYTES = 256 * 1024
+
+# How many of the biggest covers the art report lists.
+TOP_COVERS = 10
 
 def analyze_mp3(file_path):
     if not os.path.exists(file_path):
@@ -60,13 +76,149 @@ def analyze_directory(directory_path):
             if file.lower().endswith('.mp3'):
                 analyze_mp3(os.path.join(root, file))
 
+def scan_pictures(file_path):
+    """
+    Worker: hashes every picture embedded in a file (using the in-process
+    tag reader, without eyed3) and reads its dimensions from the image header.
+
+    Returns:
+        A dict with "path", "pictures" (dicts with "md5", "size",
+        "mime_type", "picture_type" and "dimensions") and "error".
+    """
+    result = {"path": file_path, "pictures": [], "error": None}
+    try:
+        for image in embedded_pictures(file_path):
+            data = read_image_data(file_path, image)
+            try:
+                with Image.open(io.BytesIO(data)) as img:
+                    dimensions = img.size
+            except Exception:
+                dimensions = None
+            result["pictures"].append({
+                "md5": hashlib.md5(data).hexdigest(),
+                "size": len(data),
+                "mime_type": image["mime_type"],
+                "picture_type": image["picture_type"],
+                "dimensions": dimensions,
+            })
+    except (OSError, ID3ReadError) as e:
+        result["error"] = str(e)
+    return result
+
+def read_picture(file_path, md5):
+    """Returns the bytes of the picture with the given MD5 embedded in a file, or None."""
+    for image in embedded_pictures(file_path):
+        data = read_image_data(file_path, image)
+        if hashlib.md5(data).hexdigest() == md5:
+            return data
+    return None
+
+def is_oversized(group, max_size, max_bytes):
+    dimensions = group["dimensions"]
+    return group["size"] > max_bytes or (dimensions is not None and max(dimensions) > max_size)
+
+def art_report(directory_path, max_size=DEFAULT_MAX_ART_SIZE, max_bytes=DEFAULT_MAX_ART_BYTES,
+               quality=DEFAULT_JPEG_QUALITY, jobs=None):
+    """
+    Library-wide embedded art analysis: groups all embedded pictures by MD5,
+    reports the bytes spent on repeated copies of the same image and on
+    oversized covers, and offers to replace each oversized cover by one
+    shared, resized version (see album_art.shrink_cover).
+
+    Args:
+        directory_path: Root directory of the music library
+        max_size: Covers larger than this many pixels are oversized
+        max_bytes: Covers larger than this many bytes are oversized
+        quality: JPEG quality of the resized covers
+        jobs: Number of worker processes (defaults to the number of CPUs)
+    """
+    if not os.path.isdir(directory_path):
+        print(f"Error: Directory {directory_path} does not exist")
+        return
+
+    print(f"Scanning embedded art in {directory_path}...")
+    groups = {}
+    files_scanned = files_with_art = errors = 0
+    with Pool(processes=jobs or cpu_count()) as pool:
+        for result in pool.imap_unordered(scan_pictures, iter_mp3_files(directory_path), chunksize=16):
+            files_scanned += 1
+            if result["error"]:
+                errors += 1
+                print(f"Error reading {result['path']}: {result['error']}")
+                continue
+            if result["pictures"]:
+                files_with_art += 1
+            for picture in result["pictures"]:
+                group = groups.setdefault(picture["md5"], {**picture, "paths": []})
+                group["paths"].append(result["path"])
+
+    total_pictures = sum(len(group["paths"]) for group in groups.values())
+    total_bytes = sum(group["size"] * len(group["paths"]) for group in groups.values())
+    duplicate_bytes = sum(group["size"] * (len(group["paths"]) - 1) for group in groups.values())
+
+    print(f"\n--- Embedded Art Report ---")
+    print(f"Files scanned: {files_scanned} ({files_with_art} with embedded pictures, {errors} unreadable)")
+    print(f"Embedded pictures: {total_pictures} ({len(groups)} unique), {format_size(total_bytes)} in total")
+    print(f"Bytes in repeated copies of the same image: {format_size(duplicate_bytes)}")
+
+    print(f"\nBiggest covers by total bytes:")
+    biggest = sorted(groups.items(), key=lambda item: item[1]["size"] * len(item[1]["paths"]), reverse=True)
+    for md5, group in biggest[:TOP_COVERS]:
+        dimensions = "x".join(map(str, group["dimensions"])) if group["dimensions"] else "?"
+        print(f"  {md5[:12]}  {format_size(group['size']):>10}  {dimensions:>9}  x{len(group['paths']):<4} "
+              f"{format_size(group['size'] * len(group['paths'])):>10}  {os.path.dirname(group['paths'][0])}")
+
+    oversized = {md5: group for md5, group in groups.items() if is_oversized(group, max_size, max_bytes)}
+    replacements = {}
+    oversized_bytes = saved_bytes = 0
+    for md5, group in oversized.items():
+        oversized_bytes += group["size"] * len(group["paths"])
+        data = read_picture(group["paths"][0], md5)
+        if data is None:
+            continue
+        try:
+            shrunk = shrink_cover(data, max_size, quality)
+        except Exception as e:
+            print(f"Could not resize {md5[:12]} ({group['paths'][0]}): {e}")
+            continue
+        if len(shrunk) < group["size"]:
+            replacements[md5] = shrunk
+            saved_bytes += (group["size"] - len(shrunk)) * len(group["paths"])
+
+    print(f"\nOversized covers (over {max_size}px or {format_size(max_bytes)}): {len(oversized)} image(s) in "
+          f"{sum(len(group['paths']) for group in oversized.values())} embedded copies, {format_size(oversized_bytes)}")
+    if not replacements:
+        return
+    files = sorted({path for md5 in replacements for path in oversized[md5]["paths"]})
+    print(f"Resizing them to {max_size}px JPEGs (quality {quality}) would save {format_size(saved_bytes)} "
+          f"across {len(files)} file(s).")
+
+    try:
+        confirm = input("Rewrite the oversized covers with the resized versions? (yes/no): ")
+    except EOFError:
+        confirm = "no"
+    if confirm.strip().lower() != "yes":
+        print("No files were changed.")
+        return
+    replace_pictures_in_files(files, replacements, jobs=jobs)
+
 def main():
-    if len(sys.argv) != 2:
-        print("Usage: python analyze_id3.py <mp3_file_path_or_directory>")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(description="Show the ID3 tags and album art of MP3 files, or analyze the embedded art of a whole library.")
+    parser.add_argument("path", help="An MP3 file or a directory.")
+    parser.add_argument("--art-report", action="store_true", help="Report duplicate and oversized embedded covers across the directory, and offer to shrink the oversized ones.")
+    parser.add_argument("--max-size", type=int, default=DEFAULT_MAX_ART_SIZE, help=f"With --art-report, covers larger than this many pixels are oversized and resized to it (default: {DEFAULT_MAX_ART_SIZE}).")
+    parser.add_argument("--max-bytes", type=int, default=DEFAULT_MAX_ART_BYTES, help=f"With --art-report, covers larger than this many bytes are oversized (default: {DEFAULT_MAX_ART_BYTES}).")
+    parser.add_argument("--quality", type=int, default=DEFAULT_JPEG_QUALITY, help=f"With --art-report, JPEG quality of resized covers (default: {DEFAULT_JPEG_QUALITY}).")
+    add_jobs_argument(parser)
+    args = parser.parse_args()
     
-    path = sys.argv[1]
-    if os.path.isfile(path):
+    path = args.path
+    if args.art_report:
+        if not os.path.isdir(path):
+            print(f"Error: {path} is not a directory")
+            sys.exit(1)
+        art_report(path, args.max_size, args.max_bytes, args.quality, args.jobs)
+    elif os.path.isfile(path):
         analyze_mp3(path)
     elif os.path.isdir(path):
         analyze_directory(path)
@@ -75,4 +227,4 @@ def main():
         sys.exit(1)
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import csv
+import json
+import argparse
+from multiprocessing import cpu_count
+from library_index import iter_track_records, add_index_argument
+from scan_journal import add_walk_arguments, selected_mp3_paths
+
+def _is_missing(value):
+    # Same test the find_mp3s_without_*.py scripts apply to eyeD3's output.
+    value = (value or "").strip()
+    return not value or value == "None"
+
+def _missing_rule(field):
+    def check(record, options):
+        return "missing" if _is_missing(record[field]) else None
+    return check
+
+def check_album(record, options):
+    if record["album"] != options.expected_album:
+        return f"{record['album']!r} (expected {options.expected_album!r})"
+    return None
+
+def check_album_artist(record, options):
+    if record["album_artist"] != options.expected_album_artist:
+        return f"{record['album_artist']!r} (expected {options.expected_album_artist!r})"
+    return None
+
+_mp3_counts_by_directory = {}
+
+def _count_mp3s_in_directory(directory):
+    if directory not in _mp3_counts_by_directory:
+        _mp3_counts_by_directory[directory] = sum(
+            1 for name in os.listdir(directory) if name.lower().endswith(".mp3")
+        )
+    return _mp3_counts_by_directory[directory]
+
+def check_track_total(record, options):
+    # set_track_numbers.py sets the total to the number of MP3s in the folder.
+    expected_total = _count_mp3s_in_directory(os.path.dirname(record["path"]))
+    if record["track_num"] is None:
+        return "missing track number"
+    if record["track_total"] != expected_total:
+        return f"{record['track_num']}/{record['track_total']} (expected total {expected_total})"
+    return None
+
+# Rule name -> (fields it reads, check function, option it needs or None).
+RULES = {
+    "missing-title": (["title"], _missing_rule("title"), None),
+    "missing-artist": (["artist"], _missing_rule("artist"), None),
+    "missing-album": (["album"], _missing_rule("album"), None),
+    "missing-album-artist": (["album_artist"], _missing_rule("album_artist"), None),
+    "wrong-album": (["album"], check_album, "expected_album"),
+    "wrong-album-artist": (["album_artist"], check_album_artist, "expected_album_artist"),
+    "wrong-track-total": (["track_num", "track_total"], check_track_total, None),
+}
+
+DEFAULT_RULES = ["missing-title", "missing-artist", "missing-album", "missing-album-artist"]
+
+def audit_library(music_folder, rules, options, index_path=None, mp3_paths=None, jobs=1):
+    """
+    Reads every MP3 once and applies all the given rules to it.
+
+    Args:
+        music_folder: Root of the music library
+        rules: List of rule names from RULES
+        options: Namespace with expected_album / expected_album_artist
+        index_path: Optional library index database to read from
+        mp3_paths: Optional explicit list of files to audit instead of the whole tree
+        jobs: Number of worker processes for reading tags
+
+    Returns:
+        (results, total_files), where results is a list of dicts with "path",
+        one entry per rule (None when the file passes it) and "failed".
+    """
+    fields = sorted({field for rule in rules for field in RULES[rule][0]})
+    results = []
+    total_files = 0
+
+    for record in iter_track_records(music_folder, index_path, mp3_paths, fields=fields, jobs=jobs):
+        total_files += 1
+        result = {"path": record["path"]}
+        if record["load_error"]:
+            result.update({rule: f"unreadable: {record['load_error']}" for rule in rules})
+        else:
+            for rule in rules:
+                result[rule] = RULES[rule][1](record, options)
+        result["failed"] = [rule for rule in rules if result[rule]]
+        results.append(result)
+
+    return results, total_files
+
+def print_table(results, rules, out=sys.stdout):
+    headers = ["path"] + rules
+    rows = [[r["path"]] + [r[rule] or "" for rule in rules] for r in results]
+    widths = [max([len(h)] + [len(row[i]) for row in rows]) for i, h in enumerate(headers)]
+    print("  ".join(h.ljust(w) for h, w in zip(headers, widths)), file=out)
+    print("  ".join("-" * w for w in widths), file=out)
+    for row in rows:
+        print("  ".join(cell.ljust(w) for cell, w in zip(row, widths)), file=out)
+
+def print_csv(results, rules, out=sys.stdout):
+    writer = csv.writer(out)
+    writer.writerow(["path"] + rules)
+    for r in results:
+        writer.writerow([r["path"]] + [r[rule] or "" for rule in rules])
+
+def print_json(results, rules, out=sys.stdout):
+    json.dump([{"path": r["path"], "failed": r["failed"], **{rule: r[rule] for rule in rules}} for r in results],
+              out, ensure_ascii=False, indent=2)
+    out.write("\n")
+
+FORMATTERS = {"table": print_table, "csv": print_csv, "json": print_json}
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Audit MP3 metadata against several rules in a single pass over the library."
+    )
+    parser.add_argument(
+        "music_folder",
+        nargs="?",
+        default="~/Desktop/Music/",
+        help="The path to the music folder to scan. Defaults to ~/Desktop/Music/"
+    )
+    parser.add_argument(
+        "-r", "--rule",
+        dest="rules",
+        action="append",
+        choices=sorted(RULES),
+        help=f"Rule to check; repeat for several. Defaults to: {', '.join(DEFAULT_RULES)}."
+    )
+    parser.add_argument("--expected-album", help="Album value required by the wrong-album rule.")
+    parser.add_argument("--expected-album-artist", help="Album artist value required by the wrong-album-artist rule.")
+    parser.add_argument("-f", "--format", choices=sorted(FORMATTERS), default="table", help="Output format (default: table).")
+    parser.add_argument("--all", action="store_true", help="List every file, not just the ones failing a rule.")
+    parser.add_argument("-j", "--jobs", type=int, default=cpu_count(), help="Worker processes for reading tags (default: number of CPUs).")
+    add_index_argument(parser)
+    add_walk_arguments(parser)
+    args = parser.parse_args()
+
+    rules = args.rules or DEFAULT_RULES
+    for rule in rules:
+        option = RULES[rule][2]
+        if option and getattr(args, option) is None:
+            parser.error(f"rule '{rule}' requires --{option.replace('_', '-')}")
+
+    music_folder = os.path.abspath(os.path.expanduser(args.music_folder))
+    if not os.path.isdir(music_folder):
+        print(f"Error: Directory not found: {music_folder}", file=sys.stderr)
+        sys.exit(1)
+
+    with selected_mp3_paths(music_folder, args, "audit_metadata") as mp3_paths:
+        results, total_files = audit_library(music_folder, rules, args, args.index, mp3_paths, args.jobs)
+
+    shown = results if args.all else [r for r in results if r["failed"]]
+    FORMATTERS[args.format](shown, rules)
+
+    # Keep machine-readable output clean by sending the summary to stderr.
+    summary_out = sys.stdout if args.format == "table" else sys.stderr
+    print(f"\n--- Audit Summary ---", file=summary_out)
+    print(f"Total MP3 files audited: {total_files}", file=summary_out)
+    for rule in rules:
+        print(f"{rule}: {sum(1 for r in results if r[rule])}", file=summary_out)
+    print(f"Files failing at least one rule: {sum(1 for r in results if r['failed'])}", file=summary_out)
+
+if __name__ == "__main__":
+    main()
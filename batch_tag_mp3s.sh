@@ -1,264 +1,12 @@
 #!/bin/bash
 
+# The edits live in batch_tag_mp3s.csv (path,title); tag_mp3.py applies them
+# in one process, writing each file once. Pass --dry-run to preview.
+SCRIPT_DIR="$(cd "$(dirname "$0")" && pwd)"
+
 echo "Starting batch MP3 tagging..."
 
-eyeD3 --title="GVUT" "/Users/stencate/Desktop/Music/Sybren/Beats/GVUT.mp3"
-eyeD3 --title="FYUD" "/Users/stencate/Desktop/Music/Sybren/Beats/FYUD.mp3"
-eyeD3 --title="NTZB" "/Users/stencate/Desktop/Music/Sybren/Beats/NTZB.mp3"
-eyeD3 --title="LJIU" "/Users/stencate/Desktop/Music/Sybren/Beats/LJIU.mp3"
-eyeD3 --title="RPRH" "/Users/stencate/Desktop/Music/Sybren/Beats/RPRH.mp3"
-eyeD3 --title="AHBX" "/Users/stencate/Desktop/Music/Sybren/Beats/AHBX.mp3"
-eyeD3 --title="MKQM" "/Users/stencate/Desktop/Music/Sybren/Beats/MKQM.mp3"
-eyeD3 --title="RFZX" "/Users/stencate/Desktop/Music/Sybren/Beats/RFZX.mp3"
-eyeD3 --title="FYMC" "/Users/stencate/Desktop/Music/Sybren/Beats/FYMC.mp3"
-eyeD3 --title="COIH" "/Users/stencate/Desktop/Music/Sybren/Beats/COIH.mp3"
-eyeD3 --title="UTKD" "/Users/stencate/Desktop/Music/Sybren/Beats/UTKD.mp3"
-eyeD3 --title="ICLH" "/Users/stencate/Desktop/Music/Sybren/Beats/ICLH.mp3"
-eyeD3 --title="TPZA" "/Users/stencate/Desktop/Music/Sybren/Beats/TPZA.mp3"
-eyeD3 --title="TEOX" "/Users/stencate/Desktop/Music/Sybren/Beats/TEOX.mp3"
-eyeD3 --title="YSLQ" "/Users/stencate/Desktop/Music/Sybren/Beats/YSLQ.mp3"
-eyeD3 --title="SOLW" "/Users/stencate/Desktop/Music/Sybren/Beats/SOLW.mp3"
-eyeD3 --title="VBGQ" "/Users/stencate/Desktop/Music/Sybren/Beats/VBGQ.mp3"
-eyeD3 --title="DCIZ" "/Users/stencate/Desktop/Music/Sybren/Beats/DCIZ.mp3"
-eyeD3 --title="PPEQ" "/Users/stencate/Desktop/Music/Sybren/Beats/PPEQ.mp3"
-eyeD3 --title="NXXE" "/Users/stencate/Desktop/Music/Sybren/Beats/NXXE.mp3"
-eyeD3 --title="DJYZ" "/Users/stencate/Desktop/Music/Sybren/Beats/DJYZ.mp3"
-eyeD3 --title="GXOS" "/Users/stencate/Desktop/Music/Sybren/Beats/GXOS.mp3"
-eyeD3 --title="KPOZ" "/Users/stencate/Desktop/Music/Sybren/Beats/KPOZ.mp3"
-eyeD3 --title="MCHA" "/Users/stencate/Desktop/Music/Sybren/Beats/MCHA.mp3"
-eyeD3 --title="WXPC" "/Users/stencate/Desktop/Music/Sybren/Beats/WXPC.mp3"
-eyeD3 --title="TQFJ" "/Users/stencate/Desktop/Music/Sybren/Beats/TQFJ.mp3"
-eyeD3 --title="DPKH" "/Users/stencate/Desktop/Music/Sybren/Beats/DPKH.mp3"
-eyeD3 --title="DYBN" "/Users/stencate/Desktop/Music/Sybren/Beats/DYBN.mp3"
-eyeD3 --title="IICH" "/Users/stencate/Desktop/Music/Sybren/Beats/IICH.mp3"
-eyeD3 --title="DXQY" "/Users/stencate/Desktop/Music/Sybren/Beats/DXQY.mp3"
-eyeD3 --title="TGMV" "/Users/stencate/Desktop/Music/Sybren/Beats/TGMV.mp3"
-eyeD3 --title="YLLF" "/Users/stencate/Desktop/Music/Sybren/Beats/YLLF.mp3"
-eyeD3 --title="JOIW" "/Users/stencate/Desktop/Music/Sybren/Beats/JOIW.mp3"
-eyeD3 --title="DVHA" "/Users/stencate/Desktop/Music/Sybren/Beats/DVHA.mp3"
-eyeD3 --title="ZLFJ" "/Users/stencate/Desktop/Music/Sybren/Beats/ZLFJ.mp3"
-eyeD3 --title="HQLO" "/Users/stencate/Desktop/Music/Sybren/Beats/HQLO.mp3"
-eyeD3 --title="TLFY" "/Users/stencate/Desktop/Music/Sybren/Beats/TLFY.mp3"
-eyeD3 --title="KBIF" "/Users/stencate/Desktop/Music/Sybren/Beats/KBIF.mp3"
-eyeD3 --title="DDXD" "/Users/stencate/Desktop/Music/Sybren/Beats/DDXD.mp3"
-eyeD3 --title="YNTA" "/Users/stencate/Desktop/Music/Sybren/Beats/YNTA.mp3"
-eyeD3 --title="DOKY" "/Users/stencate/Desktop/Music/Sybren/Beats/DOKY.mp3"
-eyeD3 --title="EWCH" "/Users/stencate/Desktop/Music/Sybren/Beats/EWCH.mp3"
-eyeD3 --title="HUJM" "/Users/stencate/Desktop/Music/Sybren/Beats/HUJM.mp3"
-eyeD3 --title="QQVN" "/Users/stencate/Desktop/Music/Sybren/Beats/QQVN.mp3"
-eyeD3 --title="OELO" "/Users/stencate/Desktop/Music/Sybren/Beats/OELO.mp3"
-eyeD3 --title="YXNE" "/Users/stencate/Desktop/Music/Sybren/Beats/YXNE.mp3"
-eyeD3 --title="KMKG" "/Users/stencate/Desktop/Music/Sybren/Beats/KMKG.mp3"
-eyeD3 --title="IWBZ" "/Users/stencate/Desktop/Music/Sybren/Beats/IWBZ.mp3"
-eyeD3 --title="YPMA" "/Users/stencate/Desktop/Music/Sybren/Beats/YPMA.mp3"
-eyeD3 --title="DMNF" "/Users/stencate/Desktop/Music/Sybren/Beats/DMNF.mp3"
-eyeD3 --title="BHNV" "/Users/stencate/Desktop/Music/Sybren/Beats/BHNV.mp3"
-eyeD3 --title="EXKX" "/Users/stencate/Desktop/Music/Sybren/Beats/EXKX.mp3"
-eyeD3 --title="HTNQ" "/Users/stencate/Desktop/Music/Sybren/Beats/HTNQ.mp3"
-eyeD3 --title="VLZV" "/Users/stencate/Desktop/Music/Sybren/Beats/VLZV.mp3"
-eyeD3 --title="BQNB" "/Users/stencate/Desktop/Music/Sybren/Beats/BQNB.mp3"
-eyeD3 --title="TPIB" "/Users/stencate/Desktop/Music/Sybren/Beats/TPIB.mp3"
-eyeD3 --title="JSRJ" "/Users/stencate/Desktop/Music/Sybren/Beats/JSRJ.mp3"
-eyeD3 --title="DONG" "/Users/stencate/Desktop/Music/Sybren/Beats/DONG.mp3"
-eyeD3 --title="UJJU" "/Users/stencate/Desktop/Music/Sybren/Beats/UJJU.mp3"
-eyeD3 --title="NRSN" "/Users/stencate/Desktop/Music/Sybren/Beats/NRSN.mp3"
-eyeD3 --title="GEFN" "/Users/stencate/Desktop/Music/Sybren/Beats/GEFN.mp3"
-eyeD3 --title="QBZC" "/Users/stencate/Desktop/Music/Sybren/Beats/QBZC.mp3"
-eyeD3 --title="JLSX" "/Users/stencate/Desktop/Music/Sybren/Beats/JLSX.mp3"
-eyeD3 --title="DJEV" "/Users/stencate/Desktop/Music/Sybren/Beats/DJEV.mp3"
-eyeD3 --title="VFZY" "/Users/stencate/Desktop/Music/Sybren/Beats/VFZY.mp3"
-eyeD3 --title="EISQ" "/Users/stencate/Desktop/Music/Sybren/Beats/EISQ.mp3"
-eyeD3 --title="YEUL" "/Users/stencate/Desktop/Music/Sybren/Beats/YEUL.mp3"
-eyeD3 --title="KJYW" "/Users/stencate/Desktop/Music/Sybren/Beats/KJYW.mp3"
-eyeD3 --title="BTDC" "/Users/stencate/Desktop/Music/Sybren/Beats/BTDC.mp3"
-eyeD3 --title="HIZB" "/Users/stencate/Desktop/Music/Sybren/Beats/HIZB.mp3"
-eyeD3 --title="ISLJ" "/Users/stencate/Desktop/Music/Sybren/Beats/ISLJ.mp3"
-eyeD3 --title="DXCF" "/Users/stencate/Desktop/Music/Sybren/Beats/DXCF.mp3"
-eyeD3 --title="WYKE" "/Users/stencate/Desktop/Music/Sybren/Beats/WYKE.mp3"
-eyeD3 --title="GVKX" "/Users/stencate/Desktop/Music/Sybren/Beats/GVKX.mp3"
-eyeD3 --title="KJTK" "/Users/stencate/Desktop/Music/Sybren/Beats/KJTK.mp3"
-eyeD3 --title="GKPC" "/Users/stencate/Desktop/Music/Sybren/Beats/GKPC.mp3"
-eyeD3 --title="WXCY" "/Users/stencate/Desktop/Music/Sybren/Beats/WXCY.mp3"
-eyeD3 --title="FOOZ" "/Users/stencate/Desktop/Music/Sybren/Beats/FOOZ.mp3"
-eyeD3 --title="GWYK" "/Users/stencate/Desktop/Music/Sybren/Beats/GWYK.mp3"
-eyeD3 --title="QDTV" "/Users/stencate/Desktop/Music/Sybren/Beats/QDTV.mp3"
-eyeD3 --title="QDYF" "/Users/stencate/Desktop/Music/Sybren/Beats/QDYF.mp3"
-eyeD3 --title="JXNE" "/Users/stencate/Desktop/Music/Sybren/Beats/JXNE.mp3"
-eyeD3 --title="MGZX" "/Users/stencate/Desktop/Music/Sybren/Beats/MGZX.mp3"
-eyeD3 --title="BAHV" "/Users/stencate/Desktop/Music/Sybren/Beats/BAHV.mp3"
-eyeD3 --title="VUXU" "/Users/stencate/Desktop/Music/Sybren/Beats/VUXU.mp3"
-eyeD3 --title="HJRR" "/Users/stencate/Desktop/Music/Sybren/Beats/HJRR.mp3"
-eyeD3 --title="TDVP" "/Users/stencate/Desktop/Music/Sybren/Beats/TDVP.mp3"
-eyeD3 --title="NWWY" "/Users/stencate/Desktop/Music/Sybren/Beats/NWWY.mp3"
-eyeD3 --title="REVP" "/Users/stencate/Desktop/Music/Sybren/Beats/REVP.mp3"
-eyeD3 --title="SYUE" "/Users/stencate/Desktop/Music/Sybren/Beats/SYUE.mp3"
-eyeD3 --title="PJGV" "/Users/stencate/Desktop/Music/Sybren/Beats/PJGV.mp3"
-eyeD3 --title="GBOX" "/Users/stencate/Desktop/Music/Sybren/Beats/GBOX.mp3"
-eyeD3 --title="ZDAO" "/Users/stencate/Desktop/Music/Sybren/Beats/ZDAO.mp3"
-eyeD3 --title="RYIQ" "/Users/stencate/Desktop/Music/Sybren/Beats/RYIQ.mp3"
-eyeD3 --title="JZTX" "/Users/stencate/Desktop/Music/Sybren/Beats/JZTX.mp3"
-eyeD3 --title="NDCQ" "/Users/stencate/Desktop/Music/Sybren/Beats/NDCQ.mp3"
-eyeD3 --title="NUOM" "/Users/stencate/Desktop/Music/Sybren/Beats/NUOM.mp3"
-eyeD3 --title="SDYQ" "/Users/stencate/Desktop/Music/Sybren/Beats/SDYQ.mp3"
-eyeD3 --title="QNZD" "/Users/stencate/Desktop/Music/Sybren/Beats/QNZD.mp3"
-eyeD3 --title="UAMF" "/Users/stencate/Desktop/Music/Sybren/Beats/UAMF.mp3"
-eyeD3 --title="QTPG" "/Users/stencate/Desktop/Music/Sybren/Beats/QTPG.mp3"
-eyeD3 --title="LKDK" "/Users/stencate/Desktop/Music/Sybren/Beats/LKDK.mp3"
-eyeD3 --title="UBYF" "/Users/stencate/Desktop/Music/Sybren/Beats/UBYF.mp3"
-eyeD3 --title="LOZO" "/Users/stencate/Desktop/Music/Sybren/Beats/LOZO.mp3"
-eyeD3 --title="IGMC" "/Users/stencate/Desktop/Music/Sybren/Beats/IGMC.mp3"
-eyeD3 --title="RBZB" "/Users/stencate/Desktop/Music/Sybren/Beats/RBZB.mp3"
-eyeD3 --title="KFGR" "/Users/stencate/Desktop/Music/Sybren/Beats/KFGR.mp3"
-eyeD3 --title="UOGL" "/Users/stencate/Desktop/Music/Sybren/Beats/UOGL.mp3"
-eyeD3 --title="NZWB" "/Users/stencate/Desktop/Music/Sybren/Beats/NZWB.mp3"
-eyeD3 --title="GLQV" "/Users/stencate/Desktop/Music/Sybren/Beats/GLQV.mp3"
-eyeD3 --title="PQNI" "/Users/stencate/Desktop/Music/Sybren/Beats/PQNI.mp3"
-eyeD3 --title="PMJP" "/Users/stencate/Desktop/Music/Sybren/Beats/PMJP.mp3"
-eyeD3 --title="BFSY" "/Users/stencate/Desktop/Music/Sybren/Beats/BFSY.mp3"
-eyeD3 --title="PHXF" "/Users/stencate/Desktop/Music/Sybren/Beats/PHXF.mp3"
-eyeD3 --title="EQKM" "/Users/stencate/Desktop/Music/Sybren/Beats/EQKM.mp3"
-eyeD3 --title="RFNW" "/Users/stencate/Desktop/Music/Sybren/Beats/RFNW.mp3"
-eyeD3 --title="RJUG" "/Users/stencate/Desktop/Music/Sybren/Beats/RJUG.mp3"
-eyeD3 --title="ELQV" "/Users/stencate/Desktop/Music/Sybren/Beats/ELQV.mp3"
-eyeD3 --title="DJNM" "/Users/stencate/Desktop/Music/Sybren/Beats/DJNM.mp3"
-eyeD3 --title="ZZOB" "/Users/stencate/Desktop/Music/Sybren/Beats/ZZOB.mp3"
-eyeD3 --title="IUSK" "/Users/stencate/Desktop/Music/Sybren/Beats/IUSK.mp3"
-eyeD3 --title="sybren-beat1" "/Users/stencate/Desktop/Music/Sybren/Beats/sybren-beat1.mp3"
-eyeD3 --title="PMIX" "/Users/stencate/Desktop/Music/Sybren/Beats/PMIX.mp3"
-eyeD3 --title="VVMD" "/Users/stencate/Desktop/Music/Sybren/Beats/VVMD.mp3"
-eyeD3 --title="GVOA" "/Users/stencate/Desktop/Music/Sybren/Beats/GVOA.mp3"
-eyeD3 --title="IAOI" "/Users/stencate/Desktop/Music/Sybren/Beats/IAOI.mp3"
-eyeD3 --title="GNEW" "/Users/stencate/Desktop/Music/Sybren/Beats/GNEW.mp3"
-eyeD3 --title="sybren-beat2" "/Users/stencate/Desktop/Music/Sybren/Beats/sybren-beat2.mp3"
-eyeD3 --title="EWHV" "/Users/stencate/Desktop/Music/Sybren/Beats/EWHV.mp3"
-eyeD3 --title="PUTD" "/Users/stencate/Desktop/Music/Sybren/Beats/PUTD.mp3"
-eyeD3 --title="UVIW" "/Users/stencate/Desktop/Music/Sybren/Beats/UVIW.mp3"
-eyeD3 --title="IVAN" "/Users/stencate/Desktop/Music/Sybren/Beats/IVAN.mp3"
-eyeD3 --title="NLRK" "/Users/stencate/Desktop/Music/Sybren/Remixes/NLRK.mp3"
-eyeD3 --title="LGZZ" "/Users/stencate/Desktop/Music/Sybren/Remixes/LGZZ.mp3"
-eyeD3 --title="In Da Club" "/Users/stencate/Desktop/Music/Sybren/Remixes/50 Cent - In Da Club.mp3"
-eyeD3 --title="EAOT" "/Users/stencate/Desktop/Music/Sybren/Remixes/EAOT.mp3"
-eyeD3 --title="Still Dre" "/Users/stencate/Desktop/Music/Sybren/Remixes/DRE - Still Dre.mp3"
-eyeD3 --title="Where da Hood At" "/Users/stencate/Desktop/Music/Sybren/Remixes/DMX - Where da Hood At.mp3"
-eyeD3 --title="Let's Get It On" "/Users/stencate/Desktop/Music/Sybren/Remixes/Tupac - Let's Get It On.mp3"
-eyeD3 --title="EMKA" "/Users/stencate/Desktop/Music/Sybren/Remixes/EMKA.mp3"
-eyeD3 --title="99 Problems" "/Users/stencate/Desktop/Music/Sybren/Remixes/Jay-Z - 99 Problems.mp3"
-eyeD3 --title="YFSM" "/Users/stencate/Desktop/Music/Sybren/Remixes/YFSM.mp3"
-eyeD3 --title="OIAU" "/Users/stencate/Desktop/Music/Sybren/Remixes/OIAU.mp3"
-eyeD3 --title="XKPQ" "/Users/stencate/Desktop/Music/Sybren/Remixes/XKPQ.mp3"
-eyeD3 --title="It Ain't Hard 2 Tell" "/Users/stencate/Desktop/Music/Sybren/Remixes/NaS - It Ain't Hard 2 Tell.mp3"
-eyeD3 --title="PPYV" "/Users/stencate/Desktop/Music/Sybren/Remixes/PPYV.mp3"
-eyeD3 --title="YKMJ" "/Users/stencate/Desktop/Music/Sybren/Remixes/YKMJ.mp3"
-eyeD3 --title="DILS" "/Users/stencate/Desktop/Music/Sybren/Remixes/DILS.mp3"
-eyeD3 --title="DSHM" "/Users/stencate/Desktop/Music/Sybren/Remixes/DSHM.mp3"
-eyeD3 --title="URTM" "/Users/stencate/Desktop/Music/Sybren/Remixes/URTM.mp3"
-eyeD3 --title="08FANT S 90BPM" "/Users/stencate/Desktop/Music/Glenn Stafford & Charles Deenen/Lost Vikings 2 OST/08FANT_S_90BPM.mp3"
-eyeD3 --title="13PIRA M" "/Users/stencate/Desktop/Music/Glenn Stafford & Charles Deenen/Lost Vikings 2 OST/13PIRA_M.mp3"
-eyeD3 --title="14JUNG F" "/Users/stencate/Desktop/Music/Glenn Stafford & Charles Deenen/Lost Vikings 2 OST/14JUNG_F.mp3"
-eyeD3 --title="01THEME" "/Users/stencate/Desktop/Music/Glenn Stafford & Charles Deenen/Lost Vikings 2 OST/01THEME.mp3"
-eyeD3 --title="08FANT S" "/Users/stencate/Desktop/Music/Glenn Stafford & Charles Deenen/Lost Vikings 2 OST/08FANT_S.mp3"
-eyeD3 --title="Just Another Day" "/Users/stencate/Desktop/Music/Glenn Stafford & Charles Deenen/Lost Vikings 2 OST/The Lost Vikings - Just Another Day.mp3"
-eyeD3 --title="18DOOM S" "/Users/stencate/Desktop/Music/Glenn Stafford & Charles Deenen/Lost Vikings 2 OST/18DOOM_S.mp3"
-eyeD3 --title="15JUNG S" "/Users/stencate/Desktop/Music/Glenn Stafford & Charles Deenen/Lost Vikings 2 OST/15JUNG_S.mp3"
-eyeD3 --title="11PIRA F" "/Users/stencate/Desktop/Music/Glenn Stafford & Charles Deenen/Lost Vikings 2 OST/11PIRA_F.mp3"
-eyeD3 --title="16JUNG M" "/Users/stencate/Desktop/Music/Glenn Stafford & Charles Deenen/Lost Vikings 2 OST/16JUNG_M.mp3"
-eyeD3 --title="12PIRA S" "/Users/stencate/Desktop/Music/Glenn Stafford & Charles Deenen/Lost Vikings 2 OST/12PIRA_S.mp3"
-eyeD3 --title="06TRANS" "/Users/stencate/Desktop/Music/Glenn Stafford & Charles Deenen/Lost Vikings 2 OST/06TRANS.mp3"
-eyeD3 --title="07FANT F" "/Users/stencate/Desktop/Music/Glenn Stafford & Charles Deenen/Lost Vikings 2 OST/07FANT_F.mp3"
-eyeD3 --title="09FANT M" "/Users/stencate/Desktop/Music/Glenn Stafford & Charles Deenen/Lost Vikings 2 OST/09FANT_M.mp3"
-eyeD3 --title="17DOOM F" "/Users/stencate/Desktop/Music/Glenn Stafford & Charles Deenen/Lost Vikings 2 OST/17DOOM_F.mp3"
-eyeD3 --title="19DOOM M" "/Users/stencate/Desktop/Music/Glenn Stafford & Charles Deenen/Lost Vikings 2 OST/19DOOM_M.mp3"
-eyeD3 --title="05CHOOSE" "/Users/stencate/Desktop/Music/Glenn Stafford & Charles Deenen/Lost Vikings 2 OST/05CHOOSE.mp3"
-eyeD3 --title="KKNX" "/Users/stencate/Desktop/Music/Vincent/Beats/KKNX.mp3"
-eyeD3 --title="NXMQ" "/Users/stencate/Desktop/Music/Vincent/Beats/NXMQ.mp3"
-eyeD3 --title="AEIE" "/Users/stencate/Desktop/Music/Vincent/Beats/AEIE.mp3"
-eyeD3 --title="RGRE" "/Users/stencate/Desktop/Music/Vincent/Beats/RGRE.mp3"
-eyeD3 --title="EXNB" "/Users/stencate/Desktop/Music/Vincent/Beats/EXNB.mp3"
-eyeD3 --title="YIJS" "/Users/stencate/Desktop/Music/Vincent/Beats/YIJS.mp3"
-eyeD3 --title="JOPD" "/Users/stencate/Desktop/Music/Vincent/Beats/JOPD.mp3"
-eyeD3 --title="VJPR" "/Users/stencate/Desktop/Music/Vincent/Beats/VJPR.mp3"
-eyeD3 --title="EACR" "/Users/stencate/Desktop/Music/Vincent/Beats/EACR.mp3"
-eyeD3 --title="YXKH" "/Users/stencate/Desktop/Music/Vincent/Beats/YXKH.mp3"
-eyeD3 --title="GWEL" "/Users/stencate/Desktop/Music/Vincent/Beats/GWEL.mp3"
-eyeD3 --title="MXSK" "/Users/stencate/Desktop/Music/Vincent/Beats/MXSK.mp3"
-eyeD3 --title="YPGQ" "/Users/stencate/Desktop/Music/Vincent/Beats/YPGQ.mp3"
-eyeD3 --title="ZQDG" "/Users/stencate/Desktop/Music/Vincent/Beats/ZQDG.mp3"
-eyeD3 --title="ZFKS" "/Users/stencate/Desktop/Music/Vincent/Beats/ZFKS.mp3"
-eyeD3 --title="XTOW" "/Users/stencate/Desktop/Music/Vincent/Beats/XTOW.mp3"
-eyeD3 --title="MVEH" "/Users/stencate/Desktop/Music/Vincent/Beats/MVEH.mp3"
-eyeD3 --title="JQXX" "/Users/stencate/Desktop/Music/Vincent/Beats/JQXX.mp3"
-eyeD3 --title="XLEB" "/Users/stencate/Desktop/Music/Vincent/Beats/XLEB.mp3"
-eyeD3 --title="FFXC" "/Users/stencate/Desktop/Music/Vincent/Beats/FFXC.mp3"
-eyeD3 --title="LKVS" "/Users/stencate/Desktop/Music/Vincent/Beats/LKVS.mp3"
-eyeD3 --title="XKHD" "/Users/stencate/Desktop/Music/Vincent/Beats/XKHD.mp3"
-eyeD3 --title="VPSJ" "/Users/stencate/Desktop/Music/Vincent/Beats/VPSJ.mp3"
-eyeD3 --title="CXBV" "/Users/stencate/Desktop/Music/Vincent/Beats/CXBV.mp3"
-eyeD3 --title="QNWZ" "/Users/stencate/Desktop/Music/Vincent/Beats/QNWZ.mp3"
-eyeD3 --title="VUOB" "/Users/stencate/Desktop/Music/Vincent/Beats/VUOB.mp3"
-eyeD3 --title="METN" "/Users/stencate/Desktop/Music/Vincent/Beats/METN.mp3"
-eyeD3 --title="BZJA" "/Users/stencate/Desktop/Music/Vincent/Beats/BZJA.mp3"
-eyeD3 --title="BYCL" "/Users/stencate/Desktop/Music/Vincent/Beats/BYCL.mp3"
-eyeD3 --title="KRRB" "/Users/stencate/Desktop/Music/Vincent/Beats/KRRB.mp3"
-eyeD3 --title="YLEO" "/Users/stencate/Desktop/Music/Vincent/Beats/YLEO.mp3"
-eyeD3 --title="EGRH" "/Users/stencate/Desktop/Music/Vincent/Beats/EGRH.mp3"
-eyeD3 --title="LWUO" "/Users/stencate/Desktop/Music/Vincent/Beats/LWUO.mp3"
-eyeD3 --title="HKAH" "/Users/stencate/Desktop/Music/Vincent/Beats/HKAH.mp3"
-eyeD3 --title="WOXG" "/Users/stencate/Desktop/Music/Vincent/Beats/WOXG.mp3"
-eyeD3 --title="HIBG" "/Users/stencate/Desktop/Music/Vincent/Beats/HIBG.mp3"
-eyeD3 --title="RDDN" "/Users/stencate/Desktop/Music/Vincent/Beats/RDDN.mp3"
-eyeD3 --title="OKWZ" "/Users/stencate/Desktop/Music/Vincent/Beats/OKWZ.mp3"
-eyeD3 --title="VCEJ" "/Users/stencate/Desktop/Music/Vincent/Beats/VCEJ.mp3"
-eyeD3 --title="ETFT" "/Users/stencate/Desktop/Music/Vincent/Beats/ETFT.mp3"
-eyeD3 --title="CWEM" "/Users/stencate/Desktop/Music/Vincent/Beats/CWEM.mp3"
-eyeD3 --title="SUYI" "/Users/stencate/Desktop/Music/Vincent/Beats/SUYI.mp3"
-eyeD3 --title="EIIF" "/Users/stencate/Desktop/Music/Vincent/Beats/EIIF.mp3"
-eyeD3 --title="RWGE" "/Users/stencate/Desktop/Music/Vincent/Beats/RWGE.mp3"
-eyeD3 --title="DLFR" "/Users/stencate/Desktop/Music/Vincent/Beats/DLFR.mp3"
-eyeD3 --title="UOAO" "/Users/stencate/Desktop/Music/Vincent/Beats/UOAO.mp3"
-eyeD3 --title="UDEL" "/Users/stencate/Desktop/Music/Vincent/Beats/UDEL.mp3"
-eyeD3 --title="UVTY" "/Users/stencate/Desktop/Music/Vincent/Beats/UVTY.mp3"
-eyeD3 --title="LGEE" "/Users/stencate/Desktop/Music/Vincent/Beats/LGEE.mp3"
-eyeD3 --title="OWQF" "/Users/stencate/Desktop/Music/Vincent/Beats/OWQF.mp3"
-eyeD3 --title="EGHN" "/Users/stencate/Desktop/Music/Vincent/Beats/EGHN.mp3"
-eyeD3 --title="QRFK" "/Users/stencate/Desktop/Music/Vincent/Beats/QRFK.mp3"
-eyeD3 --title="KBCZ" "/Users/stencate/Desktop/Music/Vincent/Beats/KBCZ.mp3"
-eyeD3 --title="LMDY" "/Users/stencate/Desktop/Music/Vincent/Beats/LMDY.mp3"
-eyeD3 --title="KZDJ" "/Users/stencate/Desktop/Music/Vincent/Beats/KZDJ.mp3"
-eyeD3 --title="BZEB" "/Users/stencate/Desktop/Music/Vincent/Beats/BZEB.mp3"
-eyeD3 --title="TRFC" "/Users/stencate/Desktop/Music/Vincent/Beats/TRFC.mp3"
-eyeD3 --title="ISOC" "/Users/stencate/Desktop/Music/Vincent/Beats/ISOC.mp3"
-eyeD3 --title="ALGH" "/Users/stencate/Desktop/Music/Vincent/Beats/ALGH.mp3"
-eyeD3 --title="GUXH" "/Users/stencate/Desktop/Music/Vincent/Beats/GUXH.mp3"
-eyeD3 --title="SEEH" "/Users/stencate/Desktop/Music/Vincent/Beats/SEEH.mp3"
-eyeD3 --title="YNZG" "/Users/stencate/Desktop/Music/Vincent/Beats/YNZG.mp3"
-eyeD3 --title="FTGR" "/Users/stencate/Desktop/Music/Vincent/Beats/FTGR.mp3"
-eyeD3 --title="OFNO" "/Users/stencate/Desktop/Music/Vincent/Beats/OFNO.mp3"
-eyeD3 --title="FJVI" "/Users/stencate/Desktop/Music/Vincent/Beats/FJVI.mp3"
-eyeD3 --title="LXOC" "/Users/stencate/Desktop/Music/Vincent/Beats/LXOC.mp3"
-eyeD3 --title="ZKZX" "/Users/stencate/Desktop/Music/Vincent/Beats/ZKZX.mp3"
-eyeD3 --title="ZOTB" "/Users/stencate/Desktop/Music/Vincent/Beats/ZOTB.mp3"
-eyeD3 --title="VGUY" "/Users/stencate/Desktop/Music/Vincent/Beats/VGUY.mp3"
-eyeD3 --title="PFCQ" "/Users/stencate/Desktop/Music/Vincent/Beats/PFCQ.mp3"
-eyeD3 --title="INSK" "/Users/stencate/Desktop/Music/Vincent/Beats/INSK.mp3"
-eyeD3 --title="MLWD" "/Users/stencate/Desktop/Music/Vincent/Beats/MLWD.mp3"
-eyeD3 --title="URPR" "/Users/stencate/Desktop/Music/Vincent/Beats/URPR.mp3"
-eyeD3 --title="NCYX" "/Users/stencate/Desktop/Music/Vincent/Beats/NCYX.mp3"
-eyeD3 --title="YYAR" "/Users/stencate/Desktop/Music/Vincent/Beats/YYAR.mp3"
-eyeD3 --title="SXNK" "/Users/stencate/Desktop/Music/Vincent/Beats/SXNK.mp3"
-eyeD3 --title="OEST" "/Users/stencate/Desktop/Music/Vincent/Beats/OEST.mp3"
-eyeD3 --title="YPEK" "/Users/stencate/Desktop/Music/Vincent/Remixes/YPEK.mp3"
-eyeD3 --title="FJVU" "/Users/stencate/Desktop/Music/Vincent/Remixes/FJVU.mp3"
-eyeD3 --title="v10kd-howhigh" "/Users/stencate/Desktop/Music/Vincent/Remixes/v10kd-howhigh.mp3"
-eyeD3 --title="v10kd-howhigh4" "/Users/stencate/Desktop/Music/Vincent/Remixes/v10kd-howhigh4.mp3"
-eyeD3 --title="Homeboyz" "/Users/stencate/Desktop/Music/Vincent/Remixes/Tupac - Homeboyz.mp3"
-eyeD3 --title="Rock the Boat (remix)" "/Users/stencate/Desktop/Music/Vincent/Remixes/Aaliyah - Rock the Boat (remix).mp3"
-eyeD3 --title="ERQG" "/Users/stencate/Desktop/Music/Vincent/Remixes/ERQG.mp3"
-eyeD3 --title="v10kd-howhigh3" "/Users/stencate/Desktop/Music/Vincent/Remixes/v10kd-howhigh3.mp3"
-eyeD3 --title="v10kd-howhigh2" "/Users/stencate/Desktop/Music/Vincent/Remixes/v10kd-howhigh2.mp3"
-eyeD3 --title="Rock the Boat (remix 2)" "/Users/stencate/Desktop/Music/Vincent/Remixes/Aaliyah - Rock the Boat (remix 2).mp3"
-eyeD3 --title="LWQR" "/Users/stencate/Desktop/Music/Vincent/Raps/LWQR.mp3"
-eyeD3 --title="LJPE" "/Users/stencate/Desktop/Music/Vincent/Raps/LJPE.mp3"
-eyeD3 --title="DHUU" "/Users/stencate/Desktop/Music/Vincent/Raps/DHUU.mp3"
+python3 "$SCRIPT_DIR/tag_mp3.py" --manifest "$SCRIPT_DIR/batch_tag_mp3s.csv" "$@"
 
 echo "Batch MP3 tagging finished."
-echo "Please check the output above for any errors." 
\ No newline at end of file
+echo "Please check the output above for any errors."
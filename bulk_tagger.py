@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+
+import io
+import os
+from contextlib import redirect_stdout
+from functools import partial
+from multiprocessing import Pool, cpu_count
+import eyed3
+import eyed3.id3
+import eyed3.mp3
+from id3_reader import ID3ReadError, read_tag, parse_count_total
+from id3_writer import save_tag, DEFAULT_TAG_PADDING
+
+# eyed3 tag attributes holding (number, total) pairs.
+COUNT_TOTAL_FIELDS = ("track_num", "disc_num")
+
+# eyed3 tag attributes that id3_reader can read, by id3_reader field name.
+READER_FIELDS = {
+    "artist": "artist", "album": "album", "title": "title",
+    "album_artist": "album_artist", "track_num": "track", "disc_num": "disc",
+}
+
+
+def format_value(value):
+    """Formats a field value for messages; track/disc numbers are (num, total) tuples."""
+    if isinstance(value, tuple):
+        num, total = value
+        if num is None:
+            return "(none)"
+        return f"{num}/{total}" if total is not None else str(num)
+    return "(none)" if value is None else repr(value)
+
+
+def current_value(tag, field):
+    """Returns the value of an eyed3 tag attribute, with count/total pairs as plain tuples."""
+    value = getattr(tag, field)
+    if field in COUNT_TOTAL_FIELDS:
+        return tuple(value) if value else (None, None)
+    return value
+
+
+def format_version(version):
+    """Formats an ID3 version tuple for messages, e.g. "v2.4"."""
+    return "(none)" if version is None else "v" + ".".join(str(part) for part in version[:2])
+
+
+def already_set(path, values, version=None):
+    """
+    Checks with the in-process tag reader (no eyed3 load) whether a file's
+    tag already holds all the given values (and, if version is given, is of
+    that ID3 version). Returns False whenever that cannot be decided cheaply,
+    so the caller falls back to comparing with eyed3.
+    """
+    if any(field not in READER_FIELDS for field in values):
+        return False
+    try:
+        tag = read_tag(path, fields={READER_FIELDS[field] for field in values})
+    except (OSError, ID3ReadError):
+        return False
+    if tag is None:
+        return False
+    if version and (tag["version"] is None or tuple(tag["version"][:2]) != tuple(version[:2])):
+        return False
+    for field, value in values.items():
+        current = tag[READER_FIELDS[field]]
+        if field in COUNT_TOTAL_FIELDS:
+            current = parse_count_total(current)
+        if current != value:
+            return False
+    return True
+
+
+def _apply_values(path, values, result, version, encoding, padding, init_unloadable):
+    audiofile = eyed3.load(path)
+    if audiofile is None and init_unloadable:
+        # eyed3 found no MPEG frames; tag the file anyway.
+        audiofile = eyed3.mp3.Mp3AudioFile(path)
+    if audiofile is None:
+        result["status"], result["message"] = "error", "could not load as an MP3 file"
+        return
+    if audiofile.tag is None:
+        audiofile.initTag(version=version or eyed3.id3.ID3_V2_4)
+    tag = audiofile.tag
+    if version and tuple(tag.version[:2]) != tuple(version[:2]):
+        # Saving with the requested version is part of the update.
+        result["changes"].append(("ID3 version", format_version(tag.version), format_version(version)))
+    for field, value in values.items():
+        old = current_value(tag, field)
+        if old != value:
+            setattr(tag, field, value)
+            result["changes"].append((field, old, value))
+    if result["changes"]:
+        save_tag(tag, version=version, encoding=encoding, padding=padding)
+        result["status"] = "updated"
+
+
+def update_file(item, version=None, encoding=None, padding=DEFAULT_TAG_PADDING, init_unloadable=False):
+    """
+    Worker: sets eyed3 tag attributes on one file and saves the tag, unless
+    every attribute already holds its target value and the tag already has
+    the requested version, in which case the file is not written at all
+    (so its mtime is kept and rsync skips it). Most unchanged files are
+    recognised by already_set without loading them with eyed3.
+
+    Args:
+        item: (path, values) where values maps eyed3 tag attributes (e.g.
+            "artist", "album_artist", "track_num") to the value to set
+        version: ID3 version to save as (default: the tag's own version)
+        encoding: Text encoding to save with, as for tag.save()
+        padding: Tag padding to reserve when the file has to be rewritten
+        init_unloadable: Give files eyed3 cannot load as MP3 (no valid
+            frames found) a new tag instead of reporting an error
+
+    Returns:
+        A dict with "path", "status" ("updated", "unchanged" or "error"),
+        "changes" (list of (field, old, new)), "message" and "output".
+    """
+    path, values = item
+    result = {"path": path, "status": "unchanged", "changes": [], "message": None}
+    output = io.StringIO()
+    with redirect_stdout(output):
+        try:
+            if not already_set(path, values, version):
+                _apply_values(path, values, result, version, encoding, padding, init_unloadable)
+        except Exception as e:
+            result["status"], result["message"] = "error", str(e)
+    result["output"] = output.getvalue()
+    return result
+
+
+def update_tags(items, version=None, encoding=None, padding=DEFAULT_TAG_PADDING, jobs=None, init_unloadable=False):
+    """
+    Bulk tag update engine shared by the set_* scripts: applies update_file
+    to every (path, values) item in a process pool, prints a line for each
+    updated or failed file and one summary at the end.
+
+    Args:
+        items: Iterable of (path, values), see update_file
+        version: ID3 version to save as (default: each tag's own version)
+        encoding: Text encoding to save with, as for tag.save()
+        padding: Tag padding to reserve when a file has to be rewritten
+        jobs: Number of worker processes (defaults to the number of CPUs)
+        init_unloadable: See update_file
+
+    Returns:
+        A dict of file counts per status.
+    """
+    counts = {"updated": 0, "unchanged": 0, "error": 0}
+    worker = partial(update_file, version=version, encoding=encoding, padding=padding,
+                     init_unloadable=init_unloadable)
+    with Pool(processes=jobs or cpu_count()) as pool:
+        # Tag edits are quick; hand them out in small batches but keep the order.
+        for result in pool.imap(worker, items, chunksize=8):
+            counts[result["status"]] += 1
+            print(result["output"], end="")
+            name = os.path.basename(result["path"])
+            if result["status"] == "error":
+                print(f"Error processing {result['path']}: {result['message']}")
+            for field, old, new in result["changes"]:
+                print(f"Updated {field} for '{name}': {format_value(old)} -> {format_value(new)}")
+
+    print(f"\n--- Summary ---")
+    print(f"Total MP3 files: {sum(counts.values())}")
+    print(f"Updated: {counts['updated']}")
+    print(f"Unchanged: {counts['unchanged']}")
+    print(f"Errors: {counts['error']}")
+    return counts
+
+
+def add_jobs_argument(parser):
+    """Adds the -j/--jobs option used by the bulk setters to an argparse parser."""
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=None,
+        help="Number of files to update in parallel. Defaults to the number of CPUs.",
+    )
@@ -1,27 +1,24 @@
 import os
-import eyed3
 import sys
-from pathlib import Path
+import argparse
+from library_index import iter_track_records, add_index_argument
+from scan_journal import add_walk_arguments, selected_mp3_paths
 
-def check_artists(directory):
+def check_artists(directory, index_path=None, mp3_paths=None):
     mp3_files = []
     files_with_artist = []
     files_without_artist = []
     
-    # Walk through directory
-    for root, _, files in os.walk(directory):
-        for file in files:
-            if file.lower().endswith('.mp3'):
-                full_path = os.path.join(root, file)
-                mp3_files.append(full_path)
-                
-                # Load the audio file
-                audiofile = eyed3.load(full_path)
-                if audiofile and audiofile.tag:
-                    if audiofile.tag.artist:
-                        files_with_artist.append((full_path, audiofile.tag.artist))
-                    else:
-                        files_without_artist.append(full_path)
+    # Walk through directory (or read the library index)
+    for record in iter_track_records(directory, index_path, mp3_paths, fields=["artist"]):
+        full_path = record["path"]
+        mp3_files.append(full_path)
+        
+        if record["has_tag"]:
+            if record["artist"]:
+                files_with_artist.append((full_path, record["artist"]))
+            else:
+                files_without_artist.append(full_path)
     
     # Print results
     print(f"\nTotal MP3 files found: {len(mp3_files)}")
@@ -39,13 +36,16 @@ def check_artists(directory):
             print(f"{os.path.basename(path)}")
 
 if __name__ == "__main__":
-    if len(sys.argv) != 2:
-        print("Usage: python check_artists.py <directory_path>")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(description="Report which MP3 files have an artist tag.")
+    parser.add_argument("directory_path", help="The directory to scan.")
+    add_index_argument(parser)
+    add_walk_arguments(parser)
+    args = parser.parse_args()
     
-    directory = sys.argv[1]
+    directory = args.directory_path
     if not os.path.exists(directory):
         print(f"Error: Directory '{directory}' does not exist")
         sys.exit(1)
         
-    check_artists(directory) 
\ No newline at end of file
+    with selected_mp3_paths(directory, args, "check_artists") as mp3_paths:
+        check_artists(directory, args.index, mp3_paths)
@@ -2,15 +2,53 @@
 
 import os
 import sys
-import subprocess
+import argparse
 from pathlib import Path
+from id3_reader import read_tag, ID3ReadError, PICTURE_TYPES
+from scan_journal import add_walk_arguments, selected_mp3_paths
 
-def show_mp3_metadata(music_directory):
+def format_tag(tag):
+    """Formats a read_tag() result roughly the way the eyeD3 command prints it."""
+    lines = []
+    audio_info = tag.get("audio_info")
+    if audio_info:
+        minutes, seconds = divmod(int(audio_info["time_secs"]), 60)
+        lines.append(f"Time: {minutes:02d}:{seconds:02d}\tMPEG{audio_info['mpeg_version']}, Layer {'I' * audio_info['layer']}"
+                     f"\t[ {'~' if audio_info['vbr'] else ''}{audio_info['bit_rate']} kb/s @ {audio_info['sample_rate']} Hz - {audio_info['channel_mode']} ]")
+    elif "audio_info" in tag:
+        lines.append("Time: unknown (no MPEG audio frames found)")
+
+    if tag["version"] is None:
+        lines.append("No ID3 v1.x/v2.x tag found!")
+        return "\n".join(lines)
+
+    lines.append(f"ID3 v{tag['version'][0]}.{tag['version'][1]}:")
+    lines.append(f"title: {tag['title'] or ''}")
+    lines.append(f"artist: {tag['artist'] or ''}")
+    lines.append(f"album: {tag['album'] or ''}")
+    lines.append(f"album artist: {tag['album_artist'] or ''}")
+    lines.append(f"track: {tag['track'] or ''}")
+    if tag["disc"]:
+        lines.append(f"disc: {tag['disc']}")
+    for image in tag.get("images", []):
+        picture_type = PICTURE_TYPES[image["picture_type"]] if image["picture_type"] < len(PICTURE_TYPES) else image["picture_type"]
+        lines.append(f"{picture_type} Image: [Size: {image['size']} bytes] [Type: {image['mime_type']}]")
+        if image["description"]:
+            lines.append(f"Description: {image['description']}")
+    return "\n".join(lines)
+
+def show_mp3_metadata(music_directory, mp3_paths=None, audio_info=False):
     """
     Shows all ID3 metadata for MP3 files in a directory.
 
+    Only the ID3 tag block is read (picture data is skipped); the MPEG audio
+    frames are only inspected when audio_info is set.
+
     Args:
         music_directory (str): The directory containing MP3 files.
+        mp3_paths (list): Optional explicit list of MP3 files to show instead
+            of scanning the whole directory.
+        audio_info (bool): Also show duration and bit rate.
     """
     music_path = Path(music_directory)
     if not music_path.is_dir():
@@ -21,17 +59,17 @@ def show_mp3_metadata(music_directory):
 
     print(f"Scanning MP3 files in: {music_path}\n")
 
-    for mp3_file_path in music_path.rglob("*.mp3"):
+    files_to_show = music_path.rglob("*.mp3") if mp3_paths is None else map(Path, mp3_paths)
+    for mp3_file_path in files_to_show:
         total_files += 1
         print(f"\n=== {mp3_file_path.name} ===")
         try:
-            # Run eyeD3 command and capture output
-            result = subprocess.run(['eyeD3', str(mp3_file_path)], 
-                                 capture_output=True, 
-                                 text=True)
-            print(result.stdout)
-            if result.stderr:
-                print("Errors/Warnings:", result.stderr)
+            tag = read_tag(mp3_file_path, images=True, audio_info=audio_info)
+            if tag is None:
+                tag = {"version": None}
+            print(format_tag(tag))
+        except ID3ReadError as e:
+            print(f"Errors/Warnings: Tag read failed: {e}")
         except Exception as e:
             print(f"Error processing {mp3_file_path.name}: {str(e)}")
 
@@ -39,9 +77,12 @@ def show_mp3_metadata(music_directory):
     print(f"Total MP3 files processed: {total_files}")
 
 if __name__ == "__main__":
-    if len(sys.argv) != 2:
-        print("Usage: python check_mp3_titles.py <music_directory>")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(description="Show all ID3 metadata for the MP3 files in a directory.")
+    parser.add_argument("music_directory", help="The directory containing MP3 files.")
+    parser.add_argument("--audio-info", action="store_true", help="Also read the first MPEG frames to show duration and bit rate.")
+    add_walk_arguments(parser)
+    args = parser.parse_args()
 
-    directory_to_scan = sys.argv[1]
-    show_mp3_metadata(directory_to_scan) 
\ No newline at end of file
+    directory_to_scan = args.music_directory
+    with selected_mp3_paths(directory_to_scan, args, "check_mp3_titles") as mp3_paths:
+        show_mp3_metadata(directory_to_scan, mp3_paths, args.audio_info)
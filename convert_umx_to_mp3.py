@@ -1,68 +1,43 @@
 import os
-import subprocess
 import sys
+import argparse
 from pathlib import Path
+from transcoder import (TRANSCODE_LOG_FILENAME, add_profile_arguments, add_tag_arguments, make_profile, make_tagged_job,
+                        profile_from_args, run_jobs, tagging_from_args)
 
-def convert_umx_to_mp3(input_dir):
+# Same as the old `-qscale:a 2` encode.
+DEFAULT_PROFILE = make_profile(quality=2)
+
+def convert_umx_to_mp3(input_dir, profile=DEFAULT_PROFILE, jobs=None, force=False, tagging=None):
+    """
+    Converts the UMX modules in a directory to MP3 next to them. Each module is
+    rendered by openmpt123 and piped straight into the encoder by the
+    transcoder, which also writes any requested tags (see
+    transcoder.tagging_from_args) while encoding. Modules whose MP3 is up to
+    date for the profile and tags are skipped.
+
+    Returns:
+        True if every module was converted (or skipped).
+    """
     # Find all UMX files in the input directory
-    umx_files = list(Path(input_dir).glob('*.umx'))
+    umx_files = sorted(Path(input_dir).glob('*.umx'))
     print(f"Found {len(umx_files)} UMX files to convert")
-    
-    successful_conversions = 0
-    failed_conversions = 0
-    
-    for umx_file in umx_files:
-        wav_file = umx_file.with_suffix('.wav')
-        mp3_file = umx_file.with_suffix('.mp3')
-        
-        # Step 1: Convert UMX to WAV using openmpt123
-        print(f"Converting {umx_file.name} to WAV...")
-        openmpt_cmd = [
-            'openmpt123',
-            '--render',
-            '--output-type', 'wav',
-            '--output', str(wav_file),
-            '--force',
-            str(umx_file)
-        ]
-        
-        try:
-            subprocess.run(openmpt_cmd, check=True, capture_output=True, text=True)
-        except subprocess.CalledProcessError as e:
-            print(f"Error converting to WAV: {e.stderr}")
-            failed_conversions += 1
-            continue
-        
-        # Step 2: Convert WAV to MP3 using ffmpeg
-        print(f"Converting {wav_file.name} to MP3...")
-        ffmpeg_cmd = [
-            'ffmpeg',
-            '-i', str(wav_file),
-            '-codec:a', 'libmp3lame',
-            '-qscale:a', '2',
-            str(mp3_file)
-        ]
-        
-        try:
-            subprocess.run(ffmpeg_cmd, check=True, capture_output=True, text=True)
-            # Clean up the temporary WAV file
-            os.remove(wav_file)
-            successful_conversions += 1
-        except subprocess.CalledProcessError as e:
-            print(f"Error converting to MP3: {e.stderr}")
-            failed_conversions += 1
-            # Clean up the temporary WAV file even if MP3 conversion failed
-            if os.path.exists(wav_file):
-                os.remove(wav_file)
-    
-    print(f"\nConversion complete:")
-    print(f"Successfully converted: {successful_conversions} files")
-    print(f"Failed to convert: {failed_conversions} files")
+
+    jobs_iter = (make_tagged_job(str(umx_file), profile, tagging) for umx_file in umx_files)
+    counts = run_jobs(jobs_iter, jobs, os.path.join(input_dir, TRANSCODE_LOG_FILENAME), force)
+    return counts['failed'] == 0
 
 if __name__ == "__main__":
-    if len(sys.argv) != 2:
-        print("Usage: python convert_umx_to_mp3.py <input_directory>")
+    parser = argparse.ArgumentParser(description="Convert the UMX modules in a directory to MP3.")
+    parser.add_argument("input_dir", help="Directory containing .umx files.")
+    add_profile_arguments(parser, DEFAULT_PROFILE)
+    add_tag_arguments(parser)
+    args = parser.parse_args()
+
+    try:
+        tagging = tagging_from_args(args)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}")
         sys.exit(1)
-    
-    input_dir = sys.argv[1]
-    convert_umx_to_mp3(input_dir) 
\ No newline at end of file
+    success = convert_umx_to_mp3(args.input_dir, profile_from_args(args), args.jobs, args.force, tagging)
+    sys.exit(0 if success else 1)
@@ -1,45 +1,55 @@
 import os
 import sys
-from pydub import AudioSegment
+import argparse
+from transcoder import (TRANSCODE_LOG_FILENAME, add_profile_arguments, add_tag_arguments, find_inputs, make_profile,
+                        make_tagged_job, profile_from_args, run_jobs, tagging_from_args)
 
-def convert_wav_to_mp3(input_path):
+def convert_wav_to_mp3(input_path, profile=None, jobs=None, force=False, tagging=None):
+    """
+    Converts a WAV file, or every WAV file below a directory, to MP3 next to
+    it with the transcoder, writing any requested tags while encoding. Files
+    whose MP3 is already up to date for the profile and tags are skipped.
+
+    Args:
+        input_path: A WAV file or a directory
+        profile: Output profile (default: CBR 192k)
+        jobs: Number of files to convert in parallel (defaults to the number of CPUs)
+        force: Convert again even if the MP3 is up to date
+        tagging: Tags to write while encoding (see transcoder.tagging_from_args)
+
+    Returns:
+        True if every file was converted (or skipped).
+    """
+    profile = profile or make_profile()
     # Check if input is a file or directory
     if os.path.isfile(input_path):
-        if input_path.lower().endswith('.wav'):
-            convert_single_file(input_path)
-        else:
+        if not input_path.lower().endswith('.wav'):
             print(f"Error: {input_path} is not a WAV file")
+            return False
+        wav_paths = [input_path]
+        log_dir = os.path.dirname(os.path.abspath(input_path))
     elif os.path.isdir(input_path):
-        convert_directory(input_path)
+        wav_paths = find_inputs(input_path, {'.wav'})
+        log_dir = input_path
     else:
         print(f"Error: {input_path} is not a valid file or directory")
+        return False
 
-def convert_single_file(wav_path):
-    try:
-        # Load the WAV file
-        audio = AudioSegment.from_wav(wav_path)
-        
-        # Create MP3 path (replace .wav with .mp3)
-        mp3_path = wav_path[:-4] + '.mp3'
-        
-        # Export as MP3
-        audio.export(mp3_path, format='mp3', bitrate='192k')
-        print(f"Converted {wav_path} to {mp3_path}")
-    except Exception as e:
-        print(f"Error converting {wav_path}: {str(e)}")
-
-def convert_directory(directory):
-    # Walk through directory
-    for root, _, files in os.walk(directory):
-        for file in files:
-            if file.lower().endswith('.wav'):
-                wav_path = os.path.join(root, file)
-                convert_single_file(wav_path)
+    jobs_iter = (make_tagged_job(wav_path, profile, tagging) for wav_path in wav_paths)
+    counts = run_jobs(jobs_iter, jobs, os.path.join(log_dir, TRANSCODE_LOG_FILENAME), force)
+    return counts['failed'] == 0
 
 if __name__ == "__main__":
-    if len(sys.argv) != 2:
-        print("Usage: python convert_wav_to_mp3.py <wav_file_or_directory>")
+    parser = argparse.ArgumentParser(description="Convert a WAV file, or every WAV file below a directory, to MP3.")
+    parser.add_argument("input_path", help="A WAV file or a directory.")
+    add_profile_arguments(parser)
+    add_tag_arguments(parser)
+    args = parser.parse_args()
+
+    try:
+        tagging = tagging_from_args(args)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}")
         sys.exit(1)
-    
-    input_path = sys.argv[1]
-    convert_wav_to_mp3(input_path) 
\ No newline at end of file
+    success = convert_wav_to_mp3(args.input_path, profile_from_args(args), args.jobs, args.force, tagging)
+    sys.exit(0 if success else 1)
@@ -2,14 +2,45 @@ import os
 import subprocess
 import sys
 import argparse
+from multiprocessing import Pool, cpu_count
+from id3_reader import read_tag, ID3ReadError
+from library_index import iter_mp3_files, iter_track_records, is_field_missing, add_index_argument
+from scan_journal import add_walk_arguments, selected_mp3_paths
 
-def find_mp3s_without_artist(music_folder):
+def check_artist_in_process(filepath):
+    """
+    Worker for the in-process mode: reads only the ID3 header and the artist
+    frame of one file. Returns (filepath, is_artist_missing, error).
+    """
+    try:
+        tag = read_tag(filepath, ["artist"])
+    except ID3ReadError:
+        # eyeD3 prints "Tag read failed" for these, which the CLI mode counts as missing.
+        return filepath, True, None
+    except OSError as e:
+        return filepath, None, str(e)
+
+    if tag is None:
+        # Same as eyeD3's "No ID3 v1.x/v2.x tag found!"
+        return filepath, True, None
+    artist = (tag["artist"] or "").strip()
+    return filepath, not artist or artist == "None", None
+
+def find_mp3s_without_artist(music_folder, index_path=None, mp3_paths=None, use_eyed3_cli=False, jobs=None):
     """
     Finds all MP3 files in the given folder and its subfolders
     that do not have an artist ID3 tag.
 
     Args:
         music_folder (str): The path to the music folder.
+        index_path (str): Optional library index database. When given, tags are
+            read from the index instead of running eyeD3 on every file.
+        mp3_paths (list): Optional explicit list of MP3 files to check instead
+            of walking the whole folder (e.g. only files changed since last run).
+        use_eyed3_cli (bool): Run the eyeD3 command per file instead of the
+            in-process header-only reader.
+        jobs (int): Number of worker processes for the in-process reader
+            (defaults to the number of CPUs).
     """
     music_folder = os.path.abspath(os.path.expanduser(music_folder))
 
@@ -17,44 +48,60 @@ def find_mp3s_without_artist(music_folder):
         print(f"Error: Directory not found: {music_folder}", file=sys.stderr)
         sys.exit(1)
 
-    for root, _, files in os.walk(music_folder):
-        for file in files:
-            if file.lower().endswith(".mp3"):
-                filepath = os.path.join(root, file)
-                # --- DEBUG FOCUS ON ONE FILE (REMOVED) ---
-                # if filepath != "/Users/stencate/Desktop/Music/Sybren/Raps/I don't care.mp3":
-                #     continue
-                # print(f"DEBUG: Processing file: {filepath}")
-                # --- END DEBUG FOCUS (REMOVED) ---
-                try:
-                    result = subprocess.run(
-                        ["eyeD3", "--no-color", filepath],
-                        capture_output=True,
-                        text=True,
-                        check=True
-                    )
-                    output = result.stdout
-                    is_artist_missing = True
-                    for line_num, line in enumerate(output.splitlines()):
-                        if line.startswith("artist:"):
-                            artist_value_part = line.split("artist:", 1)[1]
-                            stripped_artist_value = artist_value_part.strip()
-                            
-                            if stripped_artist_value and stripped_artist_value != "None":
-                                is_artist_missing = False
-                                break 
+    if index_path:
+        for record in iter_track_records(music_folder, index_path, mp3_paths):
+            # Files that fail to load count as missing, as in the eyeD3 mode.
+            if is_field_missing(record, "artist"):
+                print(record["path"])
+        return
+
+    candidates = iter_mp3_files(music_folder) if mp3_paths is None else mp3_paths
+
+    if not use_eyed3_cli:
+        with Pool(processes=jobs or cpu_count()) as pool:
+            # imap keeps the walk order, so the output matches the eyeD3 mode.
+            for filepath, is_artist_missing, error in pool.imap(check_artist_in_process, candidates, chunksize=32):
+                if error:
+                    print(f"Error processing {filepath}: {error}", file=sys.stderr)
+                elif is_artist_missing:
+                    print(filepath)
+        return
+
+    for filepath in candidates:
+        # --- DEBUG FOCUS ON ONE FILE (REMOVED) ---
+        # if filepath != "/Users/stencate/Desktop/Music/Sybren/Raps/I don't care.mp3":
+        #     continue
+        # print(f"DEBUG: Processing file: {filepath}")
+        # --- END DEBUG FOCUS (REMOVED) ---
+        try:
+            result = subprocess.run(
+                ["eyeD3", "--no-color", filepath],
+                capture_output=True,
+                text=True,
+                check=True
+            )
+            output = result.stdout
+            is_artist_missing = True
+            for line_num, line in enumerate(output.splitlines()):
+                if line.startswith("artist:"):
+                    artist_value_part = line.split("artist:", 1)[1]
+                    stripped_artist_value = artist_value_part.strip()
                     
-                    if is_artist_missing:
-                        print(filepath)
+                    if stripped_artist_value and stripped_artist_value != "None":
+                        is_artist_missing = False
+                        break 
+            
+            if is_artist_missing:
+                print(filepath)
 
-                except subprocess.CalledProcessError as e:
-                    if "No ID3 v1.x/v2.x tag found!" in e.stdout or "Tag read failed" in e.stdout:
-                         print(filepath) 
-                    else:
-                        print(f"Error processing {filepath} with eyeD3: {e.stderr or e.stdout}", file=sys.stderr)
-                except FileNotFoundError:
-                    print("Error: eyeD3 command not found. Please ensure it's installed and in your PATH.", file=sys.stderr)
-                    sys.exit(1)
+        except subprocess.CalledProcessError as e:
+            if "No ID3 v1.x/v2.x tag found!" in e.stdout or "Tag read failed" in e.stdout:
+                 print(filepath) 
+            else:
+                print(f"Error processing {filepath} with eyeD3: {e.stderr or e.stdout}", file=sys.stderr)
+        except FileNotFoundError:
+            print("Error: eyeD3 command not found. Please ensure it's installed and in your PATH.", file=sys.stderr)
+            sys.exit(1)
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Find MP3 files without an artist ID3 tag.")
@@ -64,6 +111,20 @@ if __name__ == "__main__":
         default="~/Desktop/Music/", 
         help="The path to the music folder to scan. Defaults to ~/Desktop/Music/"
     )
+    parser.add_argument(
+        "--eyed3-cli",
+        action="store_true",
+        help="Run the eyeD3 command for every file instead of the in-process header-only reader."
+    )
+    parser.add_argument(
+        "-j", "--jobs",
+        type=int,
+        default=None,
+        help="Number of worker processes for the in-process reader. Defaults to the number of CPUs."
+    )
+    add_index_argument(parser)
+    add_walk_arguments(parser)
     args = parser.parse_args()
     music_directory = os.path.expanduser(args.music_folder)
-    find_mp3s_without_artist(music_directory) 
\ No newline at end of file
+    with selected_mp3_paths(music_directory, args, "find_mp3s_without_artist") as mp3_paths:
+        find_mp3s_without_artist(music_directory, args.index, mp3_paths, args.eyed3_cli, args.jobs) 
\ No newline at end of file
@@ -0,0 +1,544 @@
+#!/usr/bin/env python3
+
+import os
+import struct
+import zlib
+
+# Text frames we know how to read, by field name: (ID3v2.3/2.4 id, ID3v2.2 id).
+TEXT_FRAMES = {
+    "title": ("TIT2", "TT2"),
+    "artist": ("TPE1", "TP1"),
+    "album": ("TALB", "TAL"),
+    "album_artist": ("TPE2", "TP2"),
+    "track": ("TRCK", "TRK"),
+    "disc": ("TPOS", "TPA"),
+}
+
+TEXT_ENCODINGS = {0: "latin-1", 1: "utf-16", 2: "utf-16-be", 3: "utf-8"}
+
+# APIC picture types, using the same names as eyed3.id3.frames.ImageFrame.
+PICTURE_TYPES = [
+    "OTHER", "ICON", "OTHER_ICON", "FRONT_COVER", "BACK_COVER", "LEAFLET",
+    "MEDIA", "LEAD_ARTIST", "ARTIST", "CONDUCTOR", "BAND", "COMPOSER",
+    "LYRICIST", "RECORDING_LOCATION", "DURING_RECORDING", "DURING_PERFORMANCE",
+    "VIDEO", "BRIGHT_COLORED_FISH", "ILLUSTRATION", "BAND_LOGO", "PUBLISHER_LOGO",
+]
+
+
+class ID3ReadError(Exception):
+    """Raised when an ID3v2 tag is present but cannot be parsed."""
+
+
+def _synchsafe(data):
+    return (data[0] << 21) | (data[1] << 14) | (data[2] << 7) | data[3]
+
+
+def _deunsynchronise(data):
+    return data.replace(b"\xff\x00", b"\xff")
+
+
+def decode_text_frame(payload):
+    """Decodes the payload of a T*** text frame into a string (None if empty)."""
+    if not payload:
+        return None
+    encoding = TEXT_ENCODINGS.get(payload[0])
+    if encoding is None:
+        raise ID3ReadError(f"Unknown text encoding byte {payload[0]}")
+    raw = payload[1:]
+    if encoding.startswith("utf-16"):
+        # Trim trailing UTF-16 NULs on a 2-byte boundary, then decode.
+        if len(raw) % 2:
+            raw = raw[:-1]
+        while raw[-2:] == b"\x00\x00":
+            raw = raw[:-2]
+        if encoding == "utf-16" and raw[:2] not in (b"\xff\xfe", b"\xfe\xff"):
+            encoding = "utf-16-le"
+    else:
+        raw = raw.rstrip(b"\x00")
+    text = raw.decode(encoding, errors="replace")
+    # ID3v2.4 separates multiple values with NUL; keep the first like eyed3 does.
+    text = text.split("\x00")[0]
+    return text or None
+
+
+def read_id3v1(f):
+    """Returns the ID3v1 fields of an open file, or None if it has no ID3v1 tag."""
+    try:
+        f.seek(-128, os.SEEK_END)
+    except OSError:
+        return None
+    data = f.read(128)
+    if len(data) != 128 or data[:3] != b"TAG":
+        return None
+
+    def field(raw):
+        return raw.split(b"\x00")[0].decode("latin-1").strip() or None
+
+    tag = {
+        "version": (1, 0, 0),
+        "title": field(data[3:33]),
+        "artist": field(data[33:63]),
+        "album": field(data[63:93]),
+        "album_artist": None,
+        "track": None,
+        "disc": None,
+    }
+    # ID3v1.1 stores the track number in the last comment byte.
+    if data[125] == 0 and data[126] != 0:
+        tag["version"] = (1, 1, 0)
+        tag["track"] = str(data[126])
+    return tag
+
+
+def read_id3v2(f, fields=None, images=False):
+    """
+    Reads the requested text fields from the ID3v2 tag at the start of an open
+    file. Only the 10-byte tag header, each frame header and the payloads of the
+    wanted frames are read; all other frames, including picture data, are
+    skipped with a seek. The MPEG audio frames are never touched.
+
+    Args:
+        f: File object opened in binary mode, positioned anywhere
+        fields: Iterable of names from TEXT_FRAMES (default: all of them)
+        images: Also describe APIC/PIC frames (type, MIME, description, size,
+                file offset of the picture data) without reading the pictures
+
+    Returns:
+        A dict with "version", "tag_size" (bytes from the start of the file to
+        the end of the tag), one entry per requested field and, if images was
+        set, an "images" list. None if the file does not start with an ID3v2 tag.
+    """
+    fields = list(TEXT_FRAMES) if fields is None else list(fields)
+    f.seek(0)
+    header = f.read(10)
+    if len(header) < 10 or header[:3] != b"ID3":
+        return None
+
+    major, revision, flags = header[3], header[4], header[5]
+    if major not in (2, 3, 4):
+        raise ID3ReadError(f"Unsupported ID3v2 version 2.{major}")
+    tag_size = _synchsafe(header[6:10])
+    tag = {"version": (2, major, revision), "tag_size": 10 + tag_size + (10 if flags & 0x10 else 0)}
+    tag.update({name: None for name in fields})
+    if images:
+        tag["images"] = []
+
+    id_index = 1 if major == 2 else 0
+    wanted = {TEXT_FRAMES[name][id_index]: name for name in fields}
+    picture_id = "PIC" if major == 2 else "APIC"
+
+    body_start = 10
+    tag_end = body_start + tag_size
+    in_memory = False
+
+    if major < 4 and flags & 0x80:
+        # Tag-level unsynchronisation: frame sizes refer to the decoded data, so
+        # the block cannot be walked with seeks. Rare in practice; read it whole.
+        reader = _BufferReader(_deunsynchronise(f.read(tag_size)))
+        body_start, tag_end = 0, len(reader.data)
+        f = reader
+        in_memory = True
+
+    if flags & 0x40:
+        ext = f.read(4)
+        if major == 4:
+            ext_size = _synchsafe(ext)
+            f.seek(body_start + ext_size)
+        else:
+            ext_size = struct.unpack(">I", ext)[0]
+            f.seek(body_start + 4 + ext_size)
+
+    header_len = 6 if major == 2 else 10
+    remaining = len(wanted)
+    while remaining or images:
+        pos = f.tell()
+        if pos + header_len > tag_end:
+            break
+        frame_header = f.read(header_len)
+        if len(frame_header) < header_len or frame_header[0] == 0:
+            break  # Padding reached
+
+        if major == 2:
+            frame_id = frame_header[:3].decode("latin-1")
+            frame_size = int.from_bytes(frame_header[3:6], "big")
+            frame_flags = 0
+        else:
+            frame_id = frame_header[:4].decode("latin-1")
+            size_bytes = frame_header[4:8]
+            frame_size = _synchsafe(size_bytes) if major == 4 else struct.unpack(">I", size_bytes)[0]
+            frame_flags = int.from_bytes(frame_header[8:10], "big")
+
+        if not frame_id.isalnum():
+            raise ID3ReadError(f"Invalid frame id {frame_id!r} at offset {pos}")
+        if pos + header_len + frame_size > tag_end:
+            raise ID3ReadError(f"Frame {frame_id} runs past the end of the tag")
+
+        if images and frame_id == picture_id:
+            plain = not in_memory and not (frame_flags & _TRANSFORM_FLAGS[major] or (major == 4 and flags & 0x80))
+            image = _describe_picture(f, frame_size, major, frame_flags, flags, plain)
+            if image is not None:
+                tag["images"].append(image)
+            f.seek(pos + header_len + frame_size)
+            continue
+
+        name = wanted.get(frame_id)
+        if name is None or tag[name] is not None:
+            f.seek(frame_size, os.SEEK_CUR)
+            continue
+
+        payload = _frame_payload(f.read(frame_size), major, frame_flags, flags)
+        if payload is not None:
+            tag[name] = decode_text_frame(payload)
+        remaining -= 1
+
+    return tag
+
+
+# Frame flags that change the stored bytes (compression, encryption, grouping,
+# unsynchronisation, data length indicator), per ID3v2 major version.
+_TRANSFORM_FLAGS = {2: 0, 3: 0x00E0, 4: 0x004F}
+
+# How much of a picture frame to read to find the end of its description.
+_PICTURE_HEADER_PEEK = 1024
+
+
+def _describe_picture(f, frame_size, major, frame_flags, tag_flags, plain):
+    """
+    Parses the header of an APIC/PIC frame positioned at its payload. For plain
+    frames only the first bytes are read and the picture is located by offset;
+    transformed (compressed/unsynchronised) frames have to be decoded whole, in
+    which case the decoded bytes are kept under "data".
+    """
+    data_start = f.tell()
+    if plain:
+        payload = f.read(min(frame_size, _PICTURE_HEADER_PEEK))
+    else:
+        payload = _frame_payload(f.read(frame_size), major, frame_flags, tag_flags)
+        if payload is None:
+            return None
+
+    parsed = _parse_picture_header(payload, major)
+    if parsed is None and plain and frame_size > len(payload):
+        # Description longer than the peek window; fall back to the whole frame.
+        f.seek(data_start)
+        payload = f.read(frame_size)
+        parsed = _parse_picture_header(payload, major)
+    if parsed is None:
+        raise ID3ReadError("Malformed picture frame")
+
+    mime_type, picture_type, description, header_len = parsed
+    image = {
+        "picture_type": picture_type,
+        "mime_type": mime_type,
+        "description": description,
+    }
+    if plain:
+        image["size"] = frame_size - header_len
+        image["data_offset"] = data_start + header_len
+    else:
+        image["data"] = payload[header_len:]
+        image["size"] = len(image["data"])
+        image["data_offset"] = None
+    return image
+
+
+def _parse_picture_header(payload, major):
+    """Returns (mime_type, picture_type, description, header_length) or None if truncated."""
+    if len(payload) < 2:
+        return None
+    encoding = payload[0]
+    if major == 2:
+        image_format = payload[1:4].decode("latin-1", errors="replace")
+        mime_type = "image/" + image_format.lower().replace("jpg", "jpeg")
+        offset = 4
+    else:
+        mime_end = payload.find(b"\x00", 1)
+        if mime_end < 0:
+            return None
+        mime_type = payload[1:mime_end].decode("latin-1", errors="replace")
+        offset = mime_end + 1
+    if offset >= len(payload):
+        return None
+    picture_type = payload[offset]
+    offset += 1
+
+    if encoding in (1, 2):
+        # UTF-16 descriptions end with a NUL pair on an even boundary.
+        end = offset
+        while True:
+            end = payload.find(b"\x00\x00", end)
+            if end < 0:
+                return None
+            if (end - offset) % 2 == 0:
+                break
+            end += 1
+        terminator = 2
+    else:
+        end = payload.find(b"\x00", offset)
+        if end < 0:
+            return None
+        terminator = 1
+    description = decode_text_frame(bytes([encoding]) + payload[offset:end]) or ""
+    return mime_type, picture_type, description, end + terminator
+
+
+def read_image_data(file_path, image):
+    """Returns the picture bytes for an entry of a tag's "images" list."""
+    if image.get("data") is not None:
+        return image["data"]
+    with open(file_path, "rb") as f:
+        f.seek(image["data_offset"])
+        return f.read(image["size"])
+
+
+def _frame_payload(data, major, frame_flags, tag_flags):
+    """Undoes per-frame compression/unsynchronisation. Returns None for encrypted frames."""
+    if major == 3:
+        if frame_flags & 0x0040:
+            return None
+        compressed = frame_flags & 0x0080
+        if compressed:
+            data = data[4:]  # Decompressed size
+        if frame_flags & 0x0020:
+            data = data[1:]  # Group id
+        if compressed:
+            data = zlib.decompress(data)
+    elif major == 4:
+        if frame_flags & 0x0004:
+            return None
+        if frame_flags & 0x0040:
+            data = data[1:]
+        if frame_flags & 0x0001:
+            data = data[4:]
+        if frame_flags & 0x0002 or tag_flags & 0x80:
+            data = _deunsynchronise(data)
+        if frame_flags & 0x0008:
+            data = zlib.decompress(data)
+    return data
+
+
+class _BufferReader:
+    """Minimal file-like wrapper so an in-memory tag body can be walked like a file."""
+
+    def __init__(self, data):
+        self.data = data
+        self.pos = 0
+
+    def read(self, n):
+        chunk = self.data[self.pos:self.pos + n]
+        self.pos += len(chunk)
+        return chunk
+
+    def seek(self, offset, whence=os.SEEK_SET):
+        if whence == os.SEEK_CUR:
+            offset += self.pos
+        self.pos = offset
+
+    def tell(self):
+        return self.pos
+
+
+# MPEG audio frame header tables, indexed by (MPEG version, layer).
+_BITRATES = {
+    (1, 1): [0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448],
+    (1, 2): [0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384],
+    (1, 3): [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    (2, 1): [0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256],
+    (2, 2): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+    (2, 3): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+}
+_SAMPLE_RATES = {1: [44100, 48000, 32000], 2: [22050, 24000, 16000], 2.5: [11025, 12000, 8000]}
+_VERSIONS = {0: 2.5, 2: 2, 3: 1}
+_LAYERS = {1: 3, 2: 2, 3: 1}
+CHANNEL_MODES = ["Stereo", "Joint stereo", "Dual channel", "Mono"]
+
+# How far past the tag to look for the first MPEG frame before giving up.
+AUDIO_SYNC_SEARCH_BYTES = 64 * 1024
+
+
+def parse_frame_header(data):
+    """
+    Parses a 4-byte MPEG audio frame header.
+
+    Returns:
+        A dict with version, layer, bitrate (kb/s), sample_rate, padding,
+        channel_mode, protected (CRC present), frame_length and samples, or
+        None if the bytes are not a valid frame header.
+    """
+    if len(data) < 4 or data[0] != 0xFF or (data[1] & 0xE0) != 0xE0:
+        return None
+    version = _VERSIONS.get((data[1] >> 3) & 0x03)
+    layer = _LAYERS.get((data[1] >> 1) & 0x03)
+    bitrate_index = data[2] >> 4
+    sample_rate_index = (data[2] >> 2) & 0x03
+    if version is None or layer is None or bitrate_index in (0, 15) or sample_rate_index == 3:
+        return None
+
+    bitrate = _BITRATES[(1 if version == 1 else 2, layer)][bitrate_index]
+    sample_rate = _SAMPLE_RATES[version][sample_rate_index]
+    padding = (data[2] >> 1) & 0x01
+    if layer == 1:
+        frame_length = (12 * bitrate * 1000 // sample_rate + padding) * 4
+        samples = 384
+    else:
+        samples = 1152 if (layer == 2 or version == 1) else 576
+        frame_length = (samples // 8) * bitrate * 1000 // sample_rate + padding
+
+    return {
+        "version": version,
+        "layer": layer,
+        "bitrate": bitrate,
+        "sample_rate": sample_rate,
+        "padding": padding,
+        "channel_mode": CHANNEL_MODES[data[3] >> 6],
+        "protected": not (data[1] & 0x01),
+        "frame_length": frame_length,
+        "samples": samples,
+    }
+
+
+def find_first_frame(f, start, search_bytes=AUDIO_SYNC_SEARCH_BYTES):
+    """
+    Finds the first MPEG frame at or after start whose successor is also a
+    valid frame header. Returns (offset, header) or (None, None).
+    """
+    f.seek(start)
+    window = f.read(search_bytes + 4)
+    pos = window.find(b"\xff")
+    while 0 <= pos < search_bytes:
+        header = parse_frame_header(window[pos:pos + 4])
+        if header is not None:
+            f.seek(start + pos + header["frame_length"])
+            if parse_frame_header(f.read(4)) is not None:
+                return start + pos, header
+        pos = window.find(b"\xff", pos + 1)
+    return None, None
+
+
+def read_vbr_header(frame, header):
+    """
+    Reads a Xing/Info or VBRI header from the bytes of the first audio frame.
+
+    Returns:
+        A dict with "kind" ("Xing", "Info" or "VBRI"), "frames" and "bytes"
+        (either may be None), or None if the frame has no such header.
+    """
+    mono = header["channel_mode"] == "Mono"
+    if header["version"] == 1:
+        side_info = 17 if mono else 32
+    else:
+        side_info = 9 if mono else 17
+    offset = 4 + (2 if header["protected"] else 0) + side_info
+    marker = frame[offset:offset + 4]
+    if marker in (b"Xing", b"Info"):
+        flags = struct.unpack(">I", frame[offset + 4:offset + 8])[0]
+        pos = offset + 8
+        frames = total_bytes = None
+        if flags & 0x01:
+            frames = struct.unpack(">I", frame[pos:pos + 4])[0]
+            pos += 4
+        if flags & 0x02:
+            total_bytes = struct.unpack(">I", frame[pos:pos + 4])[0]
+        return {"kind": marker.decode(), "frames": frames, "bytes": total_bytes}
+    if frame[36:40] == b"VBRI":
+        total_bytes, frames = struct.unpack(">II", frame[46:54])
+        return {"kind": "VBRI", "frames": frames, "bytes": total_bytes}
+    return None
+
+
+def read_audio_info(f, audio_start, file_size):
+    """
+    Reads duration and bit rate from the first MPEG frame (and its Xing/Info/VBRI
+    header, if any). Only the first two frame headers are read; for CBR files
+    without a VBR header the duration is estimated from the audio byte count.
+
+    Returns:
+        A dict with time_secs, bit_rate (kb/s), vbr, sample_rate, channel_mode,
+        mpeg_version, layer and audio_start, or None if no MPEG frame was found.
+    """
+    offset, header = find_first_frame(f, audio_start)
+    if header is None:
+        return None
+
+    f.seek(offset)
+    first_frame = f.read(max(header["frame_length"], 64))
+    vbr_header = read_vbr_header(first_frame, header)
+
+    audio_bytes = file_size - offset
+    f.seek(-128, os.SEEK_END)
+    if f.read(3) == b"TAG":
+        audio_bytes -= 128
+
+    if vbr_header and vbr_header["frames"]:
+        time_secs = vbr_header["frames"] * header["samples"] / header["sample_rate"]
+        stream_bytes = vbr_header["bytes"] or audio_bytes
+        bit_rate = int(stream_bytes * 8 / time_secs / 1000) if time_secs else header["bitrate"]
+    else:
+        time_secs = audio_bytes * 8 / (header["bitrate"] * 1000)
+        bit_rate = header["bitrate"]
+
+    return {
+        "time_secs": time_secs,
+        "bit_rate": bit_rate,
+        "vbr": bool(vbr_header and vbr_header["kind"] in ("Xing", "VBRI")),
+        "sample_rate": header["sample_rate"],
+        "channel_mode": header["channel_mode"],
+        "mpeg_version": header["version"],
+        "layer": header["layer"],
+        "audio_start": offset,
+    }
+
+
+def parse_count_total(value):
+    """Splits a TRCK/TPOS value like "3/12" into (3, 12); missing parts are None."""
+    if not value:
+        return None, None
+    count, _, total = value.partition("/")
+    try:
+        count = int(count) if count.strip() else None
+    except ValueError:
+        count = None
+    try:
+        total = int(total) if total.strip() else None
+    except ValueError:
+        total = None
+    return count, total
+
+
+def read_tag(file_path, fields=None, images=False, audio_info=False):
+    """
+    Reads tag text fields the same way eyed3 picks a tag: the ID3v2 tag if one
+    exists, otherwise the ID3v1 tag. Picture payloads are never read, and the
+    MPEG audio frames are only looked at when audio_info is requested.
+
+    Args:
+        file_path: Path to the MP3 file
+        fields: Iterable of names from TEXT_FRAMES (default: all of them)
+        images: Also list embedded pictures (see read_id3v2)
+        audio_info: Also read duration/bit rate (see read_audio_info)
+
+    Returns:
+        A dict with "version" and the requested fields, or None if the file has
+        neither an ID3v2 nor an ID3v1 tag. If audio_info is set, the result
+        always has an "audio_info" entry and is never None.
+
+    Raises:
+        ID3ReadError: If an ID3v2 tag is present but malformed.
+    """
+    with open(file_path, "rb") as f:
+        tag = read_id3v2(f, fields, images)
+        if tag is None:
+            v1 = read_id3v1(f)
+            if v1 is not None:
+                wanted = list(TEXT_FRAMES) if fields is None else list(fields)
+                tag = {key: v1[key] for key in ["version"] + wanted}
+                tag["tag_size"] = 0
+                if images:
+                    tag["images"] = []
+
+        if audio_info:
+            if tag is None:
+                tag = {"version": None, "tag_size": 0}
+            f.seek(0, os.SEEK_END)
+            tag["audio_info"] = read_audio_info(f, tag["tag_size"], f.tell())
+        return tag
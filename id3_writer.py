@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+
+import os
+import shutil
+import struct
+import tempfile
+from eyed3.id3 import ID3_V2_2, frames as id3_frames
+from eyed3.id3.tag import FileInfo
+from id3_reader import ID3ReadError, _synchsafe, _deunsynchronise, _frame_payload, decode_text_frame
+
+# Frames whose description is how ffprobe names them (e.g. "iTunNORM"):
+# user-defined text and comments, by ID3v2 major version.
+DESCRIBED_FRAMES = {2: ("TXX", "COM"), 3: ("TXXX", "COMM"), 4: ("TXXX", "COMM")}
+
+# Padding reserved whenever a tag has to be rewritten, so later edits fit in
+# place (eyed3 itself only reserves 256 bytes).
+DEFAULT_TAG_PADDING = 4096
+
+
+def _to_synchsafe(value):
+    return bytes([(value >> 21) & 0x7F, (value >> 14) & 0x7F, (value >> 7) & 0x7F, value & 0x7F])
+
+
+def read_raw_tag(f):
+    """
+    Reads the ID3v2 tag at the start of an open file as raw frames, so it can
+    be written back with some frames removed. Frame payloads are kept exactly
+    as stored (still compressed/unsynchronised if they were).
+
+    Tag-level unsynchronisation of ID3v2.2/2.3 tags is undone and the extended
+    header is dropped, so the tag is rewritten without either.
+
+    Returns:
+        A dict with "major", "revision", "flags", "frames" (list of dicts with
+        "id", "flags" and "data") and "tag_size" (bytes from the start of the
+        file to the end of the tag), or None if there is no ID3v2 tag.
+
+    Raises:
+        ID3ReadError: If the tag is malformed.
+    """
+    f.seek(0)
+    header = f.read(10)
+    if len(header) < 10 or header[:3] != b"ID3":
+        return None
+
+    major, revision, flags = header[3], header[4], header[5]
+    if major not in (2, 3, 4):
+        raise ID3ReadError(f"Unsupported ID3v2 version 2.{major}")
+    size = _synchsafe(header[6:10])
+    body = f.read(size)
+    if len(body) < size:
+        raise ID3ReadError("Tag runs past the end of the file")
+    tag = {
+        "major": major,
+        "revision": revision,
+        "flags": flags,
+        "frames": [],
+        "tag_size": 10 + size + (10 if flags & 0x10 else 0),
+    }
+
+    if major < 4 and flags & 0x80:
+        body = _deunsynchronise(body)
+    if flags & 0x40:
+        if major == 4:
+            body = body[_synchsafe(body[:4]):]
+        else:
+            body = body[4 + struct.unpack(">I", body[:4])[0]:]
+    if major < 4:
+        tag["flags"] &= ~0x80
+    tag["flags"] &= ~0x40
+
+    header_len = 6 if major == 2 else 10
+    pos = 0
+    while pos + header_len <= len(body) and body[pos] != 0:
+        if major == 2:
+            frame_id = body[pos:pos + 3].decode("latin-1")
+            frame_size = int.from_bytes(body[pos + 3:pos + 6], "big")
+            frame_flags = 0
+        else:
+            frame_id = body[pos:pos + 4].decode("latin-1")
+            size_bytes = body[pos + 4:pos + 8]
+            frame_size = _synchsafe(size_bytes) if major == 4 else struct.unpack(">I", size_bytes)[0]
+            frame_flags = int.from_bytes(body[pos + 8:pos + 10], "big")
+
+        if not frame_id.isalnum():
+            raise ID3ReadError(f"Invalid frame id {frame_id!r} at offset {pos}")
+        start = pos + header_len
+        if start + frame_size > len(body):
+            raise ID3ReadError(f"Frame {frame_id} runs past the end of the tag")
+        tag["frames"].append({"id": frame_id, "flags": frame_flags, "data": body[start:start + frame_size]})
+        pos = start + frame_size
+
+    return tag
+
+
+def frame_description(tag, frame):
+    """
+    Returns the description of a TXXX/COMM (TXX/COM) frame, which is the key
+    ffprobe reports it under, or None for other frames and unreadable payloads.
+    """
+    major = tag["major"]
+    if frame["id"] not in DESCRIBED_FRAMES[major]:
+        return None
+    payload = _frame_payload(frame["data"], major, frame["flags"], tag["flags"])
+    if not payload:
+        return None
+
+    encoding = payload[0]
+    # COMM/COM frames have a 3-byte language code before the description.
+    offset = 4 if frame["id"] in ("COMM", "COM") else 1
+    if encoding in (1, 2):
+        end = offset
+        while True:
+            end = payload.find(b"\x00\x00", end)
+            if end < 0:
+                end = len(payload)
+                break
+            if (end - offset) % 2 == 0:
+                break
+            end += 1
+    else:
+        end = payload.find(b"\x00", offset)
+        if end < 0:
+            end = len(payload)
+    return decode_text_frame(bytes([encoding]) + payload[offset:end]) or ""
+
+
+def render_tag(tag, total_size=None):
+    """
+    Serialises a tag from read_raw_tag. If total_size is given and the frames
+    fit, the tag is padded with zeros to exactly that size (header included),
+    so the audio that follows does not move.
+    """
+    major = tag["major"]
+    frames = bytearray()
+    for frame in tag["frames"]:
+        frame_id = frame["id"].encode("latin-1")
+        size = len(frame["data"])
+        if major == 2:
+            frames += frame_id + size.to_bytes(3, "big")
+        else:
+            size_bytes = _to_synchsafe(size) if major == 4 else struct.pack(">I", size)
+            frames += frame_id + size_bytes + frame["flags"].to_bytes(2, "big")
+        frames += frame["data"]
+
+    footer = bool(tag["flags"] & 0x10)
+    # A tag with a footer must not have padding (ID3v2.4 section 3.4).
+    if total_size is not None and not footer and 10 + len(frames) <= total_size:
+        frames += bytes(total_size - 10 - len(frames))
+
+    header_fields = bytes([major, tag["revision"], tag["flags"]]) + _to_synchsafe(len(frames))
+    rendered = b"ID3" + header_fields + bytes(frames)
+    if footer:
+        rendered += b"3DI" + header_fields
+    return rendered
+
+
+def current_tag_size(file_path):
+    """Returns the size of the ID3v2 tag at the start of a file (0 if there is none)."""
+    with open(file_path, "rb") as f:
+        header = f.read(10)
+    if len(header) < 10 or header[:3] != b"ID3":
+        return 0
+    return 10 + _synchsafe(header[6:10]) + (10 if header[5] & 0x10 else 0)
+
+
+def _replace_tag(file_path, tag_bytes, old_tag_size):
+    """
+    Writes tag_bytes followed by everything after the old tag to a temporary
+    file next to the original, fsyncs it and swaps it in with os.replace. An
+    interruption leaves either the old or the new file, never a mix.
+    """
+    temp_fd, temp_path = tempfile.mkstemp(
+        dir=os.path.dirname(os.path.abspath(file_path)), prefix=os.path.basename(file_path) + ".", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(temp_fd, "wb") as out, open(file_path, "rb") as f:
+            out.write(tag_bytes)
+            f.seek(old_tag_size)
+            shutil.copyfileobj(f, out, 1024 * 1024)
+            out.flush()
+            os.fsync(out.fileno())
+        shutil.copymode(file_path, temp_path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+    os.replace(temp_path, file_path)
+
+
+def _write_tag_in_place(file_path, tag_bytes):
+    """Overwrites the tag region at the start of the file and fsyncs it."""
+    with open(file_path, "r+b") as f:
+        f.write(tag_bytes)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def save_tag(tag, file_path=None, version=None, encoding=None, padding=DEFAULT_TAG_PADDING):
+    """
+    Saves an eyed3 tag like tag.save(), but only rewrites the tag region when
+    the new tag fits in the space (padding included) of the current one.
+
+    If it does not fit, the file is rewritten once with `padding` bytes of
+    padding reserved, via a temporary file that atomically replaces the
+    original, so the following edits can be written in place. In-place writes
+    are fsynced. ID3v1 versions are handed to eyed3 unchanged.
+
+    Args:
+        tag: eyed3.id3.Tag to save
+        file_path: File to write to (default: the file the tag was loaded from)
+        version: ID3 version to write (default: the tag's version)
+        encoding: Text encoding for all frames, as for tag.save()
+        padding: Bytes of padding to reserve when the file has to be rewritten
+
+    Returns:
+        "in-place" or "rewritten".
+    """
+    if file_path:
+        tag.file_info = FileInfo(str(file_path))
+    elif not tag.file_info:
+        raise ValueError("No file to save the tag to")
+    file_path = tag.file_info.name
+    version = version or tag.version
+
+    if version[0] == 1:
+        tag.save(version=version, encoding=encoding)
+        return "rewritten"
+    if version == ID3_V2_2:
+        raise NotImplementedError("Unable to write ID3 v2.2")
+    tag.version = version
+
+    if encoding:
+        for frame in tag.frame_set.getAllFrames():
+            frame.encoding = id3_frames.stringToEncoding(encoding)
+    # The extended header records the padding size; it is not worth keeping.
+    tag.header.extended = False
+    # eyed3 renders the header and frames; the padding is decided here.
+    _rewrite, rendered, _padding = tag._render(version, 0, None)
+    header, frame_data = rendered[:6], rendered[10:]
+
+    old_size = current_tag_size(file_path) if os.path.exists(file_path) else 0
+    if old_size and 10 + len(frame_data) <= old_size:
+        new_size = old_size
+        mode = "in-place"
+    else:
+        new_size = 10 + len(frame_data) + padding
+        mode = "rewritten"
+    tag_bytes = header + _to_synchsafe(new_size - 10) + frame_data + bytes(new_size - 10 - len(frame_data))
+
+    if mode == "in-place":
+        _write_tag_in_place(file_path, tag_bytes)
+    elif os.path.exists(file_path):
+        _replace_tag(file_path, tag_bytes, old_size)
+    else:
+        with open(file_path, "wb") as f:
+            f.write(tag_bytes)
+
+    tag.file_info.tag_size = new_size
+    tag.file_info.initStatTimes()
+    return mode
+
+
+def picture_frame(image_data, mime_type, picture_type=3, description=""):
+    """
+    Builds a raw ID3v2.3/2.4 APIC frame (picture type 3 is the front cover)
+    for the frame lists of read_raw_tag/render_tag. The bytes do not depend on
+    the file, so one frame can be added to any number of tags.
+    """
+    try:
+        encoded_description = b"\x00" + description.encode("latin-1") + b"\x00"
+    except UnicodeEncodeError:
+        # UTF-16 with BOM is the one Unicode encoding both v2.3 and v2.4 allow.
+        encoded_description = b"\x01" + description.encode("utf-16") + b"\x00\x00"
+    payload = (encoded_description[:1] + mime_type.encode("latin-1") + b"\x00" + bytes([picture_type])
+               + encoded_description[1:] + image_data)
+    return {"id": "APIC", "flags": 0, "data": payload}
+
+
+def write_raw_tag(file_path, tag, padding=DEFAULT_TAG_PADDING, max_padding=None):
+    """
+    Writes a tag from read_raw_tag (possibly with frames removed or added)
+    back to a file. If it fits in the old tag's space it is padded to that
+    size and written in place; otherwise the file is rewritten through a
+    temporary file with `padding` bytes of padding reserved.
+
+    Args:
+        file_path: File the tag was read from
+        tag: Tag as returned by read_raw_tag
+        padding: Bytes of padding to reserve when the file has to be rewritten
+        max_padding: If given, also rewrite the file when writing in place
+            would leave more padding than this, so the space is freed
+
+    Returns:
+        "in-place" or "rewritten".
+    """
+    tag_bytes = render_tag(tag, tag["tag_size"])
+    fits = tag["tag_size"] and len(tag_bytes) == tag["tag_size"]
+    if fits and max_padding is not None and tag["tag_size"] - len(render_tag(tag)) > max_padding:
+        fits = False
+    if fits:
+        _write_tag_in_place(file_path, tag_bytes)
+        return "in-place"
+    tag_bytes = render_tag(tag, len(render_tag(tag)) + padding)
+    _replace_tag(file_path, tag_bytes, tag["tag_size"])
+    return "rewritten"
+
+
+def remove_frames(file_path, should_remove):
+    """
+    Removes the ID3v2 frames for which should_remove(tag, frame) is true by
+    rewriting only the tag. The new tag is padded to the old size and written
+    in place, leaving the audio untouched. Only when that is impossible (tags
+    with a footer cannot be padded) is the file rewritten through a temporary
+    file that replaces the original.
+
+    Args:
+        file_path: Path to the MP3 file
+        should_remove: Callable taking (tag, frame) as returned by read_raw_tag
+
+    Returns:
+        The list of removed frames (empty if nothing matched, in which case
+        the file is not touched).
+
+    Raises:
+        ID3ReadError: If the tag is malformed.
+    """
+    with open(file_path, "rb") as f:
+        tag = read_raw_tag(f)
+        if tag is None:
+            return []
+        removed, kept = [], []
+        for frame in tag["frames"]:
+            (removed if should_remove(tag, frame) else kept).append(frame)
+        if not removed:
+            return []
+        tag["frames"] = kept
+
+    write_raw_tag(file_path, tag)
+    return removed
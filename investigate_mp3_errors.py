@@ -3,9 +3,16 @@ import subprocess
 import re
 import sys
 import argparse
+import io
+import json
+from contextlib import redirect_stdout
 from datetime import datetime
+from functools import partial
+from multiprocessing import Pool, cpu_count
+from mpeg_validator import validate_mp3, format_problems
 
 LOG_FILENAME = "mp3_error_report.log"
+CHECKPOINT_FILENAME = "mp3_error_report.checkpoint.jsonl"
 
 def run_command(command_parts):
     """Runs a command and returns its stdout, stderr, and return code."""
@@ -51,6 +58,24 @@ def check_mp3val_for_report(filepath):
     print(f"  mp3val OK: {filepath}")
     return None
 
+def check_frames_for_report(filepath):
+    """
+    Checks the MPEG frame structure in-process (see mpeg_validator.py).
+    Returns a string with error details if problems are found, else None.
+    """
+    print(f"  Checking {filepath} with the frame validator...")
+    try:
+        result = validate_mp3(filepath)
+    except OSError as e:
+        return f"--- Frame validator Errors for {os.path.basename(filepath)} ---\nCould not read file: {e}"
+
+    if result["errors"] or result["warnings"]:
+        return (f"--- Frame validator Errors for {os.path.basename(filepath)} ---\n"
+                f"{result['frames']} MPEG frames\n{format_problems(result)}")
+
+    print(f"  Frame validator OK: {filepath} ({result['frames']} frames)")
+    return None
+
 def check_ffmpeg_decode_for_report(filepath):
     """
     Checks for ffmpeg decoding errors.
@@ -73,47 +98,175 @@ def check_ffmpeg_decode_for_report(filepath):
     print(f"  ffmpeg decode OK: {filepath}")
     return None
 
-def investigate_mp3_files(root_dir, log_file_path):
+def file_signature(filepath):
+    """Returns the size/mtime pair used to decide whether a checkpointed result is still valid."""
+    st = os.stat(filepath)
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+def load_checkpoint(checkpoint_path):
+    """Loads previous per-file results (last entry per path wins)."""
+    results = {}
+    if not os.path.exists(checkpoint_path):
+        return results
+    with open(checkpoint_path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                result = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # Partially written line from an interrupted run
+            results[result["path"]] = result
+    return results
+
+def checked_externally(result):
+    """True if a checkpointed result came from a run with mp3val and the ffmpeg decode on every file."""
+    if "external_checks" in result:
+        return result["external_checks"]
+    # Checkpoints written before the frame validator existed always ran both.
+    return "validator_error" not in result
+
+def investigate_file(filepath, external_checks=False):
     """
-    Investigates MP3 files for errors using mp3val and ffmpeg decode check,
-    logging any errors found.
+    Worker: checks one file. By default the in-process frame validator runs
+    first and the (slow) ffmpeg decode only runs on files it flags; with
+    external_checks, mp3val and the ffmpeg decode run on every file.
+
+    Console output is captured and returned with the result so the parent can
+    print it as one block instead of interleaving lines from several workers.
+    """
+    output = io.StringIO()
+    with redirect_stdout(output):
+        print(f"\n>>> Investigating file: {filepath}")
+        try:
+            signature = file_signature(filepath)
+        except OSError as e:
+            signature = {"size": None, "mtime_ns": None}
+            print(f"  Could not stat {filepath}: {e}")
+
+        mp3val_error = validator_error = None
+        if external_checks:
+            mp3val_error = check_mp3val_for_report(filepath)
+            if mp3val_error:
+                print(f"  ERROR (mp3val): {filepath}")
+        else:
+            validator_error = check_frames_for_report(filepath)
+            if validator_error:
+                print(f"  ERROR (frame validator): {filepath}")
+
+        ffmpeg_error = None
+        if external_checks or validator_error:
+            ffmpeg_error = check_ffmpeg_decode_for_report(filepath)
+            if ffmpeg_error:
+                print(f"  ERROR (ffmpeg decode): {filepath}")
+
+    return {
+        "path": filepath,
+        **signature,
+        "validator_error": validator_error,
+        "mp3val_error": mp3val_error,
+        "ffmpeg_error": ffmpeg_error,
+        "external_checks": external_checks,
+        "output": output.getvalue(),
+    }
+
+def write_file_report(log_f, result):
+    """Writes one file's errors to the report. Returns True if it had any."""
+    has_errors_for_this_file = False
+    # Checkpoints written before the frame validator existed have no validator_error.
+    for key in ("validator_error", "mp3val_error", "ffmpeg_error"):
+        if result.get(key):
+            # Only one "File:" line per file
+            if not has_errors_for_this_file:
+                log_f.write(f"File: {result['path']}\n")
+            log_f.write(f"{result[key]}\n\n")
+            has_errors_for_this_file = True
+    return has_errors_for_this_file
+
+def investigate_mp3_files(root_dir, log_file_path, jobs=None, checkpoint_path=None, recheck_errors=False,
+                          external_checks=False):
+    """
+    Investigates MP3 files for errors using the frame validator (or mp3val)
+    and ffmpeg decode check, logging any errors found.
+
+    Files are checked in a process pool. Every finished result is appended to
+    a checkpoint file, so an interrupted run picks up where it stopped, and
+    files whose size and mtime match a checkpointed result are not checked
+    again (errored ones are re-checked if recheck_errors is set). With
+    external_checks, only results from a previous external_checks run are
+    reused.
+
+    Args:
+        root_dir: Root directory of the music library
+        log_file_path: Path of the error report
+        jobs: Number of worker processes (defaults to the number of CPUs)
+        checkpoint_path: JSON lines file of per-file results, or None to disable
+        recheck_errors: Re-investigate files whose previous result had errors
+        external_checks: Run mp3val and the ffmpeg decode on every file instead
+            of the frame validator with ffmpeg only for flagged files
     """
     print(f"Starting investigation for directory: {root_dir}")
     print(f"Errors will be logged to: {log_file_path}")
-    
+
+    previous = load_checkpoint(checkpoint_path) if checkpoint_path else {}
+    if checkpoint_path:
+        print(f"Checkpoint: {checkpoint_path} ({len(previous)} previous results)")
+
+    reused_results = []
+    files_to_check = []
+    for subdir, _dirs, files in os.walk(root_dir):
+        for filename in files:
+            if filename.lower().endswith(".mp3"):
+                filepath = os.path.join(subdir, filename)
+                result = previous.get(filepath)
+                if result is not None:
+                    try:
+                        signature = file_signature(filepath)
+                    except OSError:
+                        signature = None
+                    has_errors = result.get("validator_error") or result["mp3val_error"] or result["ffmpeg_error"]
+                    # A result from the default mode does not count for an
+                    # --external-checks run; an external one counts for both.
+                    same_mode = checked_externally(result) or not external_checks
+                    if signature == {"size": result["size"], "mtime_ns": result["mtime_ns"]} and same_mode and \
+                       not (has_errors and recheck_errors):
+                        reused_results.append(result)
+                        continue
+                files_to_check.append(filepath)
+
+    total_files = len(reused_results) + len(files_to_check)
+    print(f"Found {total_files} MP3 file(s): {len(reused_results)} unchanged since a previous check, "
+          f"{len(files_to_check)} to investigate with {jobs or cpu_count()} worker(s).")
+
     files_processed = 0
     files_with_errors = 0
-    
+
     with open(log_file_path, "w", encoding="utf-8") as log_f:
         log_f.write(f"MP3 Error Investigation Report - Started at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
         log_f.write(f"Scanning directory: {root_dir}\n\n")
 
-        for subdir, _dirs, files in os.walk(root_dir):
-            for filename in files:
-                if filename.lower().endswith(".mp3"):
-                    filepath = os.path.join(subdir, filename)
-                    print(f"\n>>> Investigating file: {filepath}")
+        for result in reused_results:
+            files_processed += 1
+            if write_file_report(log_f, result):
+                files_with_errors += 1
+        log_f.flush()
+
+        checkpoint_f = open(checkpoint_path, "a", encoding="utf-8") if checkpoint_path else None
+        try:
+            with Pool(processes=jobs or cpu_count()) as pool:
+                # Long-running tasks: hand them out one at a time.
+                for result in pool.imap(partial(investigate_file, external_checks=external_checks),
+                                        files_to_check, chunksize=1):
                     files_processed += 1
-                    has_errors_for_this_file = False
-                    
-                    mp3val_error = check_mp3val_for_report(filepath)
-                    if mp3val_error:
-                        print(f"  ERROR (mp3val): {filepath}")
-                        log_f.write(f"File: {filepath}\n")
-                        log_f.write(f"{mp3val_error}\n\n")
-                        has_errors_for_this_file = True
-                        
-                    ffmpeg_error = check_ffmpeg_decode_for_report(filepath)
-                    if ffmpeg_error:
-                        # Avoid duplicate "File:" line if mp3val also erred
-                        if not has_errors_for_this_file:
-                             log_f.write(f"File: {filepath}\n")
-                        print(f"  ERROR (ffmpeg decode): {filepath}")
-                        log_f.write(f"{ffmpeg_error}\n\n")
-                        has_errors_for_this_file = True
-                    
-                    if has_errors_for_this_file:
+                    print(result["output"], end="")
+                    print(f"  [{files_processed}/{total_files}]")
+                    if write_file_report(log_f, result):
                         files_with_errors += 1
+                    log_f.flush()
+                    if checkpoint_f:
+                        checkpoint_f.write(json.dumps({k: v for k, v in result.items() if k != "output"}) + "\n")
+                        checkpoint_f.flush()
+        finally:
+            if checkpoint_f:
+                checkpoint_f.close()
                         
     summary = (
         f"\n--- Investigation Summary ---\n"
@@ -130,6 +283,10 @@ def investigate_mp3_files(root_dir, log_file_path):
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Investigate MP3 files for corruption and decode errors.")
     parser.add_argument("music_directory", help="The root directory of the music library to investigate.")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="Number of files to check in parallel. Defaults to the number of CPUs.")
+    parser.add_argument("--fresh", action="store_true", help="Ignore previous results in the checkpoint file and check every file.")
+    parser.add_argument("--recheck-errors", action="store_true", help="Re-investigate unchanged files whose previous result had errors.")
+    parser.add_argument("--external-checks", action="store_true", help="Check every file with mp3val and a full ffmpeg decode instead of the in-process frame validator.")
     args = parser.parse_args()
 
     music_root_to_investigate = os.path.abspath(args.music_directory)
@@ -142,9 +299,13 @@ if __name__ == "__main__":
     # For simplicity, let's assume script is run from workspace root or its location is known
     script_dir = os.path.dirname(os.path.abspath(__file__))
     log_file_path = os.path.join(script_dir, LOG_FILENAME)
+    checkpoint_path = os.path.join(script_dir, CHECKPOINT_FILENAME)
+    if args.fresh and os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
 
 
     print(f"Starting MP3 error investigation for: {music_root_to_investigate}")
     print(f"A detailed report will be saved to '{log_file_path}'.")
     
-    investigate_mp3_files(music_root_to_investigate, log_file_path) 
\ No newline at end of file
+    investigate_mp3_files(music_root_to_investigate, log_file_path, args.jobs, checkpoint_path, args.recheck_errors,
+                          args.external_checks) 
\ No newline at end of file
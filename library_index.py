@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import json
+import time
+import sqlite3
+import hashlib
+import argparse
+import eyed3
+from functools import partial
+from multiprocessing import Pool
+from id3_reader import read_tag, parse_count_total, ID3ReadError
+
+DEFAULT_INDEX_PATH = os.path.expanduser("~/.mp3_library_index.sqlite3")
+
+# Bump this whenever the parsed fields change so stale rows get re-parsed.
+SCHEMA_VERSION = 1
+
+TRACK_FIELDS = [
+    "has_tag", "title", "artist", "album", "album_artist",
+    "track_num", "track_total", "disc_num", "disc_total",
+    "image_hashes", "time_secs", "bit_rate", "load_error",
+]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tracks (
+    path         TEXT PRIMARY KEY,
+    size         INTEGER NOT NULL,
+    mtime_ns     INTEGER NOT NULL,
+    inode        INTEGER NOT NULL,
+    has_tag      INTEGER NOT NULL,
+    title        TEXT,
+    artist       TEXT,
+    album        TEXT,
+    album_artist TEXT,
+    track_num    INTEGER,
+    track_total  INTEGER,
+    disc_num     INTEGER,
+    disc_total   INTEGER,
+    image_hashes TEXT,
+    time_secs    REAL,
+    bit_rate     INTEGER,
+    load_error   TEXT,
+    indexed_at   REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+def iter_mp3_files(root_dir):
+    """Yields the path of every .mp3 file below root_dir."""
+    for root, _, files in os.walk(root_dir):
+        for filename in files:
+            if filename.lower().endswith(".mp3"):
+                yield os.path.join(root, filename)
+
+
+def stat_signature(file_path):
+    """Returns the (size, mtime_ns, inode) tuple used to detect changed files."""
+    st = os.stat(file_path)
+    return st.st_size, st.st_mtime_ns, st.st_ino
+
+
+def read_track_metadata(file_path):
+    """
+    Fully parses an MP3 file with eyed3 and returns the fields stored in the index.
+
+    Args:
+        file_path: Path to the MP3 file
+
+    Returns:
+        A dictionary with one entry per name in TRACK_FIELDS.
+    """
+    record = {field: None for field in TRACK_FIELDS}
+    record["has_tag"] = False
+    record["image_hashes"] = []
+
+    try:
+        audiofile = eyed3.load(file_path)
+    except Exception as e:
+        record["load_error"] = str(e)
+        return record
+
+    if audiofile is None:
+        record["load_error"] = "Could not load file"
+        return record
+
+    if audiofile.info:
+        record["time_secs"] = audiofile.info.time_secs
+        record["bit_rate"] = audiofile.info.bit_rate[1] if audiofile.info.bit_rate else None
+
+    tag = audiofile.tag
+    if tag is None:
+        return record
+
+    record["has_tag"] = True
+    record["title"] = tag.title
+    record["artist"] = tag.artist
+    record["album"] = tag.album
+    record["album_artist"] = tag.album_artist
+    if tag.track_num:
+        record["track_num"], record["track_total"] = tag.track_num
+    if tag.disc_num:
+        record["disc_num"], record["disc_total"] = tag.disc_num
+    record["image_hashes"] = [hashlib.md5(img.image_data).hexdigest() for img in tag.images]
+    return record
+
+
+def read_light_record(file_path, fields):
+    """
+    Reads just the requested TRACK_FIELDS text fields with the header-only
+    id3_reader instead of a full eyed3.load. Audio info and image hashes are
+    not available on this path.
+    """
+    record = {"path": file_path, "has_tag": False, "load_error": None}
+    record.update({field: None for field in fields})
+
+    reader_fields = set()
+    for field in fields:
+        if field in ("track_num", "track_total"):
+            reader_fields.add("track")
+        elif field in ("disc_num", "disc_total"):
+            reader_fields.add("disc")
+        else:
+            reader_fields.add(field)
+
+    try:
+        tag = read_tag(file_path, sorted(reader_fields))
+    except (ID3ReadError, OSError) as e:
+        record["load_error"] = str(e)
+        return record
+    if tag is None:
+        return record
+
+    record["has_tag"] = True
+    values = dict(tag)
+    values["track_num"], values["track_total"] = parse_count_total(tag.get("track"))
+    values["disc_num"], values["disc_total"] = parse_count_total(tag.get("disc"))
+    record.update({field: values[field] for field in fields})
+    return record
+
+
+class LibraryIndex:
+    """
+    On-disk SQLite cache of parsed MP3 metadata, keyed by path and validated
+    against the file's size, mtime and inode. Files are only re-parsed when
+    their stat signature no longer matches the stored row.
+    """
+
+    def __init__(self, db_path=DEFAULT_INDEX_PATH):
+        self.db_path = os.path.expanduser(db_path)
+        self.conn = sqlite3.connect(self.db_path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+        self.parsed_count = 0
+        self.cached_count = 0
+        self._check_schema_version()
+
+    def _check_schema_version(self):
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'schema_version'").fetchone()
+        if row is None or int(row["value"]) != SCHEMA_VERSION:
+            self.conn.execute("DELETE FROM tracks")
+            self.conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('schema_version', ?)",
+                (str(SCHEMA_VERSION),),
+            )
+            self.conn.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        self.conn.commit()
+        self.conn.close()
+
+    def _row_to_record(self, row):
+        record = dict(row)
+        record["has_tag"] = bool(record["has_tag"])
+        record["image_hashes"] = json.loads(record["image_hashes"] or "[]")
+        return record
+
+    def lookup(self, file_path):
+        """
+        Returns the metadata record for file_path, re-parsing the file only if
+        it is new or its stat signature changed since it was indexed.
+        """
+        file_path = os.path.abspath(file_path)
+        size, mtime_ns, inode = stat_signature(file_path)
+
+        row = self.conn.execute("SELECT * FROM tracks WHERE path = ?", (file_path,)).fetchone()
+        if row is not None and (row["size"], row["mtime_ns"], row["inode"]) == (size, mtime_ns, inode):
+            self.cached_count += 1
+            return self._row_to_record(row)
+
+        record = read_track_metadata(file_path)
+        self.parsed_count += 1
+        self.store(file_path, (size, mtime_ns, inode), record)
+        record.update(path=file_path, size=size, mtime_ns=mtime_ns, inode=inode)
+        return record
+
+    def store(self, file_path, signature, record):
+        """Writes a parsed record for file_path with the given stat signature."""
+        size, mtime_ns, inode = signature
+        values = dict(record)
+        values["has_tag"] = int(bool(values["has_tag"]))
+        values["image_hashes"] = json.dumps(values["image_hashes"] or [])
+        self.conn.execute(
+            "INSERT OR REPLACE INTO tracks (path, size, mtime_ns, inode, indexed_at, "
+            + ", ".join(TRACK_FIELDS) + ") VALUES (?, ?, ?, ?, ?, "
+            + ", ".join("?" for _ in TRACK_FIELDS) + ")",
+            [os.path.abspath(file_path), size, mtime_ns, inode, time.time()]
+            + [values[field] for field in TRACK_FIELDS],
+        )
+
+    def forget(self, file_path):
+        """Drops the row for a file that was moved or deleted."""
+        self.conn.execute("DELETE FROM tracks WHERE path = ?", (os.path.abspath(file_path),))
+
+    def scan(self, root_dir, paths=None):
+        """
+        Yields an up-to-date record for every MP3 below root_dir and prunes rows
+        for files under root_dir that no longer exist. If paths is given, only
+        those files are looked up and nothing is pruned.
+        """
+        root_dir = os.path.abspath(root_dir)
+        seen = set()
+        parsed_before = self.parsed_count
+        for file_path in (iter_mp3_files(root_dir) if paths is None else paths):
+            try:
+                record = self.lookup(file_path)
+            except OSError as e:
+                print(f"Warning: Could not stat {file_path}: {e}", file=sys.stderr)
+                self.forget(file_path)
+                continue
+            seen.add(record["path"])
+            yield record
+            if self.parsed_count - parsed_before >= 500:
+                self.conn.commit()
+                parsed_before = self.parsed_count
+
+        if paths is not None:
+            self.conn.commit()
+            return
+
+        prefix = os.path.join(root_dir, "")
+        stale = [
+            row["path"]
+            for row in self.conn.execute(
+                "SELECT path FROM tracks WHERE substr(path, 1, ?) = ?", (len(prefix), prefix)
+            )
+            if row["path"] not in seen
+        ]
+        self.conn.executemany("DELETE FROM tracks WHERE path = ?", [(path,) for path in stale])
+        self.conn.commit()
+
+
+def iter_track_records(root_dir, index_path=None, paths=None, fields=None, jobs=1):
+    """
+    Yields a metadata record for every MP3 below root_dir, or for just the
+    given paths. With index_path the records come from the persistent index,
+    otherwise every file is parsed: with the header-only reader if the caller
+    names the text fields it needs, or with a full eyed3.load if not.
+    With jobs > 1 the header-only reads are spread over a process pool; records
+    are still yielded in walk order.
+    """
+    if index_path:
+        with LibraryIndex(index_path) as index:
+            yield from index.scan(root_dir, paths)
+        return
+    file_paths = iter_mp3_files(root_dir) if paths is None else paths
+    if fields is not None and jobs > 1:
+        with Pool(processes=jobs) as pool:
+            yield from pool.imap(partial(read_light_record, fields=fields), file_paths, chunksize=32)
+        return
+    for file_path in file_paths:
+        if fields is not None:
+            yield read_light_record(file_path, fields)
+            continue
+        record = read_track_metadata(file_path)
+        record["path"] = file_path
+        yield record
+
+
+def is_field_missing(record, field):
+    """
+    True if a track record lacks a text field, by the same rule the
+    find_mp3s_without_*.py scripts apply to eyeD3's output: files that failed
+    to load, files without a tag, and empty or "None" values all count.
+    """
+    if record["load_error"] or not record["has_tag"]:
+        return True
+    value = (record[field] or "").strip()
+    return not value or value == "None"
+
+
+def add_index_argument(parser):
+    """Adds the shared --index option to a script's argument parser."""
+    parser.add_argument(
+        "--index",
+        nargs="?",
+        const=DEFAULT_INDEX_PATH,
+        default=None,
+        metavar="DB_PATH",
+        help=f"Answer from the persistent library index (default location: {DEFAULT_INDEX_PATH}). "
+             "Only files whose size/mtime/inode changed are re-parsed.",
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Build or refresh the persistent MP3 library index used by the scanner scripts."
+    )
+    parser.add_argument("music_directory", help="The root directory of the music library to index.")
+    parser.add_argument("--db", default=DEFAULT_INDEX_PATH, help=f"Index database path (default: {DEFAULT_INDEX_PATH})")
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.music_directory):
+        print(f"Error: Directory not found: {args.music_directory}")
+        sys.exit(1)
+
+    start = time.time()
+    total = 0
+    with LibraryIndex(args.db) as index:
+        for _record in index.scan(args.music_directory):
+            total += 1
+        parsed, cached = index.parsed_count, index.cached_count
+
+    print(f"\n--- Index Summary ---")
+    print(f"Index database: {os.path.expanduser(args.db)}")
+    print(f"Total MP3 files indexed: {total}")
+    print(f"Files re-parsed: {parsed}")
+    print(f"Files answered from cache: {cached}")
+    print(f"Elapsed: {time.time() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
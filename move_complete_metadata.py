@@ -2,17 +2,20 @@
 
 import os
 import shutil
-import eyed3
+from library_index import LibraryIndex, iter_track_records, add_index_argument
+from scan_journal import add_walk_arguments, selected_mp3_paths
 import argparse
 from pathlib import Path
 
-def move_complete_metadata_files(source_dir: str, dest_dir: str):
+def move_complete_metadata_files(source_dir: str, dest_dir: str, index_path: str = None, mp3_paths: list = None):
     """
     Moves MP3 files with complete metadata (title, artist, and album) to a destination directory.
     
     Args:
         source_dir: Source directory containing MP3 files
         dest_dir: Destination directory for files with complete metadata
+        index_path: Optional library index database to read tags from
+        mp3_paths: Optional explicit list of MP3 files to consider instead of the whole tree
     """
     source_path = Path(source_dir)
     dest_path = Path(dest_dir)
@@ -30,31 +33,42 @@ def move_complete_metadata_files(source_dir: str, dest_dir: str):
     total_files = 0
     moved_files = 0
     
-    for mp3_file in source_path.rglob("*.mp3"):
+    moved_paths = []
+    for record in iter_track_records(source_path, index_path, mp3_paths, fields=["title", "artist", "album"]):
         total_files += 1
-        try:
-            audiofile = eyed3.load(mp3_file)
-            if audiofile is None or audiofile.tag is None:
-                continue
-                
-            # Check if all required metadata is present and not empty
-            if (audiofile.tag.title and 
-                audiofile.tag.artist and 
-                audiofile.tag.album):
-                
-                # Create destination path
-                dest_file = dest_path / mp3_file.name
-                
+        mp3_file = Path(record["path"])
+        if record["load_error"]:
+            print(f"Error processing {mp3_file.name}: {record['load_error']}")
+            continue
+        if not record["has_tag"]:
+            continue
+            
+        # Check if all required metadata is present and not empty
+        if (record["title"] and 
+            record["artist"] and 
+            record["album"]):
+            
+            # Create destination path
+            dest_file = dest_path / mp3_file.name
+            
+            try:
                 # Move the file
                 shutil.move(str(mp3_file), str(dest_file))
-                print(f"Moved: {mp3_file.name}")
-                print(f"  Title: {audiofile.tag.title}")
-                print(f"  Artist: {audiofile.tag.artist}")
-                print(f"  Album: {audiofile.tag.album}\n")
-                moved_files += 1
-                
-        except Exception as e:
-            print(f"Error processing {mp3_file.name}: {str(e)}")
+            except Exception as e:
+                print(f"Error processing {mp3_file.name}: {str(e)}")
+                continue
+            moved_paths.append(mp3_file)
+            print(f"Moved: {mp3_file.name}")
+            print(f"  Title: {record['title']}")
+            print(f"  Artist: {record['artist']}")
+            print(f"  Album: {record['album']}\n")
+            moved_files += 1
+
+    if index_path and moved_paths:
+        # Moved files are picked up again under their new path on the next scan.
+        with LibraryIndex(index_path) as index:
+            for mp3_file in moved_paths:
+                index.forget(mp3_file)
     
     print(f"\n--- Summary ---")
     print(f"Total MP3 files scanned: {total_files}")
@@ -64,6 +78,9 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='Move MP3 files with complete metadata to a destination folder.')
     parser.add_argument('source', help='Source directory containing MP3 files')
     parser.add_argument('destination', help='Destination directory for files with complete metadata')
+    add_index_argument(parser)
+    add_walk_arguments(parser)
     args = parser.parse_args()
     
-    move_complete_metadata_files(args.source, args.destination) 
\ No newline at end of file
+    with selected_mp3_paths(args.source, args, "move_complete_metadata") as mp3_paths:
+        move_complete_metadata_files(args.source, args.destination, args.index, mp3_paths) 
\ No newline at end of file
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import mmap
+import argparse
+from id3_reader import parse_frame_header, read_vbr_header
+from library_index import iter_mp3_files
+
+# Fewer frames than this and the file is almost certainly not real audio
+# (mp3val's "Too few MPEG frames" warning).
+MIN_MPEG_FRAMES = 10
+
+# Only the first few problems of each kind are spelled out in the report.
+MAX_REPORTED_PROBLEMS = 5
+
+
+def _crc16_table():
+    table = []
+    for byte in range(256):
+        crc = byte << 8
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x8005) if crc & 0x8000 else (crc << 1)
+        table.append(crc & 0xFFFF)
+    return table
+
+_CRC16_TABLE = _crc16_table()
+
+
+def crc16(data, crc=0xFFFF):
+    """CRC-16 (polynomial 0x8005, initial value 0xFFFF) as used by MPEG audio frames."""
+    for byte in data:
+        crc = ((crc << 8) & 0xFFFF) ^ _CRC16_TABLE[((crc >> 8) ^ byte) & 0xFF]
+    return crc
+
+
+def _side_info_length(header):
+    mono = header["channel_mode"] == "Mono"
+    if header["version"] == 1:
+        return 17 if mono else 32
+    return 9 if mono else 17
+
+
+def _tag_bounds(mm):
+    """Returns (audio_start, audio_end) after skipping ID3v2, APEv2 and ID3v1 tags."""
+    size = len(mm)
+    start = 0
+    if size >= 10 and mm[:3] == b"ID3":
+        tag_size = (mm[6] << 21) | (mm[7] << 14) | (mm[8] << 7) | mm[9]
+        start = 10 + tag_size + (10 if mm[5] & 0x10 else 0)
+
+    end = size
+    if end - start >= 128 and mm[end - 128:end - 125] == b"TAG":
+        end -= 128
+    if end - start >= 32 and mm[end - 32:end - 24] == b"APETAGEX":
+        ape_size = int.from_bytes(mm[end - 20:end - 16], "little")
+        ape_flags = int.from_bytes(mm[end - 12:end - 8], "little")
+        end -= ape_size + (32 if ape_flags & 0x80000000 else 0)
+    return min(start, size), max(end, 0)
+
+
+def _find_frame(mm, start, end, header_cache, allow_last=True):
+    """
+    Finds the next offset >= start holding a valid frame header that is
+    followed by another valid header (or, with allow_last, ends exactly at the
+    end of the audio). Returns (offset, header) or (None, None).
+    """
+    pos = mm.find(b"\xff", start, end)
+    while pos != -1 and pos + 4 <= end:
+        header = _header_at(mm, pos, header_cache)
+        if header is not None:
+            next_pos = pos + header["frame_length"]
+            if (allow_last and next_pos == end) or (next_pos + 4 <= end and _header_at(mm, next_pos, header_cache) is not None):
+                return pos, header
+        pos = mm.find(b"\xff", pos + 1, end)
+    return None, None
+
+
+def _header_at(mm, pos, header_cache):
+    key = mm[pos:pos + 4]
+    header = header_cache.get(key)
+    if header is None and key not in header_cache:
+        header = parse_frame_header(key)
+        header_cache[key] = header
+    return header
+
+
+def validate_mp3(file_path):
+    """
+    Walks every MPEG audio frame of an MP3 file over an mmap, in one pass.
+
+    Checks sync words and frame lengths (lost sync / garbage between frames,
+    truncated last frame), the CRC-16 of protected Layer III frames, changes of
+    sample rate/version/layer mid-stream, and whether the frame and byte counts
+    of a Xing/Info/VBRI header match the stream.
+
+    Args:
+        file_path: Path to the MP3 file
+
+    Returns:
+        A dict with "frames", "errors" and "warnings" (lists of strings),
+        "vbr_header" and "first_frame". A file with errors is broken; a file
+        with only warnings is suspicious and worth a full decode.
+    """
+    result = {"frames": 0, "errors": [], "warnings": [], "vbr_header": None, "first_frame": None}
+    with open(file_path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            result["errors"].append("File is empty")
+            return result
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            _walk_frames(mm, result)
+    return result
+
+
+def _walk_frames(mm, result):
+    errors, warnings = result["errors"], result["warnings"]
+    header_cache = {}
+    audio_start, audio_end = _tag_bounds(mm)
+
+    # Like ffmpeg, the stream only starts at two consecutive frames.
+    pos, first = _find_frame(mm, audio_start, audio_end, header_cache, allow_last=False)
+    if first is None:
+        # A lone frame still counts for the "too few frames" check below.
+        lone = mm.find(b"\xff", audio_start, audio_end)
+        while lone != -1 and _header_at(mm, lone, header_cache) is None:
+            lone = mm.find(b"\xff", lone + 1, audio_end)
+        result["frames"] = 1 if lone != -1 else 0
+        errors.append("Failed to find two consecutive MPEG audio frames")
+        warnings.append(f"Too few MPEG frames ({result['frames']}); it's unlikely that this is an MPEG audio file")
+        return
+
+    result["first_frame"] = {"offset": pos, **first}
+    if pos > audio_start:
+        warnings.append(f"{pos - audio_start} bytes of garbage before the first MPEG frame")
+
+    vbr_header = read_vbr_header(mm[pos:pos + max(first["frame_length"], 64)], first)
+    result["vbr_header"] = vbr_header
+
+    stream_key = (first["version"], first["layer"], first["sample_rate"])
+    frames = 0
+    lost_sync = crc_errors = format_changes = 0
+    garbage_bytes = 0
+
+    while pos + 4 <= audio_end:
+        header = _header_at(mm, pos, header_cache)
+        if header is None:
+            lost_sync += 1
+            next_pos, header = _find_frame(mm, pos + 1, audio_end, header_cache)
+            skipped = (next_pos if next_pos is not None else audio_end) - pos
+            garbage_bytes += skipped
+            if lost_sync <= MAX_REPORTED_PROBLEMS:
+                errors.append(f"Lost sync at offset {pos}; skipped {skipped} bytes")
+            if next_pos is None:
+                break
+            pos = next_pos
+
+        frame_end = pos + header["frame_length"]
+        if frame_end > audio_end:
+            warnings.append(f"Truncated last MPEG frame at offset {pos} "
+                            f"({audio_end - pos} of {header['frame_length']} bytes)")
+            frames += 1
+            break
+
+        if (header["version"], header["layer"], header["sample_rate"]) != stream_key:
+            format_changes += 1
+            if format_changes <= MAX_REPORTED_PROBLEMS:
+                warnings.append(f"Stream format changes at offset {pos}: MPEG{header['version']} "
+                                f"Layer {header['layer']} @ {header['sample_rate']} Hz")
+
+        if header["protected"] and header["layer"] == 3:
+            # Layer III CRC covers the last two header bytes and the side info.
+            stored_crc = (mm[pos + 4] << 8) | mm[pos + 5]
+            computed_crc = crc16(mm[pos + 6:pos + 6 + _side_info_length(header)],
+                                 crc16(mm[pos + 2:pos + 4]))
+            if stored_crc != computed_crc:
+                crc_errors += 1
+                if crc_errors <= MAX_REPORTED_PROBLEMS:
+                    errors.append(f"CRC mismatch in frame at offset {pos}")
+
+        frames += 1
+        pos = frame_end
+
+    if pos < audio_end and pos + 4 > audio_end:
+        warnings.append(f"{audio_end - pos} stray bytes after the last MPEG frame")
+
+    result["frames"] = frames
+    if lost_sync > MAX_REPORTED_PROBLEMS:
+        errors.append(f"... lost sync {lost_sync} times in total ({garbage_bytes} bytes skipped)")
+    if crc_errors > MAX_REPORTED_PROBLEMS:
+        errors.append(f"... {crc_errors} CRC mismatches in total")
+    if frames < MIN_MPEG_FRAMES:
+        warnings.append(f"Too few MPEG frames ({frames}); it's unlikely that this is an MPEG audio file")
+
+    if vbr_header:
+        # The Xing/Info/VBRI frame itself carries no audio and may or may not be counted.
+        if vbr_header["frames"] is not None and vbr_header["frames"] not in (frames, frames - 1):
+            warnings.append(f"{vbr_header['kind']} header says {vbr_header['frames']} frames, "
+                            f"stream has {frames - 1}")
+        audio_bytes = pos - result["first_frame"]["offset"]
+        if vbr_header["bytes"] is not None and vbr_header["bytes"] not in (
+                audio_bytes, audio_bytes - first["frame_length"]):
+            warnings.append(f"{vbr_header['kind']} header says {vbr_header['bytes']} bytes, "
+                            f"stream has {audio_bytes}")
+
+
+def format_problems(result):
+    """Formats validate_mp3 problems as ERROR/WARNING lines (mp3val style)."""
+    lines = [f"ERROR: {message}" for message in result["errors"]]
+    lines += [f"WARNING: {message}" for message in result["warnings"]]
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Validate the MPEG frame structure of MP3 files without decoding them."
+    )
+    parser.add_argument("path", help="An MP3 file or a directory to scan.")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Also list files without problems.")
+    args = parser.parse_args()
+
+    if os.path.isfile(args.path):
+        files = [args.path]
+    elif os.path.isdir(args.path):
+        files = iter_mp3_files(args.path)
+    else:
+        print(f"Error: {args.path} is not a valid file or directory")
+        sys.exit(1)
+
+    total = flagged = 0
+    for file_path in files:
+        total += 1
+        try:
+            result = validate_mp3(file_path)
+        except OSError as e:
+            result = {"frames": 0, "errors": [f"Could not read file: {e}"], "warnings": []}
+        if result["errors"] or result["warnings"]:
+            flagged += 1
+            print(f"{file_path}: {result['frames']} MPEG frames")
+            print("  " + format_problems(result).replace("\n", "\n  "))
+        elif args.verbose:
+            print(f"{file_path}: OK ({result['frames']} MPEG frames)")
+
+    print(f"\n--- Validation Summary ---")
+    print(f"Total MP3 files validated: {total}")
+    print(f"Files with errors or warnings: {flagged}")
+
+
+if __name__ == "__main__":
+    main()
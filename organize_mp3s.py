@@ -2,11 +2,13 @@
 
 import os
 import sys
-import eyed3
+import argparse
 from pathlib import Path
 import shutil
+from library_index import LibraryIndex, iter_track_records, add_index_argument
+from scan_journal import add_walk_arguments, selected_mp3_paths
 
-def organize_mp3s(source_dir, target_dir, artist_name):
+def organize_mp3s(source_dir, target_dir, artist_name, index_path=None, mp3_paths=None):
     """
     Organize MP3 files by moving files from a specific artist to a target directory.
     
@@ -14,6 +16,8 @@ def organize_mp3s(source_dir, target_dir, artist_name):
         source_dir (str): Source directory containing MP3 files
         target_dir (str): Target directory to move files to
         artist_name (str): Name of the artist to look for
+        index_path (str): Optional library index database to read tags from
+        mp3_paths (list): Optional explicit list of MP3 files to consider instead of the whole tree
     """
     # Create target directory if it doesn't exist
     os.makedirs(target_dir, exist_ok=True)
@@ -24,43 +28,50 @@ def organize_mp3s(source_dir, target_dir, artist_name):
     
     # Counter for moved files
     moved_count = 0
+    moved_paths = []
     
-    # Walk through the source directory
-    for mp3_file in source_path.rglob("*.mp3"):
-        try:
-            # Load the audio file
-            audiofile = eyed3.load(mp3_file)
+    # Walk through the source directory (or read the library index)
+    for record in iter_track_records(source_path, index_path, mp3_paths, fields=["artist"]):
+        mp3_file = Path(record["path"])
+        if record["load_error"]:
+            print(f"Could not load {mp3_file}")
+            continue
             
-            if audiofile is None:
-                print(f"Could not load {mp3_file}")
-                continue
-                
-            # Get the artist name
-            if audiofile.tag and audiofile.tag.artist:
-                file_artist = audiofile.tag.artist
+        # Get the artist name
+        if record["has_tag"] and record["artist"]:
+            file_artist = record["artist"]
+            
+            # Check if this is the artist we're looking for
+            if file_artist.lower() == artist_name.lower():
+                # Create the target file path
+                target_file = target_path / mp3_file.name
                 
-                # Check if this is the artist we're looking for
-                if file_artist.lower() == artist_name.lower():
-                    # Create the target file path
-                    target_file = target_path / mp3_file.name
-                    
-                    # Move the file
-                    print(f"Moving {mp3_file} to {target_file}")
+                # Move the file
+                print(f"Moving {mp3_file} to {target_file}")
+                try:
                     shutil.move(str(mp3_file), str(target_file))
-                    moved_count += 1
-                    
-        except Exception as e:
-            print(f"Error processing {mp3_file}: {str(e)}")
+                except Exception as e:
+                    print(f"Error processing {mp3_file}: {str(e)}")
+                    continue
+                moved_paths.append(mp3_file)
+                moved_count += 1
+
+    if index_path and moved_paths:
+        # Moved files are picked up again under their new path on the next scan.
+        with LibraryIndex(index_path) as index:
+            for mp3_file in moved_paths:
+                index.forget(mp3_file)
     
     print(f"\nMoved {moved_count} files to {target_dir}")
 
 if __name__ == "__main__":
-    if len(sys.argv) != 4:
-        print("Usage: python organize_mp3s.py <source_directory> <target_directory> <artist_name>")
-        sys.exit(1)
-        
-    source_dir = sys.argv[1]
-    target_dir = sys.argv[2]
-    artist_name = sys.argv[3]
+    parser = argparse.ArgumentParser(description="Move MP3 files by a specific artist to a target directory.")
+    parser.add_argument("source_directory", help="Source directory containing MP3 files")
+    parser.add_argument("target_directory", help="Target directory to move files to")
+    parser.add_argument("artist_name", help="Name of the artist to look for")
+    add_index_argument(parser)
+    add_walk_arguments(parser)
+    args = parser.parse_args()
     
-    organize_mp3s(source_dir, target_dir, artist_name) 
\ No newline at end of file
+    with selected_mp3_paths(args.source_directory, args, "organize_mp3s") as mp3_paths:
+        organize_mp3s(args.source_directory, args.target_directory, args.artist_name, args.index, mp3_paths)
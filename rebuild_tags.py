@@ -1,106 +1,212 @@
 import argparse
 import os
 import subprocess
-import tempfile
 import shutil
 import json
+import io
+import sys
+import time
+from contextlib import redirect_stdout
 from multiprocessing import Pool, cpu_count
 from functools import partial
+from id3_reader import ID3ReadError
+from id3_writer import read_raw_tag, remove_frames, frame_description
+from transcoder import make_job, make_profile, run_job
 
 # Centralized, case-insensitive blacklist of metadata keys from ffprobe's output.
 # These are the tags we want to check for and remove.
 BLACKLISTED_TAG_KEYS = {'itunsmpb', 'itunnorm', 'itunpgap', 'itunes_cddb_1', 'itunes_cddb_tracknumber'}
 
-def process_file(file_path, root_folder):
+# --reencode output profile: VBR quality 2 (0=highest, 9=lowest), a good compromise.
+REENCODE_PROFILE = make_profile(quality=2)
+
+# Per-file results of previous runs (JSON lines), next to this script.
+RESULTS_LOG_FILENAME = 'rebuild_tags.results.jsonl'
+
+# Statuses that mean a file needs no further work while it stays unchanged.
+DONE_STATUSES = {'clean', 'sanitised'}
+
+def process_file(file_path, root_folder, reencode=False, use_ffprobe=False, check_only=False):
     """
     This is the main worker function that will be run in parallel.
     It takes a single file path, checks it, and sanitises it if needed.
+
+    Console output is captured and returned with the result so the parent can
+    print it as one block instead of interleaving lines from several workers.
+
+    Returns:
+        A dict with "path", "status" ("clean", "dirty" (check_only),
+        "sanitised" or "failed"), the file's size and mtime after processing,
+        "ffprobe" (whether ffprobe did the check) and "output".
     """
+    output = io.StringIO()
+    with redirect_stdout(output):
+        status = _process_file(file_path, root_folder, reencode, use_ffprobe, check_only)
+    try:
+        signature = file_signature(file_path)
+    except OSError:
+        signature = {'size': None, 'mtime_ns': None}
+    return {'path': file_path, 'status': status, **signature, 'ffprobe': use_ffprobe, 'output': output.getvalue()}
+
+def _process_file(file_path, root_folder, reencode, use_ffprobe, check_only):
     # Print a relative path for cleaner output
     relative_path = os.path.relpath(file_path, root_folder)
     print(f"Processing: {relative_path}")
 
-    if check_for_offending_tags(file_path, relative_path):
-        sanitise_file(file_path, relative_path)
-    else:
+    offending_keys, ffprobe_tags = check_for_offending_tags(file_path, relative_path, use_ffprobe)
+    if not offending_keys:
         print(f"  - File is clean. Skipping {relative_path}.")
+        return "clean"
+    if check_only:
+        return "dirty"
+    if sanitise_file(file_path, relative_path, reencode, ffprobe_tags):
+        return "sanitised"
+    return "failed"
+
+def file_signature(file_path):
+    """Returns the size/mtime pair used to decide whether a logged result is still valid."""
+    st = os.stat(file_path)
+    return {'size': st.st_size, 'mtime_ns': st.st_mtime_ns}
+
+def load_results_log(results_log_path):
+    """Loads previous per-file results (last entry per path wins)."""
+    results = {}
+    if not os.path.exists(results_log_path):
+        return results
+    with open(results_log_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                result = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # Partially written line from an interrupted run
+            results[result['path']] = result
+    return results
 
-def check_for_offending_tags(file_path, relative_path):
+def is_already_done(file_path, previous, use_ffprobe):
+    """True if a previous run left this unchanged file clean or sanitised."""
+    result = previous.get(file_path)
+    if result is None or result['status'] not in DONE_STATUSES:
+        return False
+    # A file found clean by the ID3 reader may still have non-ID3v2 tags ffprobe sees.
+    if use_ffprobe and not result.get('ffprobe'):
+        return False
+    try:
+        return file_signature(file_path) == {'size': result['size'], 'mtime_ns': result['mtime_ns']}
+    except OSError:
+        return False
+
+def format_duration(seconds):
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}"
+
+def probe_tags(file_path):
+    """Returns the format tags ffprobe reports for a file."""
+    result = subprocess.run(
+        ['ffprobe', '-v', 'quiet', '-print_format', 'json', '-show_format', file_path],
+        check=True, capture_output=True, text=True
+    )
+    data = json.loads(result.stdout)
+    return data.get('format', {}).get('tags', {})
+
+def read_described_frame_keys(file_path):
+    """
+    Lists the descriptions of the TXXX/COMM frames in a file's ID3v2 tag, which
+    are the keys ffprobe reports them under, without starting ffprobe.
     """
-    Uses ffprobe to quickly check if an MP3 file contains any of the
-    blacklisted metadata tags.
+    with open(file_path, 'rb') as f:
+        tag = read_raw_tag(f)
+    if tag is None:
+        return []
+    descriptions = (frame_description(tag, frame) for frame in tag['frames'])
+    return [description for description in descriptions if description]
+
+def check_for_offending_tags(file_path, relative_path, use_ffprobe=False):
+    """
+    Checks if an MP3 file contains any of the blacklisted metadata tags. By
+    default the ID3v2 tag is read in-process; with use_ffprobe, ffprobe is
+    asked instead, which also sees tags outside ID3v2 (e.g. APE).
+
+    Returns:
+        (offending_keys, ffprobe_tags): the blacklisted keys found, and the
+        full ffprobe tag dictionary when ffprobe was used (None otherwise), so
+        sanitising does not have to probe the file a second time.
     """
     try:
-        result = subprocess.run(
-            ['ffprobe', '-v', 'quiet', '-print_format', 'json', '-show_format', file_path],
-            check=True, capture_output=True, text=True
-        )
-        data = json.loads(result.stdout)
-        if 'tags' in data.get('format', {}):
-            for key in data['format']['tags']:
-                if key.lower() in BLACKLISTED_TAG_KEYS:
-                    print(f"  - Found offending tag '{key}' in {relative_path}. Needs sanitisation.")
-                    return True
-        # If we get here, no offending tags were found
-        return False
+        if use_ffprobe:
+            ffprobe_tags = probe_tags(file_path)
+            keys = list(ffprobe_tags)
+        else:
+            ffprobe_tags = None
+            keys = read_described_frame_keys(file_path)
     except Exception as e:
         print(f"  - Warning: Could not probe {relative_path} for tags: {e}")
         # Assume it's clean if we can't probe it, to be safe.
+        return [], None
+
+    offending_keys = [key for key in keys if key.lower() in BLACKLISTED_TAG_KEYS]
+    if offending_keys:
+        print(f"  - Found offending tag(s) {', '.join(repr(key) for key in offending_keys)} in {relative_path}. "
+              f"Needs sanitisation.")
+    return offending_keys, ffprobe_tags
+
+def is_offending_frame(tag, frame):
+    """True for TXXX/COMM frames whose description is a blacklisted ffprobe key."""
+    description = frame_description(tag, frame)
+    return description is not None and description.lower() in BLACKLISTED_TAG_KEYS
+
+def sanitise_file(original_path, relative_path, reencode=False, ffprobe_tags=None):
+    """
+    Sanitises a single MP3 file. By default only the ID3v2 tag is rewritten
+    without the blacklisted frames and the audio is copied untouched; with
+    reencode, the whole file is re-encoded instead (see reencode_file).
+    """
+    if reencode:
+        return reencode_file(original_path, relative_path, ffprobe_tags)
+
+    print(f"  - Sanitising {relative_path} (tag rewrite)...")
+    try:
+        removed = remove_frames(original_path, is_offending_frame)
+    except (ID3ReadError, OSError) as e:
+        print(f"    - Error rewriting the tag of {relative_path}: {e}")
+        return False
+
+    if not removed:
+        print(f"    - No blacklisted ID3v2 frames found in {relative_path}; "
+              f"the tags may live elsewhere. Try --reencode.")
         return False
+    print(f"    - Removed {len(removed)} blacklisted frame(s) from {relative_path}, audio left untouched.")
+    return True
 
-def sanitise_file(original_path, relative_path):
+def reencode_file(original_path, relative_path, ffprobe_tags=None):
     """
     Sanitises a single MP3 file by re-encoding it to strip all embedded data,
-    then reapplying a clean, filtered set of metadata.
+    then reapplying a clean, filtered set of metadata. ffprobe_tags are the
+    tags from the check stage, if it used ffprobe; otherwise they are probed here.
     """
-    print(f"  - Sanitising {relative_path}...")
+    print(f"  - Sanitising {relative_path} (re-encode)...")
 
-    # 1. Extract all metadata with ffprobe
-    metadata_args = []
+    # 1. Extract all metadata with ffprobe (unless the check already did)
+    metadata = {}
     try:
-        result = subprocess.run(
-            ['ffprobe', '-v', 'quiet', '-print_format', 'json', '-show_format', original_path],
-            check=True, capture_output=True, text=True
-        )
-        data = json.loads(result.stdout)
-        if 'tags' in data.get('format', {}):
-            for key, value in data['format']['tags'].items():
+        tags = ffprobe_tags if ffprobe_tags is not None else probe_tags(original_path)
+        if tags:
+            for key, value in tags.items():
                 if key.lower() not in BLACKLISTED_TAG_KEYS:
-                    metadata_args.extend(['-metadata', f'{key}={value}'])
-            print(f"    - Preserving {len(metadata_args) // 2} metadata tags for {relative_path}.")
+                    metadata[key] = value
+            print(f"    - Preserving {len(metadata)} metadata tags for {relative_path}.")
     except Exception as e:
         print(f"    - Warning: Could not extract metadata for {relative_path}: {e}")
         # We can still proceed to strip the file, it will just have no metadata.
 
-    # 2. Re-encode the file using ffmpeg, applying the filtered metadata
-    temp_fd, temp_path = tempfile.mkstemp(suffix='.mp3')
-    os.close(temp_fd)
-    try:
-        command = [
-            'ffmpeg', '-i', original_path,
-            '-c:a', 'libmp3lame',  # Re-encode to guarantee a clean audio stream
-            '-q:a', '2',             # VBR quality (0=highest, 9=lowest), a good compromise
-            '-map_metadata', '-1',   # Strip all metadata from the source
-            '-y'
-        ]
-        command.extend(metadata_args)  # Add back the preserved metadata
-        command.append(temp_path)
-        
-        subprocess.run(command, check=True, capture_output=True, text=True)
-        
-        shutil.move(temp_path, original_path)
-        print(f"    - Successfully sanitised {relative_path}.")
-        return True
-
-    except subprocess.CalledProcessError as e:
-        print(f"    - Error during ffmpeg sanitisation: {e.stderr}")
-    except Exception as e:
-        print(f"    - An unexpected error occurred: {e}")
-    
-    # Cleanup on failure
-    if os.path.exists(temp_path):
-        os.remove(temp_path)
-    return False
+    # 2. Re-encode the file in place (VBR quality 2, a good compromise), stripping
+    #    all metadata from the source and applying the filtered tags
+    result = run_job(make_job(original_path, original_path, REENCODE_PROFILE, metadata, strip_metadata=True))
+    if result['status'] == 'failed':
+        print(f"    - Error during ffmpeg sanitisation: {result['error']}")
+        return False
+    print(f"    - Successfully sanitised {relative_path} in {result['seconds']:.1f}s.")
+    return True
 
 def main():
     """
@@ -108,13 +214,25 @@ def main():
     kick off the parallel processing.
     """
     parser = argparse.ArgumentParser(
-        description='Conditionally and in parallel rebuilds MP3s using ffmpeg if they contain blacklisted tags.'
+        description='Conditionally and in parallel removes blacklisted tags from MP3s by rewriting their ID3 tag, or re-encoding them with --reencode.'
     )
     parser.add_argument('folder_path', type=str, help='The folder of MP3s to process.')
+    parser.add_argument('--reencode', action='store_true',
+                        help='Re-encode dirty files with libmp3lame instead of only rewriting their ID3 tag. '
+                             'Lossy and slow; meant for files whose audio stream is damaged.')
+    parser.add_argument('--ffprobe', action='store_true',
+                        help='Check tags with ffprobe instead of the in-process ID3 reader (also sees non-ID3v2 tags, '
+                             'but starts a process per file).')
+    parser.add_argument('--check-only', action='store_true',
+                        help='Only report which files contain blacklisted tags; do not modify anything.')
+    parser.add_argument('--fresh', action='store_true',
+                        help=f'Ignore the results of previous runs ({RESULTS_LOG_FILENAME}) and check every file again.')
     args = parser.parse_args()
 
-    if not shutil.which("ffmpeg") or not shutil.which("ffprobe"):
-        print("Error: This script requires both 'ffmpeg' and 'ffprobe'.")
+    needs_ffprobe = args.ffprobe or (args.reencode and not args.check_only)
+    needs_ffmpeg = args.reencode and not args.check_only
+    if (needs_ffprobe and not shutil.which("ffprobe")) or (needs_ffmpeg and not shutil.which("ffmpeg")):
+        print("Error: This script requires 'ffprobe' with --ffprobe, and 'ffmpeg' and 'ffprobe' with --reencode.")
         print("Please install them and ensure they are in your PATH.")
         return
 
@@ -122,33 +240,80 @@ def main():
         print(f"Error: Directory not found at '{args.folder_path}'")
         return
 
-    # 1. Find all MP3 files first
-    mp3_files = []
-    for root, _, files in os.walk(args.folder_path):
-        for filename in files:
-            if filename.lower().endswith('.mp3'):
-                mp3_files.append(os.path.join(root, filename))
+    # Absolute paths, so logged results match whatever directory the script is run from.
+    folder_path = os.path.abspath(args.folder_path)
+    results_log_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), RESULTS_LOG_FILENAME)
+    if args.fresh and os.path.exists(results_log_path):
+        os.remove(results_log_path)
+    previous = load_results_log(results_log_path)
 
-    if not mp3_files:
-        print("No MP3 files found in the specified directory.")
-        return
-    
-    print(f"Found {len(mp3_files)} MP3 file(s). Starting parallel processing...")
+    # 1. Discover files lazily; the pool starts on the first ones while the
+    # walk is still going (imap_unordered consumes this from a helper thread).
+    discovery = {'found': 0, 'skipped': 0, 'done': False}
+
+    def discover_mp3_files():
+        for root, _, files in os.walk(folder_path):
+            for filename in files:
+                if filename.lower().endswith('.mp3'):
+                    file_path = os.path.join(root, filename)
+                    discovery['found'] += 1
+                    if is_already_done(file_path, previous, args.ffprobe):
+                        discovery['skipped'] += 1
+                        continue
+                    yield file_path
+        discovery['done'] = True
 
     # 2. Use a process pool to run the checks and conversions in parallel
     # We use cpu_count() to automatically use all available cores.
     num_processes = cpu_count()
-    print(f"Using {num_processes} processes.")
+    print(f"Using {num_processes} processes. Results are logged to {results_log_path}.")
     
     # We use partial to "pre-fill" the root_folder argument of process_file,
     # since the pool iterator only passes a single argument (the file path).
-    worker_func = partial(process_file, root_folder=args.folder_path)
-    
-    with Pool(processes=num_processes) as pool:
-        # map will distribute the mp3_files list among the worker processes
-        # and block until all are complete.
-        pool.map(worker_func, sorted(mp3_files))
-        
+    worker_func = partial(process_file, root_folder=folder_path, reencode=args.reencode,
+                          use_ffprobe=args.ffprobe, check_only=args.check_only)
+    # Re-encodes take long; hand them out one by one. Checks and tag rewrites
+    # are quick, so batch them to keep the workers busy.
+    chunksize = 1 if args.reencode and not args.check_only else 16
+
+    counts = {'clean': 0, 'dirty': 0, 'sanitised': 0, 'failed': 0}
+    dirty_files = []
+    processed = 0
+    start_time = last_progress = time.monotonic()
+
+    with Pool(processes=num_processes) as pool, open(results_log_path, 'a', encoding='utf-8') as results_log:
+        for result in pool.imap_unordered(worker_func, discover_mp3_files(), chunksize=chunksize):
+            print(result.pop('output'), end="")
+            results_log.write(json.dumps(result) + "\n")
+            results_log.flush()
+            processed += 1
+            counts[result['status']] += 1
+            if result['status'] == 'dirty':
+                dirty_files.append(result['path'])
+
+            now = time.monotonic()
+            if now - last_progress >= 1:
+                last_progress = now
+                rate = processed / (now - start_time)
+                to_process = discovery['found'] - discovery['skipped']
+                eta = format_duration((to_process - processed) / rate) if rate else '?'
+                more = '' if discovery['done'] else '+'
+                print(f"[{processed}/{to_process}{more}] {rate:.1f} files/s, ETA {eta}{more}", file=sys.stderr)
+
+    elapsed = time.monotonic() - start_time
+    if discovery['found'] == 0:
+        print("No MP3 files found in the specified directory.")
+        return
+
+    print(f"\nFound {discovery['found']} MP3 file(s); {discovery['skipped']} unchanged since a previous run were skipped.")
+    print(f"Processed {processed} file(s) in {format_duration(elapsed)} "
+          f"({processed / elapsed if elapsed else 0:.1f} files/s).")
+    if args.check_only:
+        print(f"\n{len(dirty_files)} of {processed} checked file(s) contain blacklisted tags:")
+        for path in sorted(dirty_files):
+            print(f"  {os.path.relpath(path, folder_path)}")
+    else:
+        print(f"Clean: {counts['clean']}, sanitised: {counts['sanitised']}, failed: {counts['failed']}")
     print("\nProcessing complete.")
 
 
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import json
+import time
+import argparse
+import unicodedata
+
+# Undo journals of executed plans, one JSON lines file per run.
+DEFAULT_JOURNAL_DIR = "~/.mp3_rename_journals"
+
+# Prefix of the temporary names used to break rename cycles (a -> b, b -> a).
+TEMP_PREFIX = ".rename-tmp-"
+
+
+def to_nfc(name):
+    """Rename transform for Unicode Normalization Form C."""
+    return unicodedata.normalize('NFC', name)
+
+
+def _plan_directory(parent, entries, transform, key, plan):
+    """
+    Plans the renames among the entries of one directory, appending them to
+    plan["renames"] in an order that never renames onto a name still in use
+    and recording collisions in plan["conflicts"].
+
+    Args:
+        parent: Directory path
+        entries: List of (name, kind) with kind "file" or "dir"
+        transform: Function from name to new name
+        key: Function giving the identity of a name (two names with the same
+            key cannot coexist in a directory)
+        plan: Plan dict being built
+    """
+    kinds = dict(entries)
+    targets = {}
+    for name, kind in entries:
+        try:
+            targets[name] = transform(name)
+        except Exception as e:
+            plan["conflicts"].append({"old": os.path.join(parent, name), "new": None, "kind": kind,
+                                      "reason": f"cannot compute new name: {e}"})
+            targets[name] = name
+
+    # Renames whose target is taken by another entry's final name are
+    # dropped; dropping one can block another, so repeat until stable.
+    while True:
+        owners = {}
+        for name, new in targets.items():
+            owners.setdefault(key(new), []).append(name)
+        blocked = False
+        for names in owners.values():
+            if len(names) < 2:
+                continue
+            for name in names:
+                if targets[name] != name:
+                    others = ", ".join(f"'{other}'" for other in sorted(names) if other != name)
+                    plan["conflicts"].append({
+                        "old": os.path.join(parent, name), "new": os.path.join(parent, targets[name]),
+                        "kind": kinds[name], "reason": f"target collides with {others}",
+                    })
+                    targets[name] = name
+                    blocked = True
+        if not blocked:
+            break
+
+    pending = {name: new for name, new in targets.items() if new != name}
+    # Which pending rename currently holds each name (by key).
+    holders = {key(name): name for name in pending}
+    waited = set()
+    temp_count = 0
+    while pending:
+        ready = [name for name, new in pending.items() if holders.get(key(new), name) == name]
+        if not ready:
+            # Only cycles are left: move one member out of the way first.
+            name = min(pending)
+            temp_count += 1
+            temp = f"{TEMP_PREFIX}{temp_count}-{name}"
+            plan["renames"].append({"old": os.path.join(parent, name), "new": os.path.join(parent, temp),
+                                    "kind": kinds[name]})
+            plan["cycles"] += 1
+            pending[temp] = pending.pop(name)
+            kinds[temp] = kinds[name]
+            del holders[key(name)]
+            holders[key(temp)] = temp
+            continue
+        for name in sorted(ready):
+            new = pending.pop(name)
+            del holders[key(name)]
+            plan["renames"].append({"old": os.path.join(parent, name), "new": os.path.join(parent, new),
+                                    "kind": kinds[name]})
+            if name in waited:
+                plan["chained"] += 1
+        # Renames left now wait on one that was just planned.
+        waited.update(pending)
+
+
+def plan_renames(root_dir, transform=to_nfc, case_insensitive=False):
+    """
+    Builds the complete rename plan for a tree in one walk, without touching
+    the filesystem. Each directory's renames are checked against its full
+    listing in memory: renames onto a name that another entry keeps or also
+    renames to are reported as conflicts and left out, renames onto a name
+    that is itself being renamed away (chains) are ordered after it, and
+    cycles go through a temporary name. Contents are renamed before their
+    directory, so every rename's source path is valid when it runs.
+
+    Args:
+        root_dir: Root of the tree (the root itself is not renamed)
+        transform: Function from name to new name (default: NFC)
+        case_insensitive: Also treat names differing only in case as
+            colliding, as on FAT32 and default macOS volumes
+
+    Returns:
+        A dict with "root", "renames" (ordered {"old", "new", "kind"}),
+        "conflicts" ({"old", "new", "kind", "reason"}), "scanned", "chained"
+        (renames that wait for another) and "cycles" (temporary renames).
+    """
+    if case_insensitive:
+        def key(name):
+            return to_nfc(name).casefold()
+    else:
+        def key(name):
+            return name
+
+    plan = {"root": os.path.abspath(root_dir), "renames": [], "conflicts": [], "scanned": 0, "chained": 0, "cycles": 0}
+
+    def walk_error(error):
+        plan["conflicts"].append({"old": error.filename, "new": None, "kind": "dir",
+                                  "reason": f"cannot list directory: {error.strerror}"})
+
+    # Bottom-up, so a directory's contents are planned (and renamed) first.
+    for current_root, dirnames, filenames in os.walk(plan["root"], topdown=False, onerror=walk_error):
+        entries = [(name, "file") for name in filenames] + [(name, "dir") for name in dirnames]
+        plan["scanned"] += len(entries)
+        _plan_directory(current_root, entries, transform, key, plan)
+    return plan
+
+
+def print_plan(plan):
+    """Prints the renames of a plan in execution order, its conflicts and a summary line."""
+    for op in plan["renames"]:
+        print(f"  {op['kind'].upper():4}: '{op['old']}' -> '{op['new']}'")
+    for conflict in plan["conflicts"]:
+        target = f" -> '{conflict['new']}'" if conflict["new"] else ""
+        print(f"  CONFLICT ({conflict['kind']}): '{conflict['old']}'{target}: {conflict['reason']}")
+    print(f"{len(plan['renames'])} renames planned ({plan['chained']} ordered after another, "
+          f"{plan['cycles']} via a temporary name), {len(plan['conflicts'])} conflicts, "
+          f"{plan['scanned']} items scanned.")
+
+
+def default_journal_path(root_dir):
+    """Returns a new journal path in DEFAULT_JOURNAL_DIR for a run on root_dir."""
+    name = os.path.basename(os.path.abspath(root_dir).rstrip(os.sep)) or "root"
+    return os.path.join(os.path.expanduser(DEFAULT_JOURNAL_DIR), f"{time.strftime('%Y%m%d-%H%M%S')}-{name}.jsonl")
+
+
+def _same_entry(path_a, path_b):
+    # True when two names resolve to one entry, as NFD and NFC names do on a
+    # normalization-insensitive filesystem (APFS, HFS+).
+    try:
+        a, b = os.lstat(path_a), os.lstat(path_b)
+    except OSError:
+        return False
+    return (a.st_dev, a.st_ino) == (b.st_dev, b.st_ino)
+
+
+def _rename(old, new):
+    # os.rename silently replaces files on POSIX, so check first.
+    if os.path.lexists(new) and not _same_entry(old, new):
+        raise FileExistsError(f"target already exists: '{new}'")
+    os.rename(old, new)
+
+
+def execute_plan(plan, journal_path):
+    """
+    Runs the renames of a plan in order. Each successful rename is appended to
+    the journal (and flushed) as it happens, so the journal can undo exactly
+    what was done even if the run is interrupted.
+
+    Returns:
+        A dict with counts of "renamed" and "failed" renames.
+    """
+    counts = {"renamed": 0, "failed": 0}
+    if not plan["renames"]:
+        return counts
+    os.makedirs(os.path.dirname(os.path.abspath(journal_path)), exist_ok=True)
+    with open(journal_path, "a", encoding="utf-8") as journal:
+        for op in plan["renames"]:
+            try:
+                _rename(op["old"], op["new"])
+            except OSError as e:
+                print(f"  ERROR renaming {op['kind']} '{op['old']}' -> '{op['new']}': {e}")
+                counts["failed"] += 1
+                continue
+            journal.write(json.dumps(op) + "\n")
+            journal.flush()
+            print(f"  RENAMED {op['kind'].upper():4}: '{op['old']}' -> '{op['new']}'")
+            counts["renamed"] += 1
+    return counts
+
+
+def undo_renames(journal_path, dry_run=False):
+    """
+    Reverts the renames recorded in a journal, newest first.
+
+    Returns:
+        A dict with counts of "reverted" and "failed" renames.
+    """
+    with open(journal_path, "r", encoding="utf-8") as f:
+        ops = [json.loads(line) for line in f if line.strip()]
+    counts = {"reverted": 0, "failed": 0}
+    for op in reversed(ops):
+        if dry_run:
+            print(f"  {op['kind'].upper():4}: '{op['new']}' -> '{op['old']}'")
+            counts["reverted"] += 1
+            continue
+        try:
+            _rename(op["new"], op["old"])
+        except OSError as e:
+            print(f"  ERROR reverting '{op['new']}' -> '{op['old']}': {e}")
+            counts["failed"] += 1
+            continue
+        print(f"  REVERTED {op['kind'].upper():4}: '{op['new']}' -> '{op['old']}'")
+        counts["reverted"] += 1
+    print(f"{counts['reverted']} renames {'would be ' if dry_run else ''}reverted, {counts['failed']} errors.")
+    return counts
+
+
+def add_plan_arguments(parser):
+    """Adds the --dry-run, --yes and --journal options used with run_plan to an argparse parser."""
+    parser.add_argument("--dry-run", action="store_true", help="Show the rename plan without renaming anything.")
+    parser.add_argument("-y", "--yes", action="store_true", help="Do not ask for confirmation before renaming.")
+    parser.add_argument("--journal", default=None,
+                        help=f"Undo journal to write (default: a new file in {DEFAULT_JOURNAL_DIR}). "
+                             f"Revert with: python rename_planner.py --undo JOURNAL")
+
+
+def run_plan(plan, dry_run=False, journal_path=None, confirm=True):
+    """
+    Prints a plan and, unless dry_run, executes it after a yes/no
+    confirmation (if confirm and there is anything to rename).
+
+    Returns:
+        The execute_plan counts plus "conflicts", or None if nothing was run.
+    """
+    print_plan(plan)
+    if dry_run:
+        print("This was a dry run. No files were actually renamed.")
+        return None
+    if not plan["renames"]:
+        print("Nothing to rename.")
+        return {"renamed": 0, "failed": 0, "conflicts": len(plan["conflicts"])}
+    if confirm:
+        answer = input(f"Rename {len(plan['renames'])} items? (yes/no): ")
+        if answer.strip().lower() != "yes":
+            print("Renaming cancelled by user.")
+            return None
+    journal_path = journal_path or default_journal_path(plan["root"])
+    counts = execute_plan(plan, journal_path)
+    counts["conflicts"] = len(plan["conflicts"])
+    print("--------------------------------------------------------")
+    print(f"{counts['renamed']} items renamed, {counts['failed']} errors, {counts['conflicts']} conflicts skipped.")
+    if counts["renamed"]:
+        print(f"Undo journal: {journal_path}")
+        print(f"To revert: python rename_planner.py --undo '{journal_path}'")
+    print("--------------------------------------------------------")
+    return counts
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Revert renames recorded in an undo journal.")
+    parser.add_argument("--undo", required=True, metavar="JOURNAL", help="Journal written by a rename run.")
+    parser.add_argument("--dry-run", action="store_true", help="Show what would be reverted.")
+    args = parser.parse_args()
+
+    counts = undo_renames(args.undo, args.dry_run)
+    sys.exit(1 if counts["failed"] else 0)
@@ -1,7 +1,39 @@
 import os
 import sys
+import io
 from PIL import Image
 
+def fit_dimensions(width, height, max_size):
+    """Returns (width, height) scaled so the largest dimension is max_size, keeping the aspect ratio."""
+    if width > height:
+        return max_size, int(height * (max_size / width))
+    return int(width * (max_size / height)), max_size
+
+def resize_image_data(data, max_size=800, quality=85):
+    """
+    Resizes image bytes so that the largest dimension is at most max_size
+    pixels and re-encodes them as a JPEG at the given quality. Images that
+    are already small enough are only re-encoded.
+
+    Args:
+        data: Image file contents (any format Pillow can open)
+        max_size: Maximum dimension size in pixels (default: 800)
+        quality: JPEG quality, 1-95 (default: 85)
+
+    Returns:
+        (jpeg_bytes, (width, height)) of the result.
+    """
+    with Image.open(io.BytesIO(data)) as img:
+        width, height = img.size
+        if width > max_size or height > max_size:
+            img = img.resize(fit_dimensions(width, height, max_size), Image.Resampling.LANCZOS)
+        # JPEG has no alpha channel or palette.
+        if img.mode != "RGB":
+            img = img.convert("RGB")
+        output = io.BytesIO()
+        img.save(output, format="JPEG", quality=quality, optimize=True)
+        return output.getvalue(), img.size
+
 def resize_image(image_path, max_size=800):
     """
     Resizes an image so that its largest dimension is max_size pixels,
@@ -28,12 +60,7 @@ def resize_image(image_path, max_size=800):
                 return True
             
             # Calculate new dimensions
-            if width > height:
-                new_width = max_size
-                new_height = int(height * (max_size / width))
-            else:
-                new_height = max_size
-                new_width = int(width * (max_size / height))
+            new_width, new_height = fit_dimensions(width, height, max_size)
             
             # Resize the image
             resized_img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
@@ -1,6 +1,8 @@
 import os
+import sys
+import argparse
 import unicodedata
-import shutil
+from rename_planner import add_plan_arguments, plan_renames, run_plan
 
 def sanitize_name(name):
     original_name = name
@@ -22,52 +24,31 @@ def sanitize_name(name):
     # NFC normalization should have been handled by prior scripts in that case.
     return original_name
 
-def sanitize_filenames_in_directory(directory_path):
-    renamed_count = 0
-    for root, dirs, files in os.walk(directory_path, topdown=False):
-        # Sanitize file names
-        for name in files:
-            original_full_path = os.path.join(root, name)
-            sanitized_name_part = sanitize_name(name)
-            
-            if sanitized_name_part != name:
-                new_full_path = os.path.join(root, sanitized_name_part)
-                
-                # Check for conflicts before renaming
-                if os.path.exists(new_full_path):
-                    print(f"SKIPPING rename: Target '{new_full_path}' already exists. Original: '{original_full_path}'")
-                    continue
-                
-                try:
-                    os.rename(original_full_path, new_full_path)
-                    print(f"Renamed FILE: '{original_full_path}' to '{new_full_path}'")
-                    renamed_count += 1
-                except OSError as e:
-                    print(f"Error renaming file '{original_full_path}' to '{new_full_path}': {e}")
-
-        # Sanitize directory names
-        for name in dirs:
-            original_full_path = os.path.join(root, name)
-            sanitized_name_part = sanitize_name(name)
-
-            if sanitized_name_part != name:
-                new_full_path = os.path.join(root, sanitized_name_part)
-
-                if os.path.exists(new_full_path):
-                    print(f"SKIPPING rename: Target '{new_full_path}' already exists. Original: '{original_full_path}'")
-                    continue
-
-                try:
-                    os.rename(original_full_path, new_full_path)
-                    print(f"Renamed DIR:  '{original_full_path}' to '{new_full_path}'")
-                    renamed_count += 1
-                except OSError as e:
-                    print(f"Error renaming directory '{original_full_path}' to '{new_full_path}': {e}")
-    
+def sanitize_filenames_in_directory(directory_path, dry_run=False, journal_path=None, confirm=False):
+    """
+    Renames the files and directories below directory_path to their
+    sanitize_name form in one planned batch (see rename_planner). Names that
+    would collide with another item, including names that differ only in
+    case, which FAT32 cannot hold side by side, are reported and left alone.
+    With confirm, the plan is shown and a yes/no answer awaited first.
+    """
+    plan = plan_renames(directory_path, sanitize_name, case_insensitive=True)
+    counts = run_plan(plan, dry_run, journal_path, confirm)
+    renamed_count = counts["renamed"] if counts else 0
     print(f"\nSanitization complete. {renamed_count} items renamed.")
+    return counts
 
 if __name__ == '__main__':
-    music_folder = '/Users/stencate/Desktop/Music/'
+    parser = argparse.ArgumentParser(description="Replace dashes and smart quotes in file and directory names for FAT32 players.")
+    parser.add_argument('directory', nargs='?', default='/Users/stencate/Desktop/Music/',
+                        help="Directory to sanitize (default: %(default)s).")
+    add_plan_arguments(parser)
+    args = parser.parse_args()
+
+    music_folder = args.directory
+    if not os.path.isdir(music_folder):
+        print(f"Error: '{music_folder}' is not a valid directory.")
+        sys.exit(1)
     print(f"Starting filename sanitization for directory: {music_folder}")
     print("This will rename files and directories in place.")
     print("Characters to be replaced:")
@@ -75,6 +56,4 @@ if __name__ == '__main__':
     print("  Left/Right Single Quotes (‘ ’) -> Apostrophe (')")
     print("  Left/Right Double Quotes (“ ”) -> Quotation Mark (\")")
     print("All names will be NFC normalized after changes.")
-    # You can add a confirmation step here if you like:
-    # input("Press Enter to continue or Ctrl+C to abort...")
-    sanitize_filenames_in_directory(music_folder) 
\ No newline at end of file
+    sanitize_filenames_in_directory(music_folder, args.dry_run, args.journal, confirm=not args.yes)
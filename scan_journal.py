@@ -0,0 +1,390 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import json
+import time
+import queue
+import sqlite3
+import argparse
+from contextlib import contextmanager
+
+DEFAULT_JOURNAL_PATH = os.path.expanduser("~/.mp3_scan_journal.sqlite3")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS directories (
+    path      TEXT PRIMARY KEY,
+    mtime_ns  INTEGER NOT NULL,
+    subdirs   TEXT NOT NULL,
+    mp3_files TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS files (
+    path     TEXT PRIMARY KEY,
+    size     INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    inode    INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS journal (
+    seq         INTEGER PRIMARY KEY AUTOINCREMENT,
+    path        TEXT NOT NULL,
+    event       TEXT NOT NULL,
+    recorded_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS journal_path ON journal (path);
+CREATE TABLE IF NOT EXISTS cursors (
+    consumer TEXT NOT NULL,
+    root     TEXT NOT NULL,
+    seq      INTEGER NOT NULL,
+    PRIMARY KEY (consumer, root)
+);
+"""
+
+
+def _is_mp3(name):
+    return name.lower().endswith(".mp3")
+
+
+def _under(path, root_dir):
+    return path == root_dir or path.startswith(os.path.join(root_dir, ""))
+
+
+class ScanJournal:
+    """
+    Incremental scanner for a music tree.
+
+    Each directory's mtime and listing is stored, so a rescan only lists and
+    stats the contents of directories whose mtime changed; unchanged
+    directories cost a single stat. Every added, modified or removed MP3 is
+    appended to a journal, and each consumer script keeps its own cursor into
+    that journal to ask for "changed since my last run".
+
+    A directory's mtime only changes when entries are added, removed or
+    renamed, so a file rewritten in place is not noticed by the directory
+    pass. Run the watcher (watch()) or a full rescan (refresh(full=True)) to
+    catch those.
+    """
+
+    def __init__(self, db_path=DEFAULT_JOURNAL_PATH):
+        self.db_path = os.path.expanduser(db_path)
+        self.conn = sqlite3.connect(self.db_path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+        self.dirs_listed = 0
+        self.dirs_skipped = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        self.conn.commit()
+        self.conn.close()
+
+    def _record(self, path, event):
+        self.conn.execute(
+            "INSERT INTO journal (path, event, recorded_at) VALUES (?, ?, ?)",
+            (path, event, time.time()),
+        )
+
+    def _update_file(self, path):
+        """Re-stats one MP3 and journals it if its signature changed. Returns True if it did."""
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return self._remove_file(path)
+        signature = (st.st_size, st.st_mtime_ns, st.st_ino)
+        row = self.conn.execute("SELECT size, mtime_ns, inode FROM files WHERE path = ?", (path,)).fetchone()
+        if row is not None and tuple(row) == signature:
+            return False
+        self.conn.execute(
+            "INSERT OR REPLACE INTO files (path, size, mtime_ns, inode) VALUES (?, ?, ?, ?)",
+            (path,) + signature,
+        )
+        self._record(path, "changed")
+        return True
+
+    def _remove_file(self, path):
+        if self.conn.execute("DELETE FROM files WHERE path = ?", (path,)).rowcount:
+            self._record(path, "deleted")
+            return True
+        return False
+
+    def _remove_tree(self, dir_path):
+        """Forgets a directory that disappeared, journaling every MP3 it held."""
+        prefix = os.path.join(dir_path, "")
+        for row in self.conn.execute(
+            "SELECT path FROM files WHERE substr(path, 1, ?) = ?", (len(prefix), prefix)
+        ).fetchall():
+            self._remove_file(row["path"])
+        self.conn.execute(
+            "DELETE FROM directories WHERE path = ? OR substr(path, 1, ?) = ?",
+            (dir_path, len(prefix), prefix),
+        )
+
+    def refresh(self, root_dir, full=False):
+        """
+        Brings the stored tree for root_dir up to date and returns the number
+        of files journaled as changed or deleted.
+
+        Args:
+            root_dir: Root of the music tree
+            full: Re-list every directory and re-stat every file, ignoring the
+                  stored directory mtimes.
+        """
+        root_dir = os.path.abspath(root_dir)
+        changes = 0
+        stack = [root_dir]
+
+        while stack:
+            dir_path = stack.pop()
+            try:
+                dir_mtime = os.stat(dir_path).st_mtime_ns
+            except FileNotFoundError:
+                self._remove_tree(dir_path)
+                continue
+
+            row = self.conn.execute(
+                "SELECT mtime_ns, subdirs, mp3_files FROM directories WHERE path = ?", (dir_path,)
+            ).fetchone()
+            if row is not None and row["mtime_ns"] == dir_mtime and not full:
+                # Listing unchanged: reuse it and only descend into the subdirectories.
+                self.dirs_skipped += 1
+                stack.extend(os.path.join(dir_path, name) for name in json.loads(row["subdirs"]))
+                continue
+
+            self.dirs_listed += 1
+            subdirs, mp3_files = [], []
+            try:
+                with os.scandir(dir_path) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.name)
+                        elif _is_mp3(entry.name) and entry.is_file():
+                            mp3_files.append(entry.name)
+            except OSError as e:
+                print(f"Warning: Could not list {dir_path}: {e}", file=sys.stderr)
+                continue
+
+            if row is not None:
+                for name in set(json.loads(row["mp3_files"])) - set(mp3_files):
+                    changes += self._remove_file(os.path.join(dir_path, name))
+                for name in set(json.loads(row["subdirs"])) - set(subdirs):
+                    self._remove_tree(os.path.join(dir_path, name))
+            for name in mp3_files:
+                changes += self._update_file(os.path.join(dir_path, name))
+
+            self.conn.execute(
+                "INSERT OR REPLACE INTO directories (path, mtime_ns, subdirs, mp3_files) VALUES (?, ?, ?, ?)",
+                (dir_path, dir_mtime, json.dumps(subdirs), json.dumps(mp3_files)),
+            )
+            stack.extend(os.path.join(dir_path, name) for name in subdirs)
+
+        self.conn.commit()
+        return changes
+
+    def all_files(self, root_dir):
+        """Returns every known MP3 below root_dir, sorted."""
+        root_dir = os.path.abspath(root_dir)
+        prefix = os.path.join(root_dir, "")
+        return [
+            row["path"]
+            for row in self.conn.execute(
+                "SELECT path FROM files WHERE substr(path, 1, ?) = ? ORDER BY path", (len(prefix), prefix)
+            )
+        ]
+
+    def changes_since(self, consumer, root_dir):
+        """
+        Returns (paths, last_seq): the existing MP3s below root_dir journaled
+        since the consumer's cursor, and the journal position to commit once
+        they have been processed.
+        """
+        root_dir = os.path.abspath(root_dir)
+        row = self.conn.execute(
+            "SELECT seq FROM cursors WHERE consumer = ? AND root = ?", (consumer, root_dir)
+        ).fetchone()
+        since = row["seq"] if row else 0
+        last_seq = self.conn.execute("SELECT COALESCE(MAX(seq), 0) FROM journal").fetchone()[0]
+
+        paths = set()
+        for entry in self.conn.execute(
+            "SELECT path, event FROM journal WHERE seq > ? AND seq <= ? ORDER BY seq", (since, last_seq)
+        ):
+            if not _under(entry["path"], root_dir):
+                continue
+            if entry["event"] == "deleted":
+                paths.discard(entry["path"])
+            else:
+                paths.add(entry["path"])
+        return sorted(path for path in paths if os.path.exists(path)), last_seq
+
+    def set_cursor(self, consumer, root_dir, seq):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO cursors (consumer, root, seq) VALUES (?, ?, ?)",
+            (consumer, os.path.abspath(root_dir), seq),
+        )
+        self.conn.commit()
+
+    def watch(self, root_dir, commit_interval=2.0):
+        """
+        Keeps the journal current by listening for filesystem events below
+        root_dir until interrupted. Uses watchdog, which is backed by inotify
+        on Linux and FSEvents on macOS.
+        """
+        try:
+            from watchdog.observers import Observer
+            from watchdog.events import FileSystemEventHandler
+        except ImportError:
+            print("Error: watcher mode requires the 'watchdog' package (pip install watchdog).")
+            sys.exit(1)
+
+        root_dir = os.path.abspath(root_dir)
+        events = queue.Queue()
+
+        class QueueHandler(FileSystemEventHandler):
+            # Events arrive on the observer thread; the SQLite connection is only
+            # used from this thread, so just hand them over.
+            def on_any_event(self, event):
+                events.put(event)
+
+        self.refresh(root_dir)
+        observer = Observer()
+        observer.schedule(QueueHandler(), root_dir, recursive=True)
+        observer.start()
+        print(f"Watching {root_dir} for changes (Ctrl+C to stop)...")
+
+        try:
+            while True:
+                try:
+                    event = events.get(timeout=commit_interval)
+                except queue.Empty:
+                    self.conn.commit()
+                    continue
+                self._apply_event(event)
+        except KeyboardInterrupt:
+            print("\nStopping watcher.")
+        finally:
+            observer.stop()
+            observer.join()
+            self.conn.commit()
+
+    def _apply_event(self, event):
+        paths = [event.src_path]
+        if getattr(event, "dest_path", None):
+            paths.append(event.dest_path)
+        for path in paths:
+            path = os.fsdecode(path)
+            if event.is_directory:
+                # Force the next refresh to re-list this directory and its parent.
+                self.conn.execute(
+                    "DELETE FROM directories WHERE path IN (?, ?)", (path, os.path.dirname(path))
+                )
+                if not os.path.exists(path):
+                    self._remove_tree(path)
+            elif _is_mp3(path):
+                if self._update_file(path):
+                    print(f"  journaled: {path}")
+                self.conn.execute("DELETE FROM directories WHERE path = ?", (os.path.dirname(path),))
+
+
+def add_walk_arguments(parser):
+    """Adds the shared --changed-only / --files-from options to a walker script."""
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument(
+        "--changed-only",
+        action="store_true",
+        help="Only process MP3s added or modified since this script's last --changed-only run "
+             "(uses the scan journal and skips unchanged directories).",
+    )
+    group.add_argument(
+        "--files-from",
+        metavar="LIST_FILE",
+        help="Only process the MP3 paths listed in LIST_FILE, one per line ('-' for stdin).",
+    )
+    parser.add_argument(
+        "--journal",
+        default=DEFAULT_JOURNAL_PATH,
+        metavar="DB_PATH",
+        help=f"Scan journal database used by --changed-only (default: {DEFAULT_JOURNAL_PATH}).",
+    )
+
+
+def read_file_list(list_file):
+    """Reads MP3 paths from a file (or stdin for '-'), one per line."""
+    handle = sys.stdin if list_file == "-" else open(list_file, encoding="utf-8")
+    try:
+        return [line.rstrip("\n") for line in handle if _is_mp3(line.rstrip("\n"))]
+    finally:
+        if handle is not sys.stdin:
+            handle.close()
+
+
+@contextmanager
+def selected_mp3_paths(root_dir, args, consumer):
+    """
+    Yields the explicit list of MP3 paths a walker should process, or None if
+    it should walk the whole tree as usual. With --changed-only the consumer's
+    journal cursor is only advanced once the block completes without error, so
+    an interrupted run sees the same changes again next time.
+    """
+    if getattr(args, "files_from", None):
+        yield read_file_list(args.files_from)
+        return
+    if not getattr(args, "changed_only", False):
+        yield None
+        return
+
+    with ScanJournal(args.journal) as journal:
+        journal.refresh(root_dir)
+        paths, last_seq = journal.changes_since(consumer, root_dir)
+        print(f"Scan journal: {len(paths)} changed MP3 file(s) since last run "
+              f"({journal.dirs_listed} directories listed, {journal.dirs_skipped} unchanged).",
+              file=sys.stderr)
+        yield paths
+        journal.set_cursor(consumer, root_dir, last_seq)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Maintain the incremental scan journal for a music library."
+    )
+    parser.add_argument("music_directory", help="The root directory of the music library.")
+    parser.add_argument("--db", default=DEFAULT_JOURNAL_PATH, help=f"Journal database path (default: {DEFAULT_JOURNAL_PATH})")
+    parser.add_argument("--full", action="store_true", help="Re-stat every file instead of skipping unchanged directories.")
+    parser.add_argument("--watch", action="store_true", help="After refreshing, keep the journal current by watching for changes.")
+    parser.add_argument("--list-changed", metavar="CONSUMER",
+                        help="Print the MP3s changed since CONSUMER's last run and advance its cursor.")
+    args = parser.parse_args()
+
+    music_root = os.path.abspath(args.music_directory)
+    if not os.path.isdir(music_root):
+        print(f"Error: Directory not found: {music_root}")
+        sys.exit(1)
+
+    with ScanJournal(args.db) as journal:
+        if args.watch:
+            journal.watch(music_root)
+            return
+
+        start = time.time()
+        changes = journal.refresh(music_root, full=args.full)
+
+        if args.list_changed:
+            paths, last_seq = journal.changes_since(args.list_changed, music_root)
+            for path in paths:
+                print(path)
+            journal.set_cursor(args.list_changed, music_root, last_seq)
+            return
+
+        print(f"\n--- Scan Summary ---")
+        print(f"Directories listed: {journal.dirs_listed}")
+        print(f"Directories unchanged (skipped): {journal.dirs_skipped}")
+        print(f"Files journaled as changed/deleted: {changes}")
+        print(f"Elapsed: {time.time() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,100 +1,60 @@
 import os
 import sys
-import subprocess
-
-# Determine the absolute path to the eyeD3 executable in the virtual environment
-# This makes the script runnable without activating the venv first.
-script_dir = os.path.dirname(os.path.abspath(__file__))
-eyed3_executable = os.path.join(script_dir, 'venv', 'bin', 'eyeD3')
+import argparse
+from album_art import load_cover, embed_cover_in_files, add_cover_arguments, format_size, DEFAULT_JPEG_QUALITY
+from bulk_tagger import add_jobs_argument
+from id3_writer import DEFAULT_TAG_PADDING
+from library_index import iter_mp3_files
+
+def process_directory(directory_path, art_path, padding=DEFAULT_TAG_PADDING, jobs=None,
+                      max_size=None, quality=DEFAULT_JPEG_QUALITY, report=False):
+    """
+    Replaces the embedded pictures of every MP3 file below a directory with
+    one front cover. The image is read, validated and turned into an APIC
+    frame once; files that already carry it are left untouched.
+
+    Args:
+        directory_path: Directory to process (recursively)
+        art_path: JPEG or PNG image to embed
+        padding: Tag padding to reserve when a file has to be rewritten
+        jobs: Number of files to process in parallel (defaults to the number of CPUs)
+        max_size: Resize the cover to at most this many pixels before embedding
+        quality: JPEG quality used when resizing
+        report: Only report what would change and the bytes it would save
+    """
+    if not os.path.exists(directory_path):
+        print(f"Error: Directory {directory_path} does not exist")
+        return
 
-def set_album_art(mp3_path, art_path):
-    if not os.path.exists(mp3_path):
-        print(f"Error: MP3 file {mp3_path} does not exist")
-        return False
-    
     if not os.path.exists(art_path):
         print(f"Error: Album art file {art_path} does not exist")
-        return False
+        return
 
     try:
-        # Step 1: Remove all existing images using eyeD3 CLI
-        print(f"Attempting to remove all images from: {mp3_path}")
-        remove_command = [eyed3_executable, "--remove-all-images", mp3_path]
-        remove_result = subprocess.run(remove_command, capture_output=True, text=True, check=False)
-
-        if remove_result.returncode == 0:
-            print(f"Successfully removed images from {mp3_path} (or no images to remove).")
-        else:
-            # eyeD3 might return non-0 if no images were found, which is not an error for our purpose.
-            # We'll print the output for debugging but proceed.
-            print(f"{eyed3_executable} --remove-all-images for {mp3_path} finished with code {remove_result.returncode}.")
-            if remove_result.stdout:
-                print(f"  stdout: {remove_result.stdout.strip()}")
-            if remove_result.stderr:
-                print(f"  stderr: {remove_result.stderr.strip()}")
-            # We can choose to continue even if removal wasn't 'successful' in eyeD3's eyes, 
-            # as long as adding the new image works.
-
-        # Step 2: Add the new album art using eyeD3 CLI
-        print(f"Attempting to add image {art_path} to: {mp3_path}")
-        # Ensure art_path is absolute for the command, or accessible from CWD
-        # If art_path is just 'cool.jpg', it assumes it's in the CWD where eyeD3 runs.
-        add_command = [eyed3_executable, "--add-image", f"{art_path}:FRONT_COVER", mp3_path]
-        add_result = subprocess.run(add_command, capture_output=True, text=True, check=False)
-
-        if add_result.returncode == 0:
-            print(f"Successfully set album art for {mp3_path} using {art_path}")
-            return True
-        else:
-            print(f"Error setting album art for {mp3_path} using {eyed3_executable} --add-image.")
-            print(f"  Return Code: {add_result.returncode}")
-            if add_result.stdout:
-                print(f"  stdout: {add_result.stdout.strip()}")
-            if add_result.stderr:
-                print(f"  stderr: {add_result.stderr.strip()}")
-            return False
-
-    except Exception as e:
-        print(f"An unexpected error occurred while processing {mp3_path}: {str(e)}")
-        return False
-
-def process_directory(directory_path, art_path):
-    if not os.path.exists(directory_path):
-        print(f"Error: Directory {directory_path} does not exist")
+        cover = load_cover(art_path, max_size, quality)
+    except ValueError as e:
+        print(f"Error: {e}")
         return
 
-    # Make art_path absolute if it's not already, to be safe for subprocess calls
-    # or ensure it's handled correctly relative to the script's execution CWD.
-    # For 'cool.jpg' in project root, and script run from project root, it's usually fine.
-    abs_art_path = os.path.abspath(art_path)
-    if not os.path.exists(abs_art_path):
-        print(f"Error: Album art file {abs_art_path} (absolute) does not exist. Original path: {art_path}")
-        # Fallback to using art_path as is, in case it's found relative to CWD by eyeD3
-        # but this is less robust.
-        abs_art_path = art_path 
-        print(f"Proceeding with art_path as: {abs_art_path}")
-
-    success_count = 0
-    fail_count = 0
-
-    for root, dirs, files in os.walk(directory_path):
-        for file in files:
-            if file.lower().endswith('.mp3'):
-                mp3_file_path = os.path.join(root, file)
-                if set_album_art(mp3_file_path, abs_art_path):
-                    success_count += 1
-                else:
-                    fail_count += 1
-    
-    print(f"\nProcessing complete:")
-    print(f"Successfully processed: {success_count} files")
-    print(f"Failed to process: {fail_count} files")
+    print(f"{'Checking' if report else 'Setting'} album art from {art_path} "
+          f"({format_size(len(cover['data']))}, {cover['mime_type']}) for MP3 files in {directory_path}")
+    return embed_cover_in_files(iter_mp3_files(directory_path), cover, padding, jobs, dry_run=report)
 
 if __name__ == "__main__":
-    if len(sys.argv) != 3:
-        print("Usage: python set_album_art.py <directory_path> <album_art_path>")
+    parser = argparse.ArgumentParser(description="Set the front cover of all MP3 files in a directory (recursively).")
+    parser.add_argument("directory_path", help="Directory containing the MP3 files.")
+    parser.add_argument("album_art_path", help="JPEG or PNG image to embed.")
+    parser.add_argument(
+        "--padding",
+        type=int,
+        default=DEFAULT_TAG_PADDING,
+        help=f"Bytes of tag padding to reserve when a file has to be rewritten, so later edits fit in place (default: {DEFAULT_TAG_PADDING}).",
+    )
+    add_cover_arguments(parser)
+    add_jobs_argument(parser)
+    args = parser.parse_args()
+
+    counts = process_directory(args.directory_path, args.album_art_path, args.padding, args.jobs,
+                               args.max_size, args.quality, args.report)
+    if counts is None or counts["error"]:
         sys.exit(1)
-    
-    directory_to_process = sys.argv[1]
-    album_art_image_path = sys.argv[2]
-    process_directory(directory_to_process, album_art_image_path) 
\ No newline at end of file
@@ -1,11 +1,15 @@
 import argparse
 import pathlib
-import eyed3
-import os
+from album_art import load_cover, embed_cover_in_files, add_cover_arguments, DEFAULT_JPEG_QUALITY
+from bulk_tagger import add_jobs_argument
 
-def set_album_art(directory_path: str, image_path: str):
+def set_album_art(directory_path: str, image_path: str, jobs: int = None, max_size: int = None,
+                  quality: int = DEFAULT_JPEG_QUALITY, report: bool = False):
     """
     Sets the album art for all MP3 files in the specified directory.
+    Files that already have this cover are not rewritten. With max_size the
+    image is resized and re-encoded as a JPEG first; with report nothing is
+    written and only the changes and byte savings are reported.
     """
     # Convert paths to Path objects
     directory = pathlib.Path(directory_path)
@@ -21,53 +25,23 @@ def set_album_art(directory_path: str, image_path: str):
         print(f"Error: Image file '{image_file}' does not exist or is not a file")
         return
     
-    # Read the image data
-    with open(image_file, 'rb') as img_file:
-        image_data = img_file.read()
-    
-    # Get all MP3 files in the directory
-    mp3_files = list(directory.glob('*.mp3'))
-    total_files = len(mp3_files)
-    updated_files = 0
+    # Read and validate the image once for all files
+    try:
+        cover = load_cover(image_file, max_size, quality)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return
     
     print(f"Scanning for MP3 files in '{directory}' to set album art from '{image_file}'...")
-    
-    # Process each MP3 file
-    for mp3_file in mp3_files:
-        try:
-            # Load the audio file
-            audiofile = eyed3.load(mp3_file)
-            if audiofile is None:
-                print(f"Error: Could not load {mp3_file.name}")
-                continue
-            
-            # Initialize tag if it doesn't exist
-            if audiofile.tag is None:
-                audiofile.initTag()
-            
-            # Remove existing album art
-            while len(audiofile.tag.images) > 0:
-                audiofile.tag.images.remove(audiofile.tag.images[0].description)
-            
-            # Add new album art
-            audiofile.tag.images.set(3, image_data, 'image/jpeg')
-            
-            # Save changes
-            audiofile.tag.save()
-            updated_files += 1
-            
-        except Exception as e:
-            print(f"Error processing file {mp3_file.name}: {str(e)}")
-    
-    # Print summary
-    print("\n--- Summary ---")
-    print(f"Total MP3 files found: {total_files}")
-    print(f"MP3 files updated with album art: {updated_files}")
+    mp3_files = [str(mp3_file) for mp3_file in directory.glob('*.mp3')]
+    return embed_cover_in_files(mp3_files, cover, jobs=jobs, dry_run=report)
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='Set album art for MP3 files in a directory')
     parser.add_argument('directory', help='Directory containing MP3 files')
     parser.add_argument('image', help='Path to the album art image file')
+    add_cover_arguments(parser)
+    add_jobs_argument(parser)
     
     args = parser.parse_args()
-    set_album_art(args.directory, args.image) 
\ No newline at end of file
+    set_album_art(args.directory, args.image, args.jobs, args.max_size, args.quality, args.report)
@@ -1,14 +1,19 @@
 import argparse
 import pathlib
 import eyed3
+from bulk_tagger import update_tags, add_jobs_argument
+from id3_writer import DEFAULT_TAG_PADDING
 
-def set_artist_for_mp3s(directory_path: str, artist_name: str):
+def set_artist_for_mp3s(directory_path: str, artist_name: str, padding: int = DEFAULT_TAG_PADDING, jobs: int = None):
     """
     Scans a directory for MP3 files and sets their artist metadata.
+    Files that already have this artist are not rewritten.
 
     Args:
         directory_path: The path to the directory to scan.
         artist_name: The name to set as the artist for the MP3 files.
+        padding: Tag padding to reserve when a file has to be rewritten.
+        jobs: Number of files to update in parallel (defaults to the number of CPUs).
     """
     source_dir = pathlib.Path(directory_path)
     if not source_dir.is_dir():
@@ -16,34 +21,8 @@ def set_artist_for_mp3s(directory_path: str, artist_name: str):
         return
 
     print(f"Scanning for MP3 files in '{source_dir.resolve()}' to set artist to '{artist_name}'...")
-    mp3_files_found = 0
-    mp3_files_updated = 0
-
-    for file_path in source_dir.rglob("*.mp3"):
-        mp3_files_found += 1
-        try:
-            audiofile = eyed3.load(file_path)
-            if audiofile is None:
-                print(f"Warning: Could not load MP3 file: {file_path}")
-                continue
-            
-            if audiofile.tag is None:
-                audiofile.initTag(version=eyed3.id3.ID3_V2_3)
-                if audiofile.tag is None:
-                    print(f"Warning: Could not initialize or load tag for: {file_path}")
-                    continue
-            
-            audiofile.tag.artist = artist_name
-            audiofile.tag.save(version=eyed3.id3.ID3_V2_3, encoding='utf-8')
-            print(f"Updated artist for '{file_path.name}' to '{artist_name}'")
-            mp3_files_updated += 1
-
-        except Exception as e:
-            print(f"Error processing file {file_path.name}: {e}")
-
-    print(f"\n--- Summary ---")
-    print(f"Total MP3 files found: {mp3_files_found}")
-    print(f"MP3 files updated with artist '{artist_name}': {mp3_files_updated}")
+    items = ((str(file_path), {"artist": artist_name}) for file_path in source_dir.rglob("*.mp3"))
+    return update_tags(items, version=eyed3.id3.ID3_V2_3, encoding='utf-8', padding=padding, jobs=jobs)
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(
@@ -59,6 +38,13 @@ if __name__ == "__main__":
         type=str,
         help="The artist name to set for the MP3 files.",
     )
+    parser.add_argument(
+        "--padding",
+        type=int,
+        default=DEFAULT_TAG_PADDING,
+        help=f"Bytes of tag padding to reserve when a file has to be rewritten, so later edits fit in place (default: {DEFAULT_TAG_PADDING}).",
+    )
+    add_jobs_argument(parser)
     args = parser.parse_args()
 
-    set_artist_for_mp3s(args.directory, args.artist_name) 
\ No newline at end of file
+    set_artist_for_mp3s(args.directory, args.artist_name, args.padding, args.jobs)
@@ -1,14 +1,19 @@
 import argparse
 import pathlib
 import eyed3
+from bulk_tagger import update_tags, add_jobs_argument
+from id3_writer import DEFAULT_TAG_PADDING
 
-def set_titles_from_filenames(directory_path: str):
+def set_titles_from_filenames(directory_path: str, padding: int = DEFAULT_TAG_PADDING, jobs: int = None):
     """
     Scans a directory for MP3 files and sets their title metadata
-    to their filename (without the .mp3 extension).
+    to their filename (without the .mp3 extension). Files whose title
+    already matches are not rewritten.
 
     Args:
         directory_path: The path to the directory to scan.
+        padding: Tag padding to reserve when a file has to be rewritten.
+        jobs: Number of files to update in parallel (defaults to the number of CPUs).
     """
     source_dir = pathlib.Path(directory_path)
     if not source_dir.is_dir():
@@ -16,38 +21,9 @@ def set_titles_from_filenames(directory_path: str):
         return
 
     print(f"Scanning for MP3 files in '{source_dir.resolve()}'...")
-    mp3_files_found = 0
-    mp3_files_updated = 0
-
-    for file_path in source_dir.rglob("*.mp3"):
-        mp3_files_found += 1
-        try:
-            audiofile = eyed3.load(file_path)
-            if audiofile is None or audiofile.tag is None:
-                # Attempt to initialize a tag if it doesn't exist
-                if audiofile is None: # Should not happen if rglob found it
-                    print(f"Warning: Could not load MP3 file: {file_path}")
-                    continue
-                audiofile.initTag(version=eyed3.id3.ID3_V2_3) # Or ID3_V2_4
-                if audiofile.tag is None: # If still None, then skip
-                    print(f"Warning: Could not initialize or load tag for: {file_path}")
-                    continue
-            
-            # Get filename without extension
-            new_title = file_path.stem
-            
-            # Set the title
-            audiofile.tag.title = new_title
-            audiofile.tag.save(version=eyed3.id3.ID3_V2_3, encoding='utf-8') # Explicitly save as v2.3
-            print(f"Updated title for '{file_path.name}' to '{new_title}'")
-            mp3_files_updated += 1
-
-        except Exception as e:
-            print(f"Error processing file {file_path.name}: {e}")
-
-    print(f"\n--- Summary ---")
-    print(f"Total MP3 files found: {mp3_files_found}")
-    print(f"MP3 files updated: {mp3_files_updated}")
+    # Title is the filename without extension
+    items = ((str(file_path), {"title": file_path.stem}) for file_path in source_dir.rglob("*.mp3"))
+    return update_tags(items, version=eyed3.id3.ID3_V2_3, encoding='utf-8', padding=padding, jobs=jobs) # Explicitly save as v2.3
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(
@@ -58,6 +34,13 @@ if __name__ == "__main__":
         type=str,
         help="The directory containing MP3 files to process.",
     )
+    parser.add_argument(
+        "--padding",
+        type=int,
+        default=DEFAULT_TAG_PADDING,
+        help=f"Bytes of tag padding to reserve when a file has to be rewritten, so later edits fit in place (default: {DEFAULT_TAG_PADDING}).",
+    )
+    add_jobs_argument(parser)
     args = parser.parse_args()
 
-    set_titles_from_filenames(args.directory) 
\ No newline at end of file
+    set_titles_from_filenames(args.directory, args.padding, args.jobs)
@@ -2,13 +2,14 @@
 
 import os
 import sys
-import eyed3
-from eyed3.id3 import Tag
+import argparse
+from bulk_tagger import update_tags, add_jobs_argument
 
-def set_track_numbers(directory):
+def set_track_numbers(directory, jobs=None):
     """
     Set track numbers and total tracks for all MP3 files in the directory.
     Track numbers are extracted from the first two digits of the filename.
+    Files that already have the right track number and total are not rewritten.
     """
     # Get all MP3 files and sort them
     mp3_files = [f for f in os.listdir(directory) if f.lower().endswith('.mp3')]
@@ -21,48 +22,30 @@ def set_track_numbers(directory):
     total_tracks = len(mp3_files)
     print(f"Found {total_tracks} MP3 files")
     
-    # Process each file
+    items = []
     for filename in mp3_files:
-        filepath = os.path.join(directory, filename)
-        
         # Extract track number from filename (first two digits)
         try:
             track_num = int(filename[:2])
         except ValueError:
             print(f"Warning: Could not extract track number from {filename}, skipping...")
             continue
-        
-        # Load the audio file
-        audiofile = eyed3.load(filepath)
-        if not audiofile:
-            print(f"Warning: Could not load {filename}, skipping...")
-            continue
-        
-        # Initialize tag if it doesn't exist
-        if not audiofile.tag:
-            audiofile.tag = Tag()
-        
-        # Set track number and total tracks
-        audiofile.tag.track_num = (track_num, total_tracks)
-        
-        # Save changes
-        try:
-            audiofile.tag.save()
-            print(f"Updated track number for {filename}: {track_num}/{total_tracks}")
-        except Exception as e:
-            print(f"Error saving {filename}: {str(e)}")
+        items.append((os.path.join(directory, filename), {"track_num": (track_num, total_tracks)}))
+
+    return update_tags(items, jobs=jobs)
 
 def main():
-    if len(sys.argv) != 2:
-        print("Usage: python set_track_numbers.py <directory>")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(description="Set track numbers from the first two digits of each MP3 filename.")
+    parser.add_argument("directory", help="Directory containing the MP3 files of one album.")
+    add_jobs_argument(parser)
+    args = parser.parse_args()
     
-    directory = sys.argv[1]
+    directory = args.directory
     if not os.path.isdir(directory):
         print(f"Error: {directory} is not a valid directory")
         sys.exit(1)
     
-    set_track_numbers(directory)
+    set_track_numbers(directory, args.jobs)
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
@@ -1,8 +1,262 @@
 import argparse
+import csv
+import io
+import json
+import sys
 import eyed3
+from contextlib import redirect_stdout
+from functools import partial
+from multiprocessing import Pool, cpu_count
 from pathlib import Path
+from bulk_tagger import format_value, format_version
+from id3_writer import save_tag, DEFAULT_TAG_PADDING
 
-def tag_mp3(file_path: str, artist: str = None, album: str = None, title: str = None, track_num_val: int = None, track_total_val: int = None):
+# Columns (CSV) or keys (JSON lines) a manifest row may set besides "path".
+MANIFEST_FIELDS = ("artist", "album", "title", "track", "track_total")
+
+
+def apply_tag_fields(tag, fields):
+    """
+    Sets the given fields on an eyed3 tag. Fields that are None are left alone;
+    "track" and "track_total" are merged with the current track number.
+
+    Args:
+        tag: eyed3.id3.Tag to modify
+        fields: Dict with any of MANIFEST_FIELDS
+
+    Returns:
+        (changes, warnings): changes is a list of (field, old, new) for the
+        values that actually changed ("track" values are (num, total) tuples).
+    """
+    changes, warnings = [], []
+    for field in ("artist", "album", "title"):
+        value = fields.get(field)
+        if value is not None and getattr(tag, field) != value:
+            changes.append((field, getattr(tag, field), value))
+            setattr(tag, field, value)
+
+    track_num_val, track_total_val = fields.get("track"), fields.get("track_total")
+    if track_num_val is not None or track_total_val is not None:
+        current = tuple(tag.track_num) if tag.track_num else (None, None)
+        current_track_num, current_track_total = current
+
+        new_track_num = track_num_val if track_num_val is not None else current_track_num
+        new_track_total = track_total_val if track_total_val is not None else current_track_total
+
+        # We need at least a track number to set it; (None, total) is problematic.
+        if new_track_num is None:
+            warnings.append(f"Track total provided ({track_total_val}) but no track number to associate it with. "
+                            f"Not setting track info.")
+        elif (new_track_num, new_track_total) != current:
+            changes.append(("track", current, (new_track_num, new_track_total)))
+            tag.track_num = (new_track_num, new_track_total)
+
+    return changes, warnings
+
+
+def _parse_manifest_row(record, base_dir):
+    path = record.get("path")
+    if not path:
+        raise ValueError("missing path")
+    fields = {}
+    for field in MANIFEST_FIELDS:
+        value = record.get(field)
+        # Empty cells mean "leave this field alone".
+        if value is None or (isinstance(value, str) and value == ""):
+            continue
+        if field in ("track", "track_total"):
+            value = int(value)
+        elif not isinstance(value, str):
+            value = str(value)
+        fields[field] = value
+    unknown = [str(key) for key in record if key not in MANIFEST_FIELDS and key != "path"]
+    if unknown:
+        raise ValueError(f"unknown field(s): {', '.join(unknown)}")
+    path = Path(path).expanduser()
+    return {"path": str(path if path.is_absolute() else base_dir / path), "fields": fields}
+
+
+def read_manifest(manifest_path):
+    """
+    Reads a tagging manifest: a CSV file with a header row, or a JSON lines
+    file (.jsonl/.json) with one object per line. Each row has a "path"
+    (relative paths are relative to the manifest) and any of MANIFEST_FIELDS.
+
+    Returns:
+        A list of dicts with "row" (line number in the manifest), "path" and
+        "fields", or "error" instead of "path"/"fields" for unusable rows.
+    """
+    manifest_path = Path(manifest_path)
+    base_dir = manifest_path.resolve().parent
+    rows = []
+    with open(manifest_path, "r", encoding="utf-8", newline="") as f:
+        if manifest_path.suffix.lower() in (".jsonl", ".json"):
+            records = []
+            for line_no, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    records.append((line_no, json.loads(line)))
+                except json.JSONDecodeError as e:
+                    records.append((line_no, e))
+        else:
+            reader = csv.DictReader(f)
+            # The header is line 1; multi-line cells are not expected.
+            records = [(reader.line_num, record) for record in reader]
+
+        for line_no, record in records:
+            try:
+                if isinstance(record, Exception):
+                    raise ValueError(f"invalid JSON: {record}")
+                if not isinstance(record, dict):
+                    raise ValueError("row is not an object")
+                rows.append({"row": line_no, **_parse_manifest_row(record, base_dir)})
+            except ValueError as e:
+                rows.append({"row": line_no, "error": str(e)})
+    return rows
+
+
+def _tag_values(tag):
+    return {
+        "artist": tag.artist, "album": tag.album, "title": tag.title,
+        "track": tuple(tag.track_num) if tag.track_num else (None, None),
+    }
+
+
+def _version_change(tag):
+    # ("ID3 version", old, new) if saving will convert the tag to v2.4, else None.
+    if tuple(tag.version[:2]) != tuple(eyed3.id3.ID3_V2_4[:2]):
+        return ("ID3 version", format_version(tag.version), format_version(eyed3.id3.ID3_V2_4))
+    return None
+
+
+def edit_file(job, dry_run=False, padding=DEFAULT_TAG_PADDING):
+    """
+    Worker: applies all manifest rows for one file, in order, and saves the
+    tag once if the result differs from what is in the file. With dry_run the
+    changes are computed but nothing is written.
+
+    Each change is credited to the last row that set the field; a row whose
+    fields were all set again by later rows is "superseded".
+
+    Args:
+        job: (path, rows) where rows are read_manifest rows for that path
+
+    Returns:
+        A dict with "path", "saved" (None, "in-place" or "rewritten"), "rows"
+        (dicts with "row", "status", "changes" and "message") and "output".
+    """
+    path, rows = job
+    results = [{"row": row["row"], "status": "unchanged", "changes": [], "message": None} for row in rows]
+    saved = None
+
+    def fail(message):
+        for result in results:
+            result["status"], result["message"] = "error", message
+
+    output = io.StringIO()
+    with redirect_stdout(output):
+        try:
+            if not Path(path).is_file():
+                fail("not a valid file")
+            elif Path(path).suffix.lower() != ".mp3":
+                fail("not an MP3 file")
+            else:
+                audiofile = eyed3.load(path)
+                if audiofile is None:
+                    fail("could not load as an MP3 file")
+                else:
+                    if audiofile.tag is None:
+                        audiofile.initTag(version=eyed3.id3.ID3_V2_4)
+                    original = _tag_values(audiofile.tag)
+                    last_setter = {}
+                    for index, (row, result) in enumerate(zip(rows, results)):
+                        _changes, warnings = apply_tag_fields(audiofile.tag, row["fields"])
+                        result["message"] = "; ".join(warnings) or None
+                        for field in row["fields"]:
+                            last_setter["track" if field == "track_total" else field] = index
+                    final = _tag_values(audiofile.tag)
+
+                    for index, (row, result) in enumerate(zip(rows, results)):
+                        fields = {"track" if field == "track_total" else field for field in row["fields"]}
+                        result["changes"] = [(field, original[field], final[field]) for field in final
+                                             if last_setter.get(field) == index and original[field] != final[field]]
+                        if result["changes"]:
+                            result["status"] = "would change" if dry_run else "updated"
+                        elif fields and all(last_setter[field] > index for field in fields):
+                            result["status"] = "superseded"
+
+                    # Every save converts the tag to v2.4, like a single-file
+                    # run; credit that to the file's last row.
+                    version_change = _version_change(audiofile.tag)
+                    if version_change:
+                        results[-1]["changes"].append(version_change)
+                        results[-1]["status"] = "would change" if dry_run else "updated"
+
+                    if not dry_run and (final != original or version_change):
+                        saved = save_tag(audiofile.tag, version=eyed3.id3.ID3_V2_4, padding=padding)
+        except Exception as e:
+            saved = None
+            fail(str(e))
+
+    return {"path": path, "saved": saved, "rows": results, "output": output.getvalue()}
+
+
+def run_manifest(manifest_path, dry_run=False, jobs=None, padding=DEFAULT_TAG_PADDING):
+    """
+    Applies a tagging manifest (see read_manifest). Rows are grouped by file,
+    in the order files first appear, so each file is loaded and written once
+    even if several rows edit it (later rows win), and not at all if the edits
+    leave it as it was. Files are edited in a
+    process pool and a result is reported for every row.
+
+    Args:
+        manifest_path: CSV or JSON lines manifest
+        dry_run: Only show what would change
+        jobs: Number of worker processes (defaults to the number of CPUs)
+        padding: Tag padding to reserve when a file has to be rewritten
+
+    Returns:
+        A dict of row counts per status.
+    """
+    rows = read_manifest(manifest_path)
+    counts = {"updated": 0, "would change": 0, "unchanged": 0, "superseded": 0, "error": 0}
+
+    by_path = {}
+    for row in rows:
+        if "error" in row:
+            counts["error"] += 1
+            print(f"[row {row['row']}] error: {row['error']}")
+        else:
+            by_path.setdefault(row["path"], []).append(row)
+
+    print(f"{len(rows)} manifest row(s) for {len(by_path)} file(s)"
+          f"{' (dry run, nothing will be written)' if dry_run else ''}.")
+
+    worker = partial(edit_file, dry_run=dry_run, padding=padding)
+    with Pool(processes=jobs or cpu_count()) as pool:
+        for result in pool.imap(worker, by_path.items(), chunksize=4):
+            print(result["output"], end="")
+            for row in result["rows"]:
+                counts[row["status"]] += 1
+                line = f"[row {row['row']}] {result['path']}: {row['status']}"
+                if row["message"]:
+                    line += f" ({row['message']})"
+                print(line)
+                for field, old, new in row["changes"]:
+                    print(f"  {field}: {format_value(old)} -> {format_value(new)}")
+            if result["saved"]:
+                print(f"  saved ({result['saved']})")
+
+    print(f"\n--- Manifest Summary ---")
+    for status, count in counts.items():
+        if status != ("updated" if dry_run else "would change"):
+            print(f"{status.capitalize()}: {count}")
+    return counts
+
+
+def tag_mp3(file_path: str, artist: str = None, album: str = None, title: str = None, track_num_val: int = None, track_total_val: int = None,
+            padding: int = DEFAULT_TAG_PADDING):
     """
     Sets metadata for a single MP3 file.
 
@@ -13,6 +267,7 @@ def tag_mp3(file_path: str, artist: str = None, album: str = None, title: str =
         title: Title to set (optional)
         track_num_val: Track number to set (optional)
         track_total_val: Total number of tracks to set (optional)
+        padding: Tag padding to reserve when the file has to be rewritten
     """
     file_path = Path(file_path)
     if not file_path.is_file():
@@ -38,45 +293,26 @@ def tag_mp3(file_path: str, artist: str = None, album: str = None, title: str =
                 return
 
 
-        # Set metadata if provided
-        if artist is not None:
-            audiofile.tag.artist = artist
-            print(f"Set artist to: {artist}")
-        
-        if album is not None:
-            audiofile.tag.album = album
-            print(f"Set album to: {album}")
-        
-        if title is not None:
-            audiofile.tag.title = title
-            print(f"Set title to: {title}")
-
-        if track_num_val is not None or track_total_val is not None:
-            current_track_num, current_track_total = audiofile.tag.track_num if audiofile.tag.track_num else (None, None)
-            
-            new_track_num = track_num_val if track_num_val is not None else current_track_num
-            new_track_total = track_total_val if track_total_val is not None else current_track_total
-
-            if new_track_num is not None: # We need at least a track number to set it
-                audiofile.tag.track_num = (new_track_num, new_track_total)
-                print(f"Set track to: {new_track_num}{f'/{new_track_total}' if new_track_total is not None else ''}")
-            elif track_total_val is not None: # Only total is provided, but no current track number exists - less ideal
-                 # This case might be ambiguous if no track number is set.
-                 # For now, if only total is given and no current track number, we won't set it
-                 # to avoid (None, total) which can be problematic.
-                 # Or, we could decide to default track_num to 0 or 1 if new_track_num is None.
-                 # For simplicity, we'll require a track_num if setting track_num field.
-                 # However, if track_num_val was None, but track_total_val was provided, AND a current_track_num exists:
-                 if current_track_num is not None:
-                    audiofile.tag.track_num = (current_track_num, new_track_total)
-                    print(f"Updated track total for track {current_track_num} to: {new_track_total}")
-                 else:
-                    print(f"Warning: Track total provided ({track_total_val}) but no track number to associate it with. Not setting track info.")
+        changes, warnings = apply_tag_fields(audiofile.tag, {
+            "artist": artist, "album": album, "title": title,
+            "track": track_num_val, "track_total": track_total_val,
+        })
+        version_change = _version_change(audiofile.tag)
+        if version_change:
+            changes.append(version_change)
+        for warning in warnings:
+            print(f"Warning: {warning}")
+        for field, _old, new in changes:
+            print(f"Set {field} to: {new if isinstance(new, str) else format_value(new)}")
 
+        if not changes:
+            # Leave the file (and its mtime) alone when nothing changes.
+            print(f"\nMetadata already up to date, unchanged: {file_path.name}")
+            return
 
         # Save changes
         # Ensure saving with a version that supports the tags well, e.g. v2.4
-        audiofile.tag.save(version=eyed3.id3.ID3_V2_4)
+        save_tag(audiofile.tag, version=eyed3.id3.ID3_V2_4, padding=padding)
         print(f"\nSuccessfully updated metadata for: {file_path.name}")
 
     except Exception as e:
@@ -89,7 +325,8 @@ if __name__ == "__main__":
     parser.add_argument(
         "file_path",
         type=str,
-        help="Path to the MP3 file to tag."
+        nargs="?",
+        help="Path to the MP3 file to tag (not used with --manifest)."
     )
     parser.add_argument(
         "--artist",
@@ -116,6 +353,37 @@ if __name__ == "__main__":
         type=int,
         help="Total number of tracks in the album to set."
     )
+    parser.add_argument(
+        "--padding",
+        type=int,
+        default=DEFAULT_TAG_PADDING,
+        help=f"Bytes of tag padding to reserve when the file has to be rewritten, so later edits fit in place (default: {DEFAULT_TAG_PADDING}).",
+    )
+    parser.add_argument(
+        "--manifest",
+        type=str,
+        help=f"CSV or JSON lines file of edits to apply instead of a single file: a path column/key and any of {', '.join(MANIFEST_FIELDS)}.",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="With --manifest, only show what would change.",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=None,
+        help="With --manifest, number of files to edit in parallel. Defaults to the number of CPUs.",
+    )
     args = parser.parse_args()
 
-    tag_mp3(args.file_path, args.artist, args.album, args.title, args.track, args.track_total) 
\ No newline at end of file
+    if args.manifest:
+        if args.file_path or any(v is not None for v in (args.artist, args.album, args.title, args.track, args.track_total)):
+            parser.error("--manifest cannot be combined with a file path or field options")
+        counts = run_manifest(args.manifest, args.dry_run, args.jobs, args.padding)
+        sys.exit(1 if counts["error"] else 0)
+    if not args.file_path:
+        parser.error("a file path or --manifest is required")
+
+    tag_mp3(args.file_path, args.artist, args.album, args.title, args.track, args.track_total, args.padding) 
\ No newline at end of file
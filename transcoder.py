@@ -0,0 +1,564 @@
+#!/usr/bin/env python3
+
+import os
+import io
+import sys
+import json
+import time
+import queue
+import shutil
+import wave
+import argparse
+import tempfile
+import subprocess
+from contextlib import redirect_stdout
+from functools import partial
+from multiprocessing import Pool, cpu_count
+from pathlib import Path
+from tag_mp3 import read_manifest
+
+DEFAULT_BITRATE = '192k'
+
+# Every output directory run records what it encoded here, so re-runs can skip
+# outputs that are newer than their input and were made with the same profile.
+TRANSCODE_LOG_FILENAME = '.transcode_log.jsonl'
+
+# PCM frames read from a WAV and piped to the encoder at a time, so memory
+# use stays the same however long the recording is.
+CHUNK_FRAMES = 64 * 1024
+
+# ffmpeg raw PCM formats by WAV sample width in bytes (8-bit WAV is unsigned).
+PCM_FORMATS = {1: 'u8', 2: 's16le', 3: 's24le', 4: 's32le'}
+
+# Tracker modules are rendered by openmpt123 and piped into the encoder as
+# 48 kHz stereo float, spelled out on both sides of the pipe.
+MODULE_EXTENSIONS = {'.umx', '.mod', '.xm', '.it', '.s3m', '.mptm'}
+RENDER_SAMPLE_RATE = 48000
+RENDER_CHANNELS = 2
+
+# Inputs ffmpeg decodes itself (their tags are carried over by ffmpeg).
+FFMPEG_EXTENSIONS = {'.flac', '.aif', '.aiff', '.ogg', '.m4a', '.mp3'}
+
+# What the command line may convert. .mp3 inputs are left out: their output
+# would be the input itself, re-encoded lossily in place on every run. Only
+# rebuild_tags.py --reencode does that, deliberately.
+CONVERTIBLE_EXTENSIONS = {'.wav'} | MODULE_EXTENSIONS | (FFMPEG_EXTENSIONS - {'.mp3'})
+
+# What the command line converts by default.
+DEFAULT_INPUT_EXTENSIONS = {'.wav', '.flac'} | MODULE_EXTENSIONS
+
+# Tags that --tag templates may set, as ffmpeg metadata keys (the MP3 muxer
+# writes them as TIT2, TPE1, TALB, TPE2, TRCK, TPOS, TDRC/TYER and TCON).
+TEMPLATE_FIELDS = ('title', 'artist', 'album', 'album_artist', 'track', 'disc', 'date', 'genre')
+
+# ID3 version for tags written at encode time; the set_* scripts save v2.3 too.
+TAG_ID3V2_VERSION = 3
+
+
+def make_profile(bitrate=None, quality=None):
+    """
+    Returns an MP3 output profile: VBR at a LAME quality (0 best - 9 worst) if
+    quality is given, otherwise CBR at bitrate (default: 192k).
+    """
+    if quality is not None:
+        return {'mode': 'vbr', 'quality': int(quality)}
+    return {'mode': 'cbr', 'bitrate': bitrate or DEFAULT_BITRATE}
+
+
+def profile_key(profile):
+    """Short string identifying a profile in the transcode log, e.g. "cbr-192k" or "vbr-q2"."""
+    if profile['mode'] == 'vbr':
+        return f"vbr-q{profile['quality']}"
+    return f"cbr-{profile['bitrate']}"
+
+
+def encoder_args(profile):
+    """ffmpeg output arguments for a profile."""
+    if profile['mode'] == 'vbr':
+        return ['-codec:a', 'libmp3lame', '-qscale:a', str(profile['quality'])]
+    return ['-codec:a', 'libmp3lame', '-b:a', profile['bitrate']]
+
+
+def add_profile_arguments(parser, default_profile=None):
+    """
+    Adds the -b/--bitrate and -q/--quality profile options, -j/--jobs and
+    --force to an argparse parser. default_profile (default: CBR 192k) is
+    used when neither -b nor -q is given.
+    """
+    default_profile = default_profile or make_profile()
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument('-b', '--bitrate', default=None, help="Constant MP3 bitrate, e.g. 192k.")
+    group.add_argument('-q', '--quality', type=int, default=None,
+                       help="Variable bitrate at this LAME quality instead (0 = best, 9 = smallest).")
+    parser.add_argument('-j', '--jobs', type=int, default=None,
+                        help="Number of files to convert in parallel. Defaults to the number of CPUs.")
+    parser.add_argument('--force', action='store_true',
+                        help="Convert again even if the output is newer than the input and used the same profile and tags.")
+    parser.set_defaults(default_profile=default_profile)
+    parser.epilog = f"Default profile: {profile_key(default_profile)}."
+
+
+def profile_from_args(args):
+    """Returns the profile selected with the add_profile_arguments options."""
+    if args.bitrate is None and args.quality is None:
+        return args.default_profile
+    return make_profile(args.bitrate, args.quality)
+
+
+def _read_stderr(stderr_file):
+    stderr_file.seek(0)
+    return stderr_file.read().decode('utf-8', errors='replace').strip()
+
+
+def _run_encoder(command, wav=None, source=None):
+    """
+    Runs an ffmpeg command. Its stdin is fed either with the frames of an open
+    wave reader, in CHUNK_FRAMES pieces, or from another process's stdout.
+
+    Raises:
+        RuntimeError: If ffmpeg fails (with its stderr).
+    """
+    # stderr goes to a file so a chatty ffmpeg can never block on a full pipe
+    # while its stdin is being written.
+    with tempfile.TemporaryFile() as stderr:
+        stdin = subprocess.PIPE if wav else (source.stdout if source else subprocess.DEVNULL)
+        try:
+            process = subprocess.Popen(command, stdin=stdin, stderr=stderr)
+        finally:
+            if source:
+                # Only ffmpeg reads the pipe; if it exits early the source gets SIGPIPE.
+                source.stdout.close()
+        if wav:
+            try:
+                while True:
+                    frames = wav.readframes(CHUNK_FRAMES)
+                    if not frames:
+                        break
+                    process.stdin.write(frames)
+            except BrokenPipeError:
+                pass  # ffmpeg gave up; its exit code and stderr say why
+            finally:
+                process.stdin.close()
+        returncode = process.wait()
+        if returncode != 0:
+            raise RuntimeError(f"ffmpeg exited with code {returncode}: {_read_stderr(stderr)}")
+
+
+def _encode_wav(input_path, output_args):
+    try:
+        wav = wave.open(input_path, 'rb')
+    except (wave.Error, EOFError):
+        # Variants the wave module cannot read (e.g. floating point) are
+        # handed to ffmpeg as a file, which streams them just the same.
+        _encode_file(input_path, output_args)
+        return
+    with wav:
+        pcm_format = PCM_FORMATS.get(wav.getsampwidth())
+        if pcm_format is None:
+            raise ValueError(f"Unsupported sample width: {wav.getsampwidth()} bytes")
+        command = ['ffmpeg', '-v', 'error', '-y',
+                   '-f', pcm_format, '-ar', str(wav.getframerate()), '-ac', str(wav.getnchannels()),
+                   '-i', 'pipe:0'] + output_args
+        _run_encoder(command, wav=wav)
+
+
+def _encode_module(input_path, output_args):
+    openmpt_cmd = ['openmpt123', '--quiet', '--stdout', '--float',
+                   '--samplerate', str(RENDER_SAMPLE_RATE), '--channels', str(RENDER_CHANNELS), input_path]
+    ffmpeg_cmd = ['ffmpeg', '-v', 'error', '-y',
+                  '-f', 'f32le', '-ar', str(RENDER_SAMPLE_RATE), '-ac', str(RENDER_CHANNELS),
+                  '-i', 'pipe:0'] + output_args
+    with tempfile.TemporaryFile() as openmpt_err:
+        openmpt = subprocess.Popen(openmpt_cmd, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=openmpt_err)
+        try:
+            _run_encoder(ffmpeg_cmd, source=openmpt)
+        except BaseException:
+            openmpt.kill()
+            raise
+        finally:
+            openmpt_code = openmpt.wait()
+        if openmpt_code != 0:
+            raise RuntimeError(f"openmpt123 exited with code {openmpt_code}: {_read_stderr(openmpt_err)}")
+
+
+def _encode_file(input_path, output_args):
+    _run_encoder(['ffmpeg', '-nostdin', '-v', 'error', '-y', '-i', input_path] + output_args)
+
+
+def decoder_for(input_path):
+    """Returns the function that feeds input_path to the encoder, or None if the type is not supported."""
+    extension = os.path.splitext(input_path)[1].lower()
+    if extension == '.wav':
+        return _encode_wav
+    if extension in MODULE_EXTENSIONS:
+        return _encode_module
+    if extension in FFMPEG_EXTENSIONS:
+        return _encode_file
+    return None
+
+
+def make_job(input_path, output_path=None, profile=None, metadata=None, strip_metadata=False, id3v2_version=None):
+    """
+    Describes one transcode.
+
+    Args:
+        input_path: WAV, tracker module, or anything in FFMPEG_EXTENSIONS
+        output_path: MP3 to write (default: the input with a .mp3 extension).
+            May be the input itself for in-place re-encodes.
+        profile: Output profile (default: CBR 192k)
+        metadata: Dict of tags to write at encode time (ffmpeg -metadata keys)
+        strip_metadata: Drop the tags ffmpeg would carry over from the input
+        id3v2_version: ID3v2 major version to write (default: ffmpeg's, 4)
+    """
+    return {
+        'input': input_path,
+        'output': output_path or os.path.splitext(input_path)[0] + '.mp3',
+        'profile': profile or make_profile(),
+        'metadata': metadata or {},
+        'strip_metadata': strip_metadata,
+        'id3v2_version': id3v2_version,
+    }
+
+
+def transcode(job):
+    """
+    Runs one job. The MP3 is written to a temporary file next to the output
+    and moved into place only once the encoder succeeded, so an interrupted
+    run never leaves a truncated output (or, in place, a damaged input).
+
+    Raises:
+        ValueError: If the input type is not supported.
+        RuntimeError: If a tool fails.
+    """
+    decode = decoder_for(job['input'])
+    if decode is None:
+        raise ValueError(f"Unsupported input type: {job['input']}")
+
+    output_path = job['output']
+    temp_fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(output_path)),
+                                          prefix=os.path.basename(output_path) + '.', suffix='.tmp')
+    os.close(temp_fd)
+    output_args = encoder_args(job['profile'])
+    if job['strip_metadata']:
+        output_args += ['-map_metadata', '-1']
+    for key, value in job['metadata'].items():
+        output_args += ['-metadata', f'{key}={value}']
+    if job['id3v2_version']:
+        output_args += ['-id3v2_version', str(job['id3v2_version'])]
+    output_args += ['-f', 'mp3', temp_path]
+    try:
+        decode(job['input'], output_args)
+        shutil.copymode(job['input'], temp_path)
+        os.replace(temp_path, output_path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+def run_job(job):
+    """
+    Worker: runs a job and times it. Output is captured and returned with the
+    result so jobs running in parallel print as whole blocks.
+
+    Returns:
+        A dict with "input", "output", "profile" (profile_key), "metadata",
+        "status" ("converted" or "failed"), "error", "seconds" and "output_text".
+    """
+    output = io.StringIO()
+    error = None
+    start = time.monotonic()
+    with redirect_stdout(output):
+        try:
+            transcode(job)
+        except Exception as e:
+            error = str(e)
+    return {
+        'input': job['input'],
+        'output': job['output'],
+        'profile': profile_key(job['profile']),
+        'metadata': job['metadata'],
+        'status': 'failed' if error else 'converted',
+        'error': error,
+        'seconds': round(time.monotonic() - start, 3),
+        'output_text': output.getvalue(),
+    }
+
+
+def load_transcode_log(log_path):
+    """Loads the transcode log (last record per output wins)."""
+    records = {}
+    if not log_path or not os.path.exists(log_path):
+        return records
+    with open(log_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # Partially written line from an interrupted run
+            records[record['output']] = record
+    return records
+
+
+def is_up_to_date(job, records):
+    """
+    True if the job's output exists, is newer than its input and was last
+    made with the same profile and tags according to the transcode log.
+    In-place jobs are never up to date.
+    """
+    output = os.path.abspath(job['output'])
+    if output == os.path.abspath(job['input']):
+        return False
+    record = records.get(output)
+    if record is None or record.get('status') != 'converted' or record.get('profile') != profile_key(job['profile']):
+        return False
+    if record.get('metadata', {}) != job['metadata']:
+        return False
+    try:
+        return os.stat(output).st_mtime_ns > os.stat(job['input']).st_mtime_ns
+    except OSError:
+        return False
+
+
+def _scheduled(pool, jobs, max_pending):
+    """
+    Submits jobs to the pool while at most max_pending are queued or running
+    and yields results as they finish. Jobs are only pulled from the iterable
+    when there is room, so a long job list (or a slow directory walk) is not
+    queued up front.
+    """
+    results = queue.Queue()
+    in_flight = 0
+    for job in jobs:
+        while in_flight >= max_pending:
+            yield results.get()
+            in_flight -= 1
+        pool.apply_async(run_job, (job,), callback=results.put,
+                         error_callback=partial(_job_crashed, job, results))
+        in_flight += 1
+    while in_flight:
+        yield results.get()
+        in_flight -= 1
+
+
+def _job_crashed(job, results, error):
+    # run_job catches everything; this only fires if the worker itself died.
+    results.put({'input': job['input'], 'output': job['output'], 'profile': profile_key(job['profile']),
+                 'metadata': job['metadata'], 'status': 'failed', 'error': f"worker crashed: {error}", 'seconds': 0.0, 'output_text': ''})
+
+
+def run_jobs(jobs, processes=None, log_path=None, force=False):
+    """
+    Transcoding engine: runs jobs (see make_job) across a process pool with
+    back-pressure, skipping outputs that are up to date according to the
+    transcode log (unless force), and prints per-job timing and failures.
+
+    Args:
+        jobs: Iterable of jobs; consumed lazily
+        processes: Number of worker processes (defaults to the number of CPUs)
+        log_path: JSON lines transcode log to read and append to, or None
+        force: Transcode even outputs that are up to date
+
+    Returns:
+        A dict with counts of "converted", "skipped" and "failed" jobs.
+    """
+    processes = processes or cpu_count()
+    records = load_transcode_log(log_path)
+    counts = {'converted': 0, 'skipped': 0, 'failed': 0}
+    failures = []
+    busy_seconds = 0.0
+    started = time.monotonic()
+
+    def pending_jobs():
+        for job in jobs:
+            if not force and is_up_to_date(job, records):
+                counts['skipped'] += 1
+                continue
+            yield job
+
+    log_f = open(log_path, 'a', encoding='utf-8') if log_path else None
+    try:
+        with Pool(processes=processes) as pool:
+            # Two jobs per worker keeps every core busy without queueing everything.
+            for result in _scheduled(pool, pending_jobs(), 2 * processes):
+                print(result['output_text'], end='')
+                counts[result['status']] += 1
+                busy_seconds += result['seconds']
+                if result['status'] == 'failed':
+                    failures.append(result)
+                    print(f"FAILED {result['input']} ({result['seconds']:.1f}s): {result['error']}")
+                else:
+                    print(f"Converted {result['input']} -> {result['output']} "
+                          f"[{result['profile']}] in {result['seconds']:.1f}s")
+                if log_f:
+                    record = {k: v for k, v in result.items() if k != 'output_text'}
+                    record['output'] = os.path.abspath(record['output'])
+                    log_f.write(json.dumps(record) + '\n')
+                    log_f.flush()
+    finally:
+        if log_f:
+            log_f.close()
+
+    elapsed = time.monotonic() - started
+    print(f"\n--- Transcode Summary ---")
+    print(f"Converted: {counts['converted']}")
+    print(f"Skipped (up to date): {counts['skipped']}")
+    print(f"Failed: {counts['failed']}")
+    print(f"Wall time: {elapsed:.1f}s, encoding time: {busy_seconds:.1f}s across {processes} worker(s)")
+    for failure in failures:
+        print(f"  FAILED {failure['input']}: {failure['error']}")
+    return counts
+
+
+def parse_tag_template(spec):
+    """
+    Parses a --tag option, FIELD=TEMPLATE, where FIELD is one of
+    TEMPLATE_FIELDS and TEMPLATE may use {stem} (the input filename without
+    extension), {parent} and {grandparent} (the names of the directories
+    above it), e.g. "title={stem}" or "album={parent}".
+
+    Raises:
+        ValueError: If the field or a placeholder is unknown.
+    """
+    field, sep, template = spec.partition('=')
+    field = field.strip().lower()
+    if not sep or field not in TEMPLATE_FIELDS:
+        raise ValueError(f"expected FIELD=TEMPLATE with FIELD one of {', '.join(TEMPLATE_FIELDS)}: {spec!r}")
+    # Render once against dummy values so typos fail before anything is converted.
+    _render_template(template, Path('grandparent/parent/stem.wav'))
+    return field, template
+
+
+def _render_template(template, input_path):
+    input_path = Path(os.path.abspath(input_path))
+    values = {'stem': input_path.stem, 'parent': input_path.parent.name, 'grandparent': input_path.parent.parent.name}
+    try:
+        return template.format_map(values)
+    except (KeyError, IndexError, ValueError) as e:
+        raise ValueError(f"bad template {template!r}: unknown or malformed placeholder {e}")
+
+
+def load_tag_manifest(manifest_path):
+    """
+    Reads a tag_mp3.py manifest (CSV or JSON lines) for use at encode time.
+    A row's path may name either the input or the MP3 it is converted to.
+
+    Returns:
+        A dict of resolved path -> ffmpeg metadata.
+
+    Raises:
+        ValueError: If any row is unusable (all such rows are listed).
+    """
+    tags, errors = {}, []
+    for row in read_manifest(manifest_path):
+        if 'error' in row:
+            errors.append(f"row {row['row']}: {row['error']}")
+            continue
+        fields = dict(row['fields'])
+        track, total = fields.pop('track', None), fields.pop('track_total', None)
+        if track is not None:
+            fields['track'] = f"{track}/{total}" if total is not None else str(track)
+        elif total is not None:
+            errors.append(f"row {row['row']}: track_total without track")
+            continue
+        tags.setdefault(os.path.realpath(row['path']), {}).update(fields)
+    if errors:
+        raise ValueError(f"unusable rows in {manifest_path}: " + '; '.join(errors))
+    return tags
+
+
+def add_tag_arguments(parser):
+    """Adds the --tag and --tag-manifest options to an argparse parser."""
+    parser.add_argument('--tag', action='append', default=[], metavar='FIELD=TEMPLATE',
+                        help="Tag to write while encoding, e.g. 'title={stem}' or 'album={parent}' "
+                             f"({{stem}}, {{parent}}, {{grandparent}}; fields: {', '.join(TEMPLATE_FIELDS)}). Repeatable.")
+    parser.add_argument('--tag-manifest', default=None,
+                        help="tag_mp3.py manifest (CSV or JSON lines) with tags to write while encoding; "
+                             "its values override --tag templates.")
+
+
+def tagging_from_args(args):
+    """
+    Builds the tagging setup for tags_for from the add_tag_arguments options,
+    or None if no tags were requested.
+
+    Raises:
+        ValueError: If a template or the manifest is invalid.
+    """
+    if not args.tag and not args.tag_manifest:
+        return None
+    return {
+        'templates': dict(parse_tag_template(spec) for spec in args.tag),
+        'manifest': load_tag_manifest(args.tag_manifest) if args.tag_manifest else {},
+    }
+
+
+def tags_for(tagging, input_path, output_path):
+    """Returns the metadata to write for one conversion: templates, then manifest values for the input or output."""
+    if not tagging:
+        return {}
+    tags = {field: _render_template(template, input_path) for field, template in tagging['templates'].items()}
+    for path in (input_path, output_path):
+        tags.update(tagging['manifest'].get(os.path.realpath(path), {}))
+    return tags
+
+
+def make_tagged_job(input_path, profile, tagging, output_path=None):
+    """make_job for a conversion that writes the tags from tagging (see tagging_from_args), if any."""
+    output_path = output_path or os.path.splitext(input_path)[0] + '.mp3'
+    metadata = tags_for(tagging, input_path, output_path)
+    return make_job(input_path, output_path, profile, metadata, id3v2_version=TAG_ID3V2_VERSION if metadata else None)
+
+
+def find_inputs(root, extensions=DEFAULT_INPUT_EXTENSIONS):
+    """Yields the files below root with one of the given extensions."""
+    for dirpath, _, filenames in os.walk(root):
+        for filename in sorted(filenames):
+            if os.path.splitext(filename)[1].lower() in extensions:
+                yield os.path.join(dirpath, filename)
+
+
+def _conversion_jobs(input_paths, profile, tagging):
+    # Never let the command line overwrite an input with its own re-encode.
+    for path in input_paths:
+        job = make_tagged_job(path, profile, tagging)
+        if os.path.realpath(job['output']) == os.path.realpath(job['input']):
+            print(f"Skipping {path}: the output would overwrite the input")
+            continue
+        yield job
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Convert audio files (WAV, FLAC, tracker modules) below a directory to MP3 next to them."
+    )
+    parser.add_argument('directory', help="Directory to convert.")
+    parser.add_argument('--types', default=','.join(sorted(DEFAULT_INPUT_EXTENSIONS)),
+                        help="Comma-separated input extensions to convert (default: %(default)s).")
+    add_profile_arguments(parser)
+    add_tag_arguments(parser)
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.directory):
+        print(f"Error: {args.directory} is not a directory")
+        sys.exit(1)
+    extensions = {'.' + ext.strip().lower().lstrip('.') for ext in args.types.split(',') if ext.strip()}
+    unsupported = [ext for ext in extensions if ext not in CONVERTIBLE_EXTENSIONS]
+    if unsupported:
+        print(f"Error: unsupported input type(s): {', '.join(sorted(unsupported))} "
+              f"(supported: {', '.join(sorted(CONVERTIBLE_EXTENSIONS))})")
+        sys.exit(1)
+
+    try:
+        tagging = tagging_from_args(args)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    profile = profile_from_args(args)
+    jobs = _conversion_jobs(find_inputs(args.directory, extensions), profile, tagging)
+    counts = run_jobs(jobs, args.jobs, os.path.join(args.directory, TRANSCODE_LOG_FILENAME), args.force)
+    sys.exit(1 if counts['failed'] else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -4,6 +4,12 @@ import re
 import shutil
 import sys
 import argparse
+import io
+import tempfile
+from contextlib import redirect_stdout
+from functools import partial
+from multiprocessing import Pool, cpu_count
+from mpeg_validator import validate_mp3, format_problems
 
 # MUSIC_ROOT_DIR = "/Users/stencate/Desktop/Music/Fatboy Slim/" # This line should be removed or ensured it's commented.
 SILENCE_THRESHOLD_DB = "-50dB"  # dB level to consider as silence
@@ -11,6 +17,7 @@ MIN_SILENCE_DETECT_DURATION = "1" # seconds (string for ffmpeg's -d option)
 MIN_SILENCE_DURATION_TO_TRIM = 0.5 # seconds (actual length of silence to qualify for trimming)
 END_OF_TRACK_TOLERANCE = 0.2 # seconds (how close silence_end must be to track_duration to be "at the end")
                                # Increased slightly from 0.1 to be a bit more inclusive.
+TAIL_WINDOW_SECONDS = 30 # seconds decoded from the end of the track in --tail-window mode
 
 def run_command(command_parts):
     """Runs a command and returns its stdout, stderr, and return code."""
@@ -55,6 +62,28 @@ def check_mp3val(filepath):
     print(f"  mp3val OK: {filepath}")
     return True
 
+def check_mpeg_frames(filepath):
+    """
+    Checks the MPEG frame structure in-process (see mpeg_validator.py).
+    Returns (ok, flagged): ok is False if there are errors (like an mp3val
+    ERROR), flagged is True if there is anything worth a full ffmpeg decode.
+    """
+    print(f"  Running frame validator check...")
+    try:
+        result = validate_mp3(filepath)
+    except OSError as e:
+        print(f"  Frame validator could not read {filepath}: {e}")
+        return False, True
+
+    if result["errors"]:
+        print(f"  Frame validator found ERRORS for {filepath}:\n{format_problems(result)}")
+        return False, True
+    if result["warnings"]:
+        print(f"  Frame validator found WARNINGS for {filepath}:\n{format_problems(result)}")
+        return True, True
+    print(f"  Frame validator OK: {filepath} ({result['frames']} frames)")
+    return True, False
+
 def check_ffmpeg_decode(filepath):
     """Checks for ffmpeg decoding errors. Returns True if OK, False if errors."""
     print(f"  Running ffmpeg decode check...")
@@ -69,39 +98,88 @@ def check_ffmpeg_decode(filepath):
     print(f"  ffmpeg decode OK: {filepath}")
     return True
 
-def get_silence_at_end_info(filepath):
+def analyze_track(filepath, tail_seconds=None):
     """
-    Detects silence at the end of a track.
-    Returns a dictionary with silence details if found and qualifying, else None.
+    Decodes the track once with ffmpeg and collects everything the pipeline
+    needs from that single pass: decode errors, duration and silencedetect
+    output. Log lines are prefixed with their level, so error lines (what
+    `ffmpeg -v error` would print) can be told apart from the info output.
+
+    Args:
+        filepath: Path to the MP3 file
+        tail_seconds: Only decode this many seconds from the end of the track
+            (None decodes the whole track). Silence times are still reported
+            relative to the start of the track.
+
+    Returns:
+        A dict with "returncode", "decode_errors" (list of error lines),
+        "duration" (seconds, or None), "silences" (list of dicts with start,
+        end and duration) and "window_start" (where decoding started).
     """
-    print(f"  Detecting silence for {filepath}...")
-    cmd = [
-        "ffmpeg", "-i", filepath,
+    if tail_seconds:
+        print(f"  Analyzing the last {tail_seconds:g}s of {filepath} (decode check, duration and silence detection)...")
+    else:
+        print(f"  Analyzing {filepath} (decode check, duration and silence detection)...")
+    cmd = ["ffmpeg", "-loglevel", "repeat+level+info", "-nostats"]
+    if tail_seconds:
+        cmd += ["-sseof", f"-{tail_seconds}"]
+    cmd += [
+        "-i", filepath,
         "-af", f"silencedetect=n={SILENCE_THRESHOLD_DB}:d={MIN_SILENCE_DETECT_DURATION}",
         "-f", "null", "-"
     ]
     _stdout, stderr, returncode = run_command(cmd)
 
-    if returncode != 0 and not ("partial file" in stderr.lower() and "Consider increasing probe size" in stderr):
-         # Sometimes ffmpeg finishes with return code 1 on success for -f null if it encounters EOF early,
-         # but still processes fully for silencedetect. Only fail if stderr indicates a real issue
-         # or returncode is non-zero without a clear silencedetect output.
-         # A common case is if ffmpeg finishes processing and "conversion stopped" appears.
-         # We need to see if silence was actually detected.
-         pass # Continue to parse stderr even if returncode is 1, as silencedetect info might be there.
+    duration = parse_duration(stderr)
+    # With input seeking the decoded timestamps start at 0, so shift them back.
+    window_start = max(duration - tail_seconds, 0.0) if tail_seconds and duration is not None else 0.0
+    silences = [
+        {"start": silence["start"] + window_start, "end": silence["end"] + window_start, "duration": silence["duration"]}
+        for silence in parse_silences(stderr)
+    ]
+    return {
+        "returncode": returncode,
+        "decode_errors": [line for line in stderr.splitlines() if re.search(r"\[(error|fatal|panic)\] ", line)],
+        "duration": duration,
+        "silences": silences,
+        "window_start": window_start,
+        "stderr": stderr,
+    }
 
+def analyze_track_tail(filepath, tail_seconds=TAIL_WINDOW_SECONDS):
+    """
+    Runs analyze_track on a window at the end of the track. Only silence that
+    ends within END_OF_TRACK_TOLERANCE of the end can qualify for trimming, so
+    the tail is enough unless such a silence starts right at the window start:
+    then its real start may lie earlier and the window is grown (x4) until
+    sound is found or the whole track is covered. This gives the same trimming
+    decision as a full decode.
+    """
+    while True:
+        analysis = analyze_track(filepath, tail_seconds)
+        if analysis["duration"] is None or analysis["window_start"] <= 0:
+            return analysis
+        trailing_silence_at_window_start = any(
+            analysis["duration"] - silence["end"] < END_OF_TRACK_TOLERANCE and
+            silence["start"] - analysis["window_start"] < 0.05
+            for silence in analysis["silences"]
+        )
+        if not trailing_silence_at_window_start:
+            return analysis
+        print(f"  Silence fills the {tail_seconds:g}s window, widening it...")
+        tail_seconds *= 4
 
-    track_duration_s = None
+def parse_duration(stderr):
+    """Returns the duration in seconds from ffmpeg's input banner, or None."""
     duration_match = re.search(r"Duration: (\d{2}):(\d{2}):(\d{2})\.(\d{2,3})", stderr)
-    if duration_match:
-        h, m, s, ms_str = duration_match.groups()
-        ms = int(ms_str.ljust(3, '0')) # Pad to 3 digits for ms if needed
-        track_duration_s = int(h) * 3600 + int(m) * 60 + int(s) + ms / 1000.0
-    
-    if track_duration_s is None:
-        print(f"  Could not determine track duration for {filepath}. stderr: {stderr[:500]}")
+    if not duration_match:
         return None
+    h, m, s, ms_str = duration_match.groups()
+    ms = int(ms_str.ljust(3, '0')) # Pad to 3 digits for ms if needed
+    return int(h) * 3600 + int(m) * 60 + int(s) + ms / 1000.0
 
+def parse_silences(stderr):
+    """Returns the silence blocks reported by ffmpeg's silencedetect filter."""
     detected_silences = []
     current_start = None
     for line in stderr.splitlines():
@@ -115,7 +193,29 @@ def get_silence_at_end_info(filepath):
             s_duration = float(end_match.group(2))
             detected_silences.append({"start": current_start, "end": s_end, "duration": s_duration})
             current_start = None # Reset for the next potential silence block
+    return detected_silences
+
+def has_decode_errors(filepath, analysis):
+    """Reports decode errors from analyze_track like check_ffmpeg_decode. Returns True if there were any."""
+    if analysis["returncode"] != 0 or analysis["decode_errors"]:
+        print(f"  ffmpeg decode error for {filepath}. Return code: {analysis['returncode']}")
+        if analysis["decode_errors"]:
+            print(f"  ffmpeg errors:\n" + "\n".join(analysis["decode_errors"]))
+        return True
+    print(f"  ffmpeg decode OK: {filepath}")
+    return False
+
+def find_silence_at_end(filepath, analysis):
+    """
+    Picks the silence block to trim from the analyze_track result.
+    Returns a dictionary with silence details if found and qualifying, else None.
+    """
+    track_duration_s = analysis["duration"]
+    if track_duration_s is None:
+        print(f"  Could not determine track duration for {filepath}. stderr: {analysis['stderr'][:500]}")
+        return None
 
+    detected_silences = analysis["silences"]
     if not detected_silences:
         print(f"  No silence blocks detected by ffmpeg for {filepath}")
         return None
@@ -139,6 +239,13 @@ def get_silence_at_end_info(filepath):
         print(f"  No silence at the end met trimming criteria for {filepath}")
         return None
 
+def get_silence_at_end_info(filepath):
+    """
+    Detects silence at the end of a track.
+    Returns a dictionary with silence details if found and qualifying, else None.
+    """
+    return find_silence_at_end(filepath, analyze_track(filepath))
+
 
 def trim_silence_and_replace(filepath, silence_info):
     """
@@ -146,7 +253,12 @@ def trim_silence_and_replace(filepath, silence_info):
     'silence_info' is a dictionary containing the 'start' time of the silence.
     """
     print(f"  Attempting to losslessly trim silence from {filepath}...")
-    temp_filepath = filepath + ".trimmed_temp.mp3"
+    # A unique temp file next to the original, so workers trimming files in the
+    # same album directory never share one and the final move stays a rename.
+    temp_fd, temp_filepath = tempfile.mkstemp(
+        dir=os.path.dirname(filepath), prefix=os.path.basename(filepath) + ".", suffix=".trimmed_temp.mp3"
+    )
+    os.close(temp_fd)
     
     # The time to cut to is the start of the detected silence.
     trim_to_time = silence_info['start']
@@ -191,6 +303,7 @@ def trim_silence_and_replace(filepath, silence_info):
         return False
 
     try:
+        shutil.copymode(filepath, temp_filepath) # mkstemp creates the temp file as 0600
         shutil.move(temp_filepath, filepath)
         print(f"  Successfully trimmed and replaced {filepath}. Size change: {original_size} -> {new_size} bytes.")
         return True
@@ -201,41 +314,99 @@ def trim_silence_and_replace(filepath, silence_info):
              except OSError: pass
         return False
 
-def process_music_library(root_dir):
-    """Processes all MP3 files in the given root directory."""
+def process_file(filepath, external_checks=False, tail_window=None):
+    """
+    Worker: checks one file and trims its trailing silence if it qualifies.
+    Console output is captured and returned with the result so the parent can
+    print it as one block instead of interleaving lines from several workers.
+
+    Returns:
+        A dict with "path", "status" ("trimmed", "untouched" or "error") and "output".
+    """
+    output = io.StringIO()
+    with redirect_stdout(output):
+        status = _process_file(filepath, external_checks, tail_window)
+    return {"path": filepath, "status": status, "output": output.getvalue()}
+
+def _process_file(filepath, external_checks, tail_window):
+    print(f"\n>>> Processing file: {filepath}")
+
+    is_corrupt_or_decode_error = False
+    if external_checks:
+        needs_decode_check = True
+        if not check_mp3val(filepath):
+            print(f"  Skipping {filepath} due to mp3val issues.")
+            is_corrupt_or_decode_error = True
+    else:
+        frames_ok, needs_decode_check = check_mpeg_frames(filepath)
+        if not frames_ok:
+            print(f"  Skipping {filepath} due to MPEG frame errors.")
+            is_corrupt_or_decode_error = True
+
+    if not is_corrupt_or_decode_error and tail_window and needs_decode_check \
+            and not check_ffmpeg_decode(filepath):
+        print(f"  Skipping {filepath} due to ffmpeg decode issues.")
+        is_corrupt_or_decode_error = True
+
+    if not is_corrupt_or_decode_error:
+        # One decode for the decode check, duration and silencedetect.
+        if tail_window:
+            analysis = analyze_track_tail(filepath, tail_window)
+        else:
+            analysis = analyze_track(filepath)
+        if has_decode_errors(filepath, analysis):
+            print(f"  Skipping {filepath} due to ffmpeg decode issues.")
+            is_corrupt_or_decode_error = True
+
+    if is_corrupt_or_decode_error:
+        return "error"
+
+    silence_info = find_silence_at_end(filepath, analysis)
+    if silence_info:
+        if trim_silence_and_replace(filepath, silence_info):
+            return "trimmed"
+        return "error" # Count as error if trim fails
+    print(f"  No qualifying silence to trim for {filepath}.")
+    return "untouched"
+
+def process_music_library(root_dir, external_checks=False, tail_window=None, jobs=None):
+    """
+    Processes all MP3 files in the given root directory.
+
+    Each file is checked by the in-process frame validator (or mp3val with
+    external_checks) and then decoded exactly once by analyze_track, which
+    yields the decode check, the duration and the silence blocks together.
+
+    With tail_window (seconds), only the end of each track is decoded for
+    silence detection (see analyze_track_tail). The full ffmpeg decode check
+    then only runs on files the frame validator flags, or on every file with
+    external_checks.
+
+    Files are processed in a pool of `jobs` worker processes (defaults to the
+    number of CPUs), each running its own ffmpeg invocations.
+    """
     print(f"Starting processing for directory: {root_dir}")
     processed_files = 0
     trimmed_files = 0
     error_files = 0
 
+    mp3_files = []
     for subdir, _dirs, files in os.walk(root_dir):
         for filename in files:
             if filename.lower().endswith(".mp3") and not filename.lower().endswith(".trimmed_temp.mp3"):
-                filepath = os.path.join(subdir, filename)
-                print(f"\n>>> Processing file: {filepath}")
-                processed_files += 1
-                
-                is_corrupt_or_decode_error = False
-                if not check_mp3val(filepath):
-                    print(f"  Skipping {filepath} due to mp3val issues.")
-                    is_corrupt_or_decode_error = True
-                
-                if not is_corrupt_or_decode_error and not check_ffmpeg_decode(filepath):
-                    print(f"  Skipping {filepath} due to ffmpeg decode issues.")
-                    is_corrupt_or_decode_error = True
-
-                if is_corrupt_or_decode_error:
-                    error_files +=1
-                    continue # Skip to next file
-
-                silence_info = get_silence_at_end_info(filepath)
-                if silence_info:
-                    if trim_silence_and_replace(filepath, silence_info):
-                        trimmed_files += 1
-                    else:
-                        error_files += 1 # Count as error if trim fails
-                else:
-                    print(f"  No qualifying silence to trim for {filepath}.")
+                mp3_files.append(os.path.join(subdir, filename))
+    print(f"Found {len(mp3_files)} MP3 file(s), processing with {jobs or cpu_count()} worker(s).")
+
+    with Pool(processes=jobs or cpu_count()) as pool:
+        # Long-running tasks: hand them out one at a time.
+        worker = partial(process_file, external_checks=external_checks, tail_window=tail_window)
+        for result in pool.imap(worker, mp3_files, chunksize=1):
+            processed_files += 1
+            print(result["output"], end="")
+            if result["status"] == "trimmed":
+                trimmed_files += 1
+            elif result["status"] == "error":
+                error_files += 1
     
     print(f"\n--- Processing Summary ---")
     print(f"Total MP3 files processed: {processed_files}")
@@ -248,6 +419,13 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Process MP3 files to check for errors and trim trailing silence.")
     parser.add_argument("music_directory", help="The root directory of the music library to process.")
     parser.add_argument("-y", "--yes", action="store_true", help="Automatically confirm and proceed without interactive prompt.")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="Number of files to process in parallel. Defaults to the number of CPUs.")
+    parser.add_argument("--external-checks", action="store_true", help="Check every file with mp3val instead of the in-process frame validator.")
+    parser.add_argument("--tail-only", action="store_true",
+                        help="Only decode the end of each track for silence detection, widening the window while it is all silence. "
+                             "Full decode checks then only run on files the frame validator flags.")
+    parser.add_argument("--tail-window", type=float, default=TAIL_WINDOW_SECONDS, metavar="SECONDS",
+                        help=f"Initial window for --tail-only, in seconds (default: {TAIL_WINDOW_SECONDS}).")
     args = parser.parse_args()
 
     # Ensure the provided path is absolute, as os.walk might behave unexpectedly with relative paths
@@ -263,10 +441,12 @@ if __name__ == "__main__":
     
     if args.yes or not sys.stdin.isatty():
         print(f"'-y' flag detected or non-interactive mode. Proceeding automatically for directory: {music_root_to_process}")
-        process_music_library(music_root_to_process)
+        process_music_library(music_root_to_process, args.external_checks,
+                                  args.tail_window if args.tail_only else None, args.jobs)
     else:
         confirm = input(f"Type 'YES' (all caps) to proceed for directory '{music_root_to_process}': ")
         if confirm == "YES":
-            process_music_library(music_root_to_process)
+            process_music_library(music_root_to_process, args.external_checks,
+                                  args.tail_window if args.tail_only else None, args.jobs)
         else:
             print("Operation cancelled by user.") 
\ No newline at end of file
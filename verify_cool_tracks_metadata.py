@@ -1,10 +1,13 @@
 import argparse
 import pathlib
-import eyed3
+from library_index import iter_track_records, add_index_argument
+from scan_journal import add_walk_arguments, selected_mp3_paths
 
-def verify_metadata(directory_path: str, expected_album: str, expected_album_artist: str):
+def verify_metadata(directory_path: str, expected_album: str, expected_album_artist: str, index_path: str = None, mp3_paths: list = None):
     """
     Verifies the album and album artist tags for all MP3 files in a directory.
+    Tags are read from the library index when index_path is given, and only
+    the files in mp3_paths are checked when that list is given.
     """
     source_dir = pathlib.Path(directory_path)
     if not source_dir.is_dir():
@@ -20,29 +23,28 @@ def verify_metadata(directory_path: str, expected_album: str, expected_album_art
     correctly_tagged_files = 0
     mismatched_files = []
 
-    for file_path in source_dir.rglob("*.mp3"):
+    for record in iter_track_records(source_dir, index_path, mp3_paths, fields=["album", "album_artist"]):
+        file_path = pathlib.Path(record["path"])
         mp3_files_found += 1
-        try:
-            audiofile = eyed3.load(file_path)
-            if audiofile is None or audiofile.tag is None:
-                mismatched_files.append((file_path.name, "Could not load or tag not found"))
-                continue
+        if record["load_error"]:
+            mismatched_files.append((file_path.name, f"Error processing file: {record['load_error']}"))
+            continue
+        if not record["has_tag"]:
+            mismatched_files.append((file_path.name, "Could not load or tag not found"))
+            continue
 
-            album_correct = audiofile.tag.album == expected_album
-            album_artist_correct = audiofile.tag.album_artist == expected_album_artist
+        album_correct = record["album"] == expected_album
+        album_artist_correct = record["album_artist"] == expected_album_artist
 
-            if album_correct and album_artist_correct:
-                correctly_tagged_files += 1
-            else:
-                details = []
-                if not album_correct:
-                    details.append(f"Album: '{audiofile.tag.album}' (Expected: '{expected_album}')")
-                if not album_artist_correct:
-                    details.append(f"Album Artist: '{audiofile.tag.album_artist}' (Expected: '{expected_album_artist}')")
-                mismatched_files.append((file_path.name, "; ".join(details)))
-
-        except Exception as e:
-            mismatched_files.append((file_path.name, f"Error processing file: {e}"))
+        if album_correct and album_artist_correct:
+            correctly_tagged_files += 1
+        else:
+            details = []
+            if not album_correct:
+                details.append(f"Album: '{record['album']}' (Expected: '{expected_album}')")
+            if not album_artist_correct:
+                details.append(f"Album Artist: '{record['album_artist']}' (Expected: '{expected_album_artist}')")
+            mismatched_files.append((file_path.name, "; ".join(details)))
 
     print("\n--- Verification Summary ---")
     print(f"Total MP3 files found: {mp3_files_found}")
@@ -80,9 +82,12 @@ def main():
         type=str,
         help="The expected album artist name.",
     )
+    add_index_argument(parser)
+    add_walk_arguments(parser)
     args = parser.parse_args()
 
-    verify_metadata(args.directory, args.album_name, args.album_artist_name)
+    with selected_mp3_paths(args.directory, args, "verify_cool_tracks_metadata") as mp3_paths:
+        verify_metadata(args.directory, args.album_name, args.album_artist_name, args.index, mp3_paths)
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file